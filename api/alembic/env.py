@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 
 from app.core.config import get_settings
 from app.models import Base  # noqa: F401
-from app.models import auditlog, fsc, user  # noqa: F401
+from app.models import auditlog, fsc, job, user  # noqa: F401
 
 config = context.config
 settings = get_settings()
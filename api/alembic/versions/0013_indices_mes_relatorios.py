@@ -0,0 +1,36 @@
+"""Indices por mes (UTC) para o monitoramento mensal
+
+Revision ID: 0013_indices_mes_relatorios
+Revises: 0012_criterio_titulo_texto
+Create Date: 2026-10-17 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0013_indices_mes_relatorios"
+down_revision = "0012_criterio_titulo_texto"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_avaliacoes_indicador_auditoria_mes",
+        "avaliacoes_indicador",
+        ["auditoria_ano_id", sa.text("(EXTRACT(month FROM timezone('UTC', assessed_at)))")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_evidencias_avaliacao_mes",
+        "evidencias",
+        ["avaliacao_id", sa.text("(EXTRACT(month FROM timezone('UTC', created_at)))")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_evidencias_avaliacao_mes", table_name="evidencias")
+    op.drop_index("ix_avaliacoes_indicador_auditoria_mes", table_name="avaliacoes_indicador")
@@ -0,0 +1,60 @@
+"""Contadores de conformidade por auditoria e principio
+
+Revision ID: 0014_contadores_conformidade
+Revises: 0013_indices_mes_relatorios
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0014_contadores_conformidade"
+down_revision = "0013_indices_mes_relatorios"
+branch_labels = None
+depends_on = None
+
+status_conformidade_enum = sa.Enum(
+    "conforme",
+    "nc_menor",
+    "nc_maior",
+    "oportunidade_melhoria",
+    "nao_se_aplica",
+    name="status_conformidade_enum",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contadores_conformidade",
+        sa.Column("auditoria_ano_id", sa.Integer(), nullable=False),
+        sa.Column("principio_id", sa.Integer(), nullable=False),
+        sa.Column("status_conformidade", status_conformidade_enum, nullable=False),
+        sa.Column("quantidade", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["auditoria_ano_id"], ["auditorias_ano.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["principio_id"], ["principios.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("auditoria_ano_id", "principio_id", "status_conformidade"),
+    )
+    op.create_index(
+        op.f("ix_contadores_conformidade_principio_id"),
+        "contadores_conformidade",
+        ["principio_id"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO contadores_conformidade (auditoria_ano_id, principio_id, status_conformidade, quantidade)
+        SELECT a.auditoria_ano_id, c.principio_id, a.status_conformidade, COUNT(*)
+        FROM avaliacoes_indicador a
+        JOIN indicadores i ON i.id = a.indicator_id
+        JOIN criterios c ON c.id = i.criterio_id
+        GROUP BY a.auditoria_ano_id, c.principio_id, a.status_conformidade;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_contadores_conformidade_principio_id"), table_name="contadores_conformidade")
+    op.drop_table("contadores_conformidade")
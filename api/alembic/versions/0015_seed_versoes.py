@@ -0,0 +1,31 @@
+"""Marcador de versao do seed inicial
+
+Revision ID: 0015_seed_versoes
+Revises: 0014_contadores_conformidade
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0015_seed_versoes"
+down_revision = "0014_contadores_conformidade"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "seed_versoes",
+        sa.Column("versao", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("programa_max_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("indicador_max_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("aplicado_em", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("versao"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("seed_versoes")
@@ -0,0 +1,156 @@
+"""Particiona audit_logs por mes com indice BRIN
+
+Revision ID: 0016_audit_logs_particionado
+Revises: 0015_seed_versoes
+Create Date: 2026-10-17 14:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0016_audit_logs_particionado"
+down_revision = "0015_seed_versoes"
+branch_labels = None
+depends_on = None
+
+# Mesmo valor padrão de AUDIT_LOGS_MESES_FUTUROS; a rotina de manutenção cria os meses seguintes.
+MESES_FUTUROS = 3
+
+
+def upgrade() -> None:
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legado")
+    op.execute("ALTER TABLE audit_logs_legado RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legado_pkey")
+    for indice in ("auditoria_ano_id", "created_at", "entidade", "entidade_id", "id", "programa_id"):
+        op.execute(f"DROP INDEX ix_audit_logs_{indice}")
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            entidade varchar(100) NOT NULL,
+            entidade_id integer NOT NULL,
+            acao varchar(13) NOT NULL,
+            old_value json,
+            new_value json,
+            created_by integer,
+            programa_id integer,
+            auditoria_ano_id integer,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT audit_logs_created_by_fkey
+                FOREIGN KEY (created_by) REFERENCES usuarios (id) ON DELETE SET NULL,
+            CONSTRAINT fk_audit_logs_programa_id_programas_certificacao
+                FOREIGN KEY (programa_id) REFERENCES programas_certificacao (id) ON DELETE SET NULL,
+            CONSTRAINT audit_logs_auditoria_ano_id_fkey
+                FOREIGN KEY (auditoria_ano_id) REFERENCES auditorias_ano (id) ON DELETE SET NULL
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+    # Uma partição por mês (UTC), do log mais antigo até MESES_FUTUROS à frente.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            mes date;
+            ultimo date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MESES_FUTUROS} months')::date;
+        BEGIN
+            mes := COALESCE(
+                (SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC')::date FROM audit_logs_legado),
+                date_trunc('month', now() AT TIME ZONE 'UTC')::date
+            );
+            WHILE mes <= ultimo LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_p' || to_char(mes, 'YYYYMM'),
+                    mes::timestamp AT TIME ZONE 'UTC',
+                    (mes + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+                mes := (mes + interval '1 month')::date;
+            END LOOP;
+        END
+        $$;
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO audit_logs (
+            id, entidade, entidade_id, acao, old_value, new_value,
+            created_by, programa_id, auditoria_ano_id, created_at
+        )
+        SELECT
+            id, entidade, entidade_id, acao, old_value, new_value,
+            created_by, programa_id, auditoria_ano_id, created_at
+        FROM audit_logs_legado
+        """
+    )
+    op.execute("DROP TABLE audit_logs_legado")
+
+    # created_at cresce junto com a ordem física de inserção: BRIN cobre faixas de data com poucas páginas.
+    op.execute("CREATE INDEX ix_audit_logs_created_at_brin ON audit_logs USING brin (created_at)")
+    op.execute(
+        "CREATE INDEX ix_audit_logs_entidade_entidade_id_created_at "
+        "ON audit_logs (entidade, entidade_id, created_at)"
+    )
+    op.execute(
+        "CREATE INDEX ix_audit_logs_auditoria_programa_created_at "
+        "ON audit_logs (auditoria_ano_id, programa_id, created_at)"
+    )
+    op.execute("CREATE INDEX ix_audit_logs_programa_created_at ON audit_logs (programa_id, created_at)")
+    # Ordem do listar_logs (created_at DESC, id DESC): permite Append ordenado que para na partição mais recente.
+    op.execute("CREATE INDEX ix_audit_logs_created_at_id ON audit_logs (created_at, id)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_particionado")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            entidade varchar(100) NOT NULL,
+            entidade_id integer NOT NULL,
+            acao varchar(13) NOT NULL,
+            old_value json,
+            new_value json,
+            created_by integer,
+            auditoria_ano_id integer,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            programa_id integer,
+            CONSTRAINT audit_logs_pkey_legado PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO audit_logs (
+            id, entidade, entidade_id, acao, old_value, new_value,
+            created_by, programa_id, auditoria_ano_id, created_at
+        )
+        SELECT
+            id, entidade, entidade_id, acao, old_value, new_value,
+            created_by, programa_id, auditoria_ano_id, created_at
+        FROM audit_logs_particionado
+        """
+    )
+    op.execute("DROP TABLE audit_logs_particionado")
+    op.execute("ALTER TABLE audit_logs RENAME CONSTRAINT audit_logs_pkey_legado TO audit_logs_pkey")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(
+        "ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_auditoria_ano_id_fkey "
+        "FOREIGN KEY (auditoria_ano_id) REFERENCES auditorias_ano (id) ON DELETE SET NULL"
+    )
+    op.execute(
+        "ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_created_by_fkey "
+        "FOREIGN KEY (created_by) REFERENCES usuarios (id) ON DELETE SET NULL"
+    )
+    op.execute(
+        "ALTER TABLE audit_logs ADD CONSTRAINT fk_audit_logs_programa_id_programas_certificacao "
+        "FOREIGN KEY (programa_id) REFERENCES programas_certificacao (id) ON DELETE SET NULL"
+    )
+    for indice in ("auditoria_ano_id", "created_at", "entidade", "entidade_id", "id", "programa_id"):
+        op.execute(f"CREATE INDEX ix_audit_logs_{indice} ON audit_logs ({indice})")
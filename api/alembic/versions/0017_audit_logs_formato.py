@@ -0,0 +1,28 @@
+"""Formato dos payloads de audit_logs (completo, diff, checkpoint)
+
+Revision ID: 0017_audit_logs_formato
+Revises: 0016_audit_logs_particionado
+Create Date: 2026-10-17 16:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0017_audit_logs_formato"
+down_revision = "0016_audit_logs_particionado"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Linhas existentes guardam old/new inteiros: ficam como 'completo' e servem de base para reconstrução.
+    op.add_column(
+        "audit_logs",
+        sa.Column("formato", sa.String(length=10), server_default="completo", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("audit_logs", "formato")
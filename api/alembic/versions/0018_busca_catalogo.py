@@ -0,0 +1,58 @@
+"""Busca textual (tsvector + GIN) em princípios, critérios e indicadores
+
+Revision ID: 0018_busca_catalogo
+Revises: 0017_audit_logs_formato
+Create Date: 2026-10-17 18:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0018_busca_catalogo"
+down_revision = "0017_audit_logs_formato"
+branch_labels = None
+depends_on = None
+
+TABELAS = ("principios", "criterios", "indicadores")
+
+# Mesma expressão de app.models.fsc.EXPRESSAO_BUSCA_CATALOGO.
+EXPRESSAO_BUSCA = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(codigo, '')), 'A') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(titulo, '')), 'A') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(descricao, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # pt_unaccent = portuguese + unaccent. Sem o contrib unaccent no servidor, fica só o stemmer português.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent') THEN
+                CREATE EXTENSION IF NOT EXISTS unaccent;
+            END IF;
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION pt_unaccent (COPY = portuguese);
+                IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'unaccent') THEN
+                    ALTER TEXT SEARCH CONFIGURATION pt_unaccent
+                        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+                ELSE
+                    RAISE WARNING 'Extensão unaccent indisponível: busca do catálogo sem remoção de acentos.';
+                END IF;
+            END IF;
+        END
+        $$;
+        """
+    )
+    for tabela in TABELAS:
+        op.execute(f"ALTER TABLE {tabela} ADD COLUMN busca tsvector GENERATED ALWAYS AS ({EXPRESSAO_BUSCA}) STORED")
+        op.execute(f"CREATE INDEX ix_{tabela}_busca ON {tabela} USING gin (busca)")
+
+
+def downgrade() -> None:
+    for tabela in TABELAS:
+        op.execute(f"DROP INDEX ix_{tabela}_busca")
+        op.execute(f"ALTER TABLE {tabela} DROP COLUMN busca")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS pt_unaccent")
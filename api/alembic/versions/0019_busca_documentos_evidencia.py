@@ -0,0 +1,45 @@
+"""Índices trigram para a busca em documentos_evidencia
+
+Revision ID: 0019_busca_documentos_evidencia
+Revises: 0018_busca_catalogo
+Create Date: 2026-10-17 19:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0019_busca_documentos_evidencia"
+down_revision = "0018_busca_catalogo"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ILIKE '%termo%' em titulo/conteudo usa os índices gin_trgm_ops; sem o contrib pg_trgm a busca continua
+    # funcionando, só que por varredura.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_documentos_evidencia_titulo_trgm
+                    ON documentos_evidencia USING gin (titulo gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS ix_documentos_evidencia_conteudo_trgm
+                    ON documentos_evidencia USING gin (conteudo gin_trgm_ops);
+            ELSE
+                RAISE WARNING 'Extensão pg_trgm indisponível: busca de documentos sem índice trigram.';
+            END IF;
+        END
+        $$;
+        """
+    )
+    # Filtro do RESPONSAVEL (responsavel_id = x OR created_by = x) vira BitmapOr entre dois índices.
+    op.create_index(op.f("ix_documentos_evidencia_created_by"), "documentos_evidencia", ["created_by"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_documentos_evidencia_created_by"), table_name="documentos_evidencia")
+    op.execute("DROP INDEX IF EXISTS ix_documentos_evidencia_conteudo_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_documentos_evidencia_titulo_trgm")
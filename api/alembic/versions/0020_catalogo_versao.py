@@ -0,0 +1,27 @@
+"""Versão do catálogo por programa de certificação
+
+Revision ID: 0020_catalogo_versao
+Revises: 0019_busca_documentos_evidencia
+Create Date: 2026-10-17 20:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0020_catalogo_versao"
+down_revision = "0019_busca_documentos_evidencia"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "programas_certificacao",
+        sa.Column("catalogo_versao", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("programas_certificacao", "catalogo_versao")
@@ -0,0 +1,76 @@
+"""Fila de jobs para operações longas
+
+Revision ID: 0021_jobs
+Revises: 0020_catalogo_versao
+Create Date: 2026-10-17 21:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0021_jobs"
+down_revision = "0020_catalogo_versao"
+branch_labels = None
+depends_on = None
+
+
+status_job_enum = sa.Enum(
+    "pendente",
+    "executando",
+    "concluido",
+    "falhou",
+    name="status_job_enum",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tipo", sa.String(length=100), nullable=False),
+        sa.Column("parametros", sa.JSON(), nullable=False),
+        sa.Column("status", status_job_enum, server_default="pendente", nullable=False),
+        sa.Column("progresso", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("mensagem", sa.String(length=255), nullable=True),
+        sa.Column("resultado", sa.JSON(), nullable=True),
+        sa.Column("erro", sa.Text(), nullable=True),
+        sa.Column("tentativas", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_tentativas", sa.Integer(), server_default="3", nullable=False),
+        sa.Column("executar_apos", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("iniciado_em", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_em", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("concluido_em", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["created_by"], ["usuarios.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_jobs_id"), "jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_jobs_created_by"), "jobs", ["created_by"], unique=False)
+    # Parciais: a busca do worker só enxerga a fila e os jobs em execução, não o histórico.
+    op.create_index(
+        "ix_jobs_pendentes",
+        "jobs",
+        ["executar_apos", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pendente'"),
+    )
+    op.create_index(
+        "ix_jobs_executando_heartbeat",
+        "jobs",
+        ["heartbeat_em"],
+        unique=False,
+        postgresql_where=sa.text("status = 'executando'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_executando_heartbeat", table_name="jobs")
+    op.drop_index("ix_jobs_pendentes", table_name="jobs")
+    op.drop_index(op.f("ix_jobs_created_by"), table_name="jobs")
+    op.drop_index(op.f("ix_jobs_id"), table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,31 @@
+"""Arquivo de evidência registrado uma única vez
+
+Revision ID: 0022_evidencia_arquivo_unico
+Revises: 0021_jobs
+Create Date: 2026-10-18 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0022_evidencia_arquivo_unico"
+down_revision = "0021_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Só arquivos: o mesmo link pode ser evidência de várias avaliações.
+    op.create_index(
+        "ux_evidencias_arquivo_url",
+        "evidencias",
+        ["url_or_path"],
+        unique=True,
+        postgresql_where=sa.text("kind = 'arquivo'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_evidencias_arquivo_url", table_name="evidencias")
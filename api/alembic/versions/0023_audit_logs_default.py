@@ -0,0 +1,35 @@
+"""Partição DEFAULT para audit_logs
+
+Revision ID: 0023_audit_logs_default
+Revises: 0022_evidencia_arquivo_unico
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0023_audit_logs_default"
+down_revision = "0022_evidencia_arquivo_unico"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sem ela, um mês sem partição (manutenção parada) faria falhar toda escrita auditada.
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM audit_logs_default) THEN
+                RAISE EXCEPTION 'audit_logs_default possui registros; rode python -m app.cli manter-audit-logs antes.';
+            END IF;
+        END
+        $$;
+        """
+    )
+    op.execute("DROP TABLE audit_logs_default")
@@ -0,0 +1,295 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Dependências pesadas que não podem ser carregadas só por importar app.main (ver orcamento-importacao).
+MODULOS_SOB_DEMANDA = ('boto3', 'botocore', 'passlib', 'jose')
+
+
+def _reconstruir_contadores(args: argparse.Namespace) -> None:
+    from app.db.session import SessionLocal
+    from app.services.contadores_conformidade import reconstruir_contadores
+
+    with SessionLocal() as db:
+        total = reconstruir_contadores(db, auditoria_id=args.auditoria_id, programa_id=args.programa_id)
+        db.commit()
+    print(f'Contadores de conformidade reconstruídos: {total} linha(s).')
+
+
+def _seed(args: argparse.Namespace) -> None:
+    from app.services.seed import executar_seed
+
+    executar_seed()
+
+
+def _manter_audit_logs(args: argparse.Namespace) -> None:
+    from app.services.particoes_audit_logs import manter_particoes_audit_logs
+
+    resultado = manter_particoes_audit_logs()
+    print(f'Criadas: {len(resultado["criadas"])}; desanexadas: {len(resultado["desanexadas"])}.')
+
+
+def _worker(args: argparse.Namespace) -> None:
+    from app.core.config import get_settings
+    from app.services.jobs import executar_worker
+
+    # Importar o módulo registra os tipos de job (@tarefa).
+    import app.services.tarefas
+
+    intervalo = args.intervalo if args.intervalo is not None else get_settings().JOBS_INTERVALO_SEGUNDOS
+    processados = executar_worker(intervalo, uma_vez=args.uma_vez)
+    print(f'Worker encerrado: {processados} job(s) processado(s).')
+
+
+def _medir_verificacoes(hash_senha: str, threads: int, segundos: float) -> int:
+    from app.core.security import contexto_senhas
+
+    limite = time.perf_counter() + segundos
+
+    def verificar() -> int:
+        total = 0
+        while time.perf_counter() < limite:
+            contexto_senhas().verify('senha-benchmark', hash_senha)
+            total += 1
+        return total
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return sum(executor.map(lambda _: verificar(), range(threads)))
+
+
+def _benchmark_senhas(args: argparse.Namespace) -> None:
+    from app.core.security import contexto_senhas
+
+    contexto = contexto_senhas()
+    hash_senha = contexto.hash('senha-benchmark')
+    rounds = contexto.to_dict().get('pbkdf2_sha256__default_rounds')
+    nucleos = os.cpu_count() or 1
+    threads = args.threads or nucleos
+    print(f'pbkdf2_sha256 com {rounds} iterações, {nucleos} núcleo(s).')
+    for quantidade in sorted({1, threads}):
+        total = _medir_verificacoes(hash_senha, quantidade, args.segundos)
+        por_segundo = total / args.segundos
+        print(
+            f'{quantidade} thread(s): {por_segundo:.1f} verificações/s '
+            f'({por_segundo / min(quantidade, nucleos):.1f} por núcleo, {1000 / por_segundo * quantidade:.1f} ms cada).'
+        )
+
+
+def _benchmark_auditoria(args: argparse.Namespace) -> None:
+    from fastapi.encoders import jsonable_encoder
+
+    from app.db.session import SessionLocal
+    from app.models.auditlog import AcaoAuditEnum, AuditLog
+    from app.services.audit_logger import gravar_logs_pendentes, registrar_log
+
+    valores = [
+        ({'status_conformidade': 'nc_menor', 'indice': i}, {'status_conformidade': 'conforme', 'indice': i})
+        for i in range(args.registros)
+    ]
+
+    def por_linha(db) -> None:
+        # Comportamento anterior: um objeto AuditLog por alteração, gravado no flush.
+        for indice, (antigo, novo) in enumerate(valores):
+            db.add(
+                AuditLog(
+                    entidade='benchmark',
+                    entidade_id=indice,
+                    acao=AcaoAuditEnum.UPDATE,
+                    old_value=jsonable_encoder(antigo),
+                    new_value=jsonable_encoder(novo),
+                    created_by=None,
+                )
+            )
+        db.flush()
+
+    def em_lote(db) -> None:
+        for indice, (antigo, novo) in enumerate(valores):
+            registrar_log(db, 'benchmark', indice, AcaoAuditEnum.UPDATE, None, antigo, novo)
+        gravar_logs_pendentes(db)
+
+    # Cada modo roda numa transação desfeita no fim: nada fica gravado em audit_logs.
+    for nome, funcao in (('por linha (ORM)', por_linha), ('em lote (outbox)', em_lote)):
+        with SessionLocal() as db:
+            inicio = time.perf_counter()
+            funcao(db)
+            duracao = time.perf_counter() - inicio
+            db.rollback()
+        print(f'{nome}: {args.registros} logs em {duracao * 1000:.0f} ms ({args.registros / duracao:.0f} logs/s).')
+
+
+def _valor_exemplo(coluna):
+    from datetime import UTC, date, datetime, time as hora
+    from decimal import Decimal
+
+    from sqlalchemy import JSON, Date, DateTime, Numeric, Time
+    from sqlalchemy import Enum as SqlEnum
+
+    tipo = coluna.type
+    if isinstance(tipo, SqlEnum) and tipo.enum_class is not None:
+        return next(iter(tipo.enum_class))
+    if isinstance(tipo, DateTime):
+        return datetime.now(UTC)
+    if isinstance(tipo, Date):
+        return date.today()
+    if isinstance(tipo, Time):
+        return hora(12, 30)
+    if isinstance(tipo, Numeric):
+        return Decimal('12.50')
+    if isinstance(tipo, JSON):
+        return {'chave': 'valor'}
+    if tipo.python_type is int:
+        return 1
+    if tipo.python_type is bool:
+        return True
+    return 'texto de exemplo'
+
+
+def _benchmark_serializacao(args: argparse.Namespace) -> None:
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import inspect
+
+    from app.models import fsc
+    from app.models.base import Base
+    from app.services.serializacao import serializar_modelo
+
+    def por_colunas(instancia) -> dict:
+        # Implementação anterior (_dump_model).
+        return jsonable_encoder(
+            {coluna.name: getattr(instancia, coluna.name) for coluna in instancia.__table__.columns if coluna.computed is None}
+        )
+
+    modelos = sorted(
+        (mapper.class_ for mapper in Base.registry.mappers if mapper.class_.__module__ == fsc.__name__),
+        key=lambda classe: classe.__name__,
+    )
+    print(f'{"modelo":<28} {"colunas":>7} {"anterior (us)":>14} {"compilado (us)":>15} {"ganho":>6}')
+    for classe in modelos:
+        mapper = inspect(classe)
+        instancia = classe(
+            **{
+                mapper.get_property_by_column(coluna).key: _valor_exemplo(coluna)
+                for coluna in mapper.local_table.columns
+                if coluna.computed is None
+            }
+        )
+        if serializar_modelo(instancia) != por_colunas(instancia):
+            print(f'{classe.__name__}: resultado diferente da implementação anterior.')
+            sys.exit(1)
+        tempos = []
+        for funcao in (por_colunas, serializar_modelo):
+            inicio = time.perf_counter()
+            for _ in range(args.iteracoes):
+                funcao(instancia)
+            tempos.append((time.perf_counter() - inicio) / args.iteracoes * 1_000_000)
+        anterior, compilado = tempos
+        print(
+            f'{classe.__name__:<28} {len(mapper.local_table.columns):>7} '
+            f'{anterior:>14.2f} {compilado:>15.2f} {anterior / compilado:>5.1f}x'
+        )
+
+
+def _medir_importacao(modulo: str) -> dict[str, tuple[int, int]]:
+    # Executa em um processo limpo; cada linha do -X importtime traz (próprio_us, acumulado_us, módulo).
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    tempos: dict[str, tuple[int, int]] = {}
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha.removeprefix('import time:').split('|', 2)
+        tempos[nome.strip()] = (int(proprio), int(acumulado))
+    return tempos
+
+
+def _orcamento_importacao(args: argparse.Namespace) -> None:
+    tempos = _medir_importacao(args.modulo)
+    total_ms = tempos[args.modulo][1] / 1000
+    print(f'import {args.modulo}: {total_ms:.0f} ms (orçamento: {args.limite_ms} ms).')
+    mais_lentos = sorted(tempos.items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+    for nome, (proprio, acumulado) in mais_lentos:
+        print(f'  {proprio / 1000:8.1f} ms próprio {acumulado / 1000:8.1f} ms acumulado  {nome}')
+
+    falhas = []
+    carregados = sorted({nome.split('.')[0] for nome in tempos} & set(MODULOS_SOB_DEMANDA))
+    if carregados:
+        falhas.append(f'dependências que deveriam ser carregadas sob demanda: {", ".join(carregados)}')
+    if total_ms > args.limite_ms:
+        falhas.append(f'tempo de importação acima do orçamento ({total_ms:.0f} ms > {args.limite_ms} ms)')
+    if falhas:
+        print('Falhou: ' + '; '.join(falhas) + '.')
+        sys.exit(1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description='Tarefas administrativas da API.')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    contadores = subparsers.add_parser(
+        'reconstruir-contadores',
+        help='Recalcula a tabela contadores_conformidade a partir das avaliações.',
+    )
+    contadores.add_argument('--auditoria-id', type=int, default=None)
+    contadores.add_argument('--programa-id', type=int, default=None)
+    contadores.set_defaults(executar=_reconstruir_contadores)
+
+    seed = subparsers.add_parser('seed', help='Aplica o seed inicial (no-op quando já aplicado).')
+    seed.set_defaults(executar=_seed)
+
+    particoes = subparsers.add_parser(
+        'manter-audit-logs',
+        help='Cria as partições futuras de audit_logs e aplica a retenção configurada.',
+    )
+    particoes.set_defaults(executar=_manter_audit_logs)
+
+    worker = subparsers.add_parser(
+        'worker',
+        help='Processa a fila de jobs (tabela jobs) até receber SIGTERM/SIGINT.',
+    )
+    worker.add_argument('--intervalo', type=float, default=None, help='Padrão: JOBS_INTERVALO_SEGUNDOS.')
+    worker.add_argument('--uma-vez', action='store_true', help='Processa os jobs disponíveis e encerra.')
+    worker.set_defaults(executar=_worker)
+
+    senhas = subparsers.add_parser(
+        'benchmark-senhas',
+        help='Mede verificações de senha por segundo com o PASSWORD_HASH_ROUNDS atual.',
+    )
+    senhas.add_argument('--segundos', type=float, default=3.0)
+    senhas.add_argument('--threads', type=int, default=None, help='Padrão: número de núcleos.')
+    senhas.set_defaults(executar=_benchmark_senhas)
+
+    auditoria = subparsers.add_parser(
+        'benchmark-auditoria',
+        help='Compara a gravação de audit_logs linha a linha com o INSERT em lote do commit.',
+    )
+    auditoria.add_argument('--registros', type=int, default=2000)
+    auditoria.set_defaults(executar=_benchmark_auditoria)
+
+    serializacao = subparsers.add_parser(
+        'benchmark-serializacao',
+        help='Mede o custo por chamada do serializador de auditoria para cada modelo de app.models.fsc.',
+    )
+    serializacao.add_argument('--iteracoes', type=int, default=20000)
+    serializacao.set_defaults(executar=_benchmark_serializacao)
+
+    importacao = subparsers.add_parser(
+        'orcamento-importacao',
+        help='Mede o import do app com -X importtime e falha acima do orçamento.',
+    )
+    importacao.add_argument('--modulo', default='app.main')
+    importacao.add_argument('--limite-ms', type=int, default=2000)
+    importacao.add_argument('--top', type=int, default=10)
+    importacao.set_defaults(executar=_orcamento_importacao)
+
+    args = parser.parse_args(argv)
+    args.executar(args)
+
+
+if __name__ == '__main__':
+    main()
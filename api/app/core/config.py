@@ -11,6 +11,12 @@ class Settings(BaseSettings):
     JWT_SECRET: str = 'trocar_isto'
     JWT_ALGORITHM: str = 'HS256'
     JWT_EXPIRE_MINUTES: int = 480
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_USER_CACHE_MAX_ITENS: int = 1024
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_FILA: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
 
     S3_ENDPOINT: str = 'http://minio:9000'
     S3_ACCESS_KEY: str = 'minio'
@@ -18,9 +24,42 @@ class Settings(BaseSettings):
     S3_BUCKET: str = 'evidencias'
     S3_REGION: str = 'us-east-1'
     S3_STRICT_STARTUP: bool = False
+    S3_BOOTSTRAP_BACKOFF_MAX_SECONDS: float = 60
+    S3_STRICT_STARTUP_MAX_SECONDS: float = 20
+    S3_MAX_POOL_CONNECTIONS: int = 40
+    S3_CONNECT_TIMEOUT_SECONDS: float = 5
+    S3_READ_TIMEOUT_SECONDS: float = 60
+    S3_MAX_ATTEMPTS: int = 3
+    S3_RETRY_MODE: str = 'standard'
+    S3_PUBLIC_ENDPOINT: str | None = None
+    S3_UPLOAD_URL_EXPIRES_SECONDS: int = 900
+    S3_UPLOAD_MAX_BYTES: int = 500 * 1024 * 1024
+    S3_LOGO_MAX_BYTES: int = 5 * 1024 * 1024
 
     CORS_ORIGINS: str = 'http://localhost:5173'
 
+    REPORTS_CACHE_TTL_SECONDS: int = 60
+    REPORTS_CACHE_MAX_ITENS: int = 512
+    REPORTS_DASHBOARD_CONEXOES: int = 4
+    CATALOGO_CACHE_TTL_SECONDS: int = 3600
+    CATALOGO_CACHE_MAX_ITENS: int = 64
+    AUDIT_LOGS_FORMATO: str = 'diff'
+    AUDIT_LOGS_CHECKPOINT_A_CADA: int = 20
+    AUDIT_LOGS_MESES_FUTUROS: int = 3
+    AUDIT_LOGS_RETENCAO_MESES: int = 0
+    AUDIT_LOGS_RETENCAO_DESCARTAR: bool = False
+    AUDIT_LOGS_MANUTENCAO_INTERVALO_HORAS: float = 24
+    AUDIT_LOGS_LOCK_TIMEOUT_MS: int = 5000
+    JOBS_INTERVALO_SEGUNDOS: float = 2.0
+    JOBS_MAX_TENTATIVAS: int = 3
+    JOBS_BACKOFF_MAX_SECONDS: int = 600
+    JOBS_TIMEOUT_SECONDS: int = 900
+
+    SQL_METRICS_ENABLED: bool = True
+    SQL_METRICS_LOG_LEVEL: str = 'INFO'
+    SQL_N_MAIS_1_LIMITE: int = 10
+    SQL_ORCAMENTO_ESTRITO: bool = False
+
     def cors_origins(self) -> list[str]:
         origins = [origin.strip() for origin in self.CORS_ORIGINS.split(',') if origin.strip()]
         return origins or ['http://localhost:5173']
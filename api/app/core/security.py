@@ -1,48 +1,157 @@
-﻿from datetime import UTC, datetime, timedelta
+﻿import asyncio
+import hashlib
+import threading
+from functools import cache
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.user import User
+from app.models.user import RoleEnum, User
+from app.services.cache import CacheTTL
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=['pbkdf2_sha256'], deprecated='auto')
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/auth/login')
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+@dataclass(frozen=True)
+class UsuarioAutenticado:
+    id: int
+    nome: str
+    email: str
+    role: RoleEnum
+    created_at: datetime
+    hash_fingerprint: str
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Cache por processo: alterações feitas em outro worker aparecem aqui em até AUTH_USER_CACHE_TTL_SECONDS.
+_usuarios_cache = CacheTTL(settings.AUTH_USER_CACHE_TTL_SECONDS, settings.AUTH_USER_CACHE_MAX_ITENS)
+
+
+@cache
+def contexto_senhas():
+    # passlib e python-jose só são importados no primeiro uso (login/token), não no import do app.
+    from passlib.context import CryptContext
+
+    # min/max iguais ao padrão: hashes com outro custo são regravados no próximo login (verify_and_update).
+    return CryptContext(
+        schemes=['pbkdf2_sha256'],
+        deprecated='auto',
+        pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+        pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+        pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+    )
+
+
+@cache
+def _jose():
+    from jose import JWTError, jwt
+
+    return jwt, JWTError
+
+
+# Hash/verificação rodam em um pool próprio para não ocupar o threadpool do AnyIO em picos de login.
+_executor_senhas = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix='senhas')
+_vagas_senhas = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_FILA)
+
+
+def _enviar_para_pool_senhas(funcao: Callable, *args) -> Future:
+    if not _vagas_senhas.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Muitas verificações de senha em andamento. Tente novamente em instantes.',
+            headers={'Retry-After': str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+    try:
+        futuro = _executor_senhas.submit(funcao, *args)
+    except BaseException:
+        _vagas_senhas.release()
+        raise
+    futuro.add_done_callback(lambda _: _vagas_senhas.release())
+    return futuro
+
+
+def _verificar_alguma(senhas: Sequence[str], hashed_password: str) -> bool:
+    return any(contexto_senhas().verify(senha, hashed_password) for senha in senhas)
+
+
+# Assíncronas: quem espera o pool de senhas é o event loop, não uma thread do AnyIO presa em .result().
+async def hash_password(password: str) -> str:
+    return await asyncio.wrap_future(_enviar_para_pool_senhas(contexto_senhas().hash, password))
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(_enviar_para_pool_senhas(contexto_senhas().verify, plain_password, hashed_password))
+
+
+async def verificar_alguma_senha(senhas: Sequence[str], hashed_password: str) -> bool:
+    # Uma única vaga no pool para todas as variantes (ex.: com e sem espaços nas pontas).
+    return await asyncio.wrap_future(_enviar_para_pool_senhas(_verificar_alguma, list(senhas), hashed_password))
 
 
 def create_access_token(user_id: int) -> str:
     expire = datetime.now(UTC) + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
     payload = {'sub': str(user_id), 'exp': expire}
+    jwt, _ = _jose()
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
-    user = db.scalar(select(User).where(User.email == email))
+def fingerprint_hash(password_hash: str) -> str:
+    return hashlib.sha256(password_hash.encode('utf-8')).hexdigest()[:16]
+
+
+def usuario_autenticado(user: User) -> UsuarioAutenticado:
+    return UsuarioAutenticado(
+        id=user.id,
+        nome=user.nome,
+        email=user.email,
+        role=user.role,
+        created_at=user.created_at,
+        hash_fingerprint=fingerprint_hash(user.password_hash),
+    )
+
+
+def invalidar_usuario_cache(user_id: int) -> None:
+    _usuarios_cache.remover(user_id)
+
+
+def gravar_novo_usuario(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    invalidar_usuario_cache(user.id)
+    return user
+
+
+async def authenticate_user(db: Session, email: str, password: str) -> User | None:
+    user = await run_in_threadpool(db.scalar, select(User).where(User.email == email))
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    futuro = _enviar_para_pool_senhas(contexto_senhas().verify_and_update, password, user.password_hash)
+    valido, novo_hash = await asyncio.wrap_future(futuro)
+    if not valido:
         return None
+    if novo_hash:
+        # Custo do hash mudou (PASSWORD_HASH_ROUNDS): regrava com os parâmetros atuais.
+        user.password_hash = novo_hash
+        await run_in_threadpool(db.commit)
+        invalidar_usuario_cache(user.id)
     return user
 
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> UsuarioAutenticado:
+    jwt, JWTError = _jose()
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail='Token inválido ou expirado.',
@@ -60,7 +169,13 @@ def get_current_user(
     except (TypeError, ValueError) as exc:
         raise credentials_exception from exc
 
+    usuario = _usuarios_cache.obter(user_id_int)
+    if usuario is not None:
+        return usuario
+
     user = db.scalar(select(User).where(User.id == user_id_int))
     if user is None:
         raise credentials_exception
-    return user
+    usuario = usuario_autenticado(user)
+    _usuarios_cache.definir(user_id_int, usuario)
+    return usuario
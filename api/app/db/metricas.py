@@ -0,0 +1,184 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger('app.sql')
+
+_PARAMETRO = re.compile(r'%\(\w+\)s|\$\d+|%s|\?')
+_LISTA_PARAMETROS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_ESPACOS = re.compile(r'\s+')
+
+
+class OrcamentoSqlExcedido(RuntimeError):
+    pass
+
+
+@dataclass
+class MetricasSql:
+    consultas: int = 0
+    tempo_ms: float = 0.0
+    linhas: int = 0
+    formatos: Counter = field(default_factory=Counter)
+    orcamento: int | None = None
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.tempo_ms:.1f};desc="{self.consultas} consultas, {self.linhas} linhas"'
+
+    def repeticoes(self, limite: int) -> list[tuple[str, int]]:
+        return [(formato, total) for formato, total in self.formatos.most_common() if total >= limite]
+
+    def somar(self, outra: 'MetricasSql') -> None:
+        self.consultas += outra.consultas
+        self.tempo_ms += outra.tempo_ms
+        self.linhas += outra.linhas
+        self.formatos.update(outra.formatos)
+
+
+_metricas_atuais: ContextVar[MetricasSql | None] = ContextVar('metricas_sql', default=None)
+
+
+@contextmanager
+def metricas_isoladas() -> Iterator[MetricasSql]:
+    # MetricasSql não é thread-safe: trabalho em outra thread conta no próprio acumulador,
+    # que a thread da requisição soma depois com acumular_metricas.
+    metricas = MetricasSql()
+    token = _metricas_atuais.set(metricas)
+    try:
+        yield metricas
+    finally:
+        _metricas_atuais.reset(token)
+
+
+def acumular_metricas(parcial: MetricasSql) -> None:
+    metricas = _metricas_atuais.get()
+    if metricas is not None:
+        metricas.somar(parcial)
+
+
+def _normalizar(statement: str) -> str:
+    formato = _PARAMETRO.sub('?', statement)
+    formato = _LISTA_PARAMETROS.sub('(?)', formato)
+    return _ESPACOS.sub(' ', formato).strip()
+
+
+def _antes_execucao(conn, cursor, statement, parameters, context, executemany) -> None:
+    # O início fica no contexto da execução: se a instrução falhar, ele é descartado junto.
+    if _metricas_atuais.get() is not None and context is not None:
+        context._metricas_inicio = time.perf_counter()
+
+
+def _depois_execucao(conn, cursor, statement, parameters, context, executemany) -> None:
+    metricas = _metricas_atuais.get()
+    if metricas is None:
+        return
+    inicio = getattr(context, '_metricas_inicio', None)
+    if inicio is not None:
+        metricas.tempo_ms += (time.perf_counter() - inicio) * 1000
+    metricas.consultas += 1
+    # rowcount de INSERT/UPDATE/DELETE é de linhas afetadas; só conta quem devolve resultado.
+    if cursor.description is not None:
+        metricas.linhas += max(cursor.rowcount or 0, 0)
+    metricas.formatos[_normalizar(statement)] += 1
+
+
+def configurar_log() -> None:
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(settings.SQL_METRICS_LOG_LEVEL.upper())
+    logger.propagate = False
+
+
+def instrumentar_engine(engine: Engine) -> None:
+    event.listen(engine, 'before_cursor_execute', _antes_execucao)
+    event.listen(engine, 'after_cursor_execute', _depois_execucao)
+
+
+def orcamento_sql(maximo: int):
+    def definir_orcamento() -> None:
+        metricas = _metricas_atuais.get()
+        if metricas is not None:
+            metricas.orcamento = maximo
+
+    return Depends(definir_orcamento)
+
+
+def _rota(scope: Scope) -> str:
+    rota = scope.get('route')
+    return getattr(rota, 'path', None) or scope.get('path', '')
+
+
+def _registrar(scope: Scope, metricas: MetricasSql, status_code: int | None, duracao_ms: float) -> None:
+    rota = _rota(scope)
+    logger.info(
+        json.dumps(
+            {
+                'evento': 'sql_requisicao',
+                'metodo': scope.get('method'),
+                'rota': rota,
+                'status': status_code,
+                'duracao_ms': round(duracao_ms, 1),
+                'consultas': metricas.consultas,
+                'db_ms': round(metricas.tempo_ms, 1),
+                'linhas': metricas.linhas,
+            },
+            ensure_ascii=False,
+        )
+    )
+    for formato, total in metricas.repeticoes(settings.SQL_N_MAIS_1_LIMITE):
+        logger.warning(
+            json.dumps(
+                {'evento': 'sql_n_mais_1', 'rota': rota, 'repeticoes': total, 'consulta': formato[:500]},
+                ensure_ascii=False,
+            )
+        )
+    if metricas.orcamento is not None and metricas.consultas > metricas.orcamento:
+        mensagem = f'{scope.get("method")} {rota} executou {metricas.consultas} consultas (orçamento: {metricas.orcamento}).'
+        if settings.SQL_ORCAMENTO_ESTRITO:
+            raise OrcamentoSqlExcedido(mensagem)
+        logger.warning(json.dumps({'evento': 'sql_orcamento_excedido', 'mensagem': mensagem}, ensure_ascii=False))
+
+
+class MetricasSqlMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not settings.SQL_METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        metricas = MetricasSql()
+        token = _metricas_atuais.set(metricas)
+        inicio = time.perf_counter()
+        status_code: int | None = None
+
+        async def enviar(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                MutableHeaders(scope=message).append('Server-Timing', metricas.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _metricas_atuais.reset(token)
+        _registrar(scope, metricas, status_code, (time.perf_counter() - inicio) * 1000)
@@ -4,10 +4,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
+from app.db.metricas import instrumentar_engine
 
 settings = get_settings()
 
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+instrumentar_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 
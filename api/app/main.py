@@ -1,240 +1,109 @@
-﻿import time
-from contextlib import asynccontextmanager
-from datetime import date
+﻿import asyncio
+import time
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import select
 
 from app.core.config import get_settings
-from app.core.security import hash_password
-from app.db.session import SessionLocal
-from app.models.fsc import (
-    AuditoriaAno,
-    ConfiguracaoSistema,
-    Criterio,
-    EvidenceType,
-    Indicador,
-    ProgramaCertificacao,
-    StatusConformidadeEnum,
-)
-from app.models.user import RoleEnum, User
-from app.routers import auth, fsc, reports
+from app.db.metricas import MetricasSqlMiddleware, configurar_log
+from app.routers import auth, fsc, jobs, reports
+from app.services.particoes_audit_logs import manter_particoes_audit_logs
+from app.services.prontidao import estado_prontidao, registrar_seed, registrar_storage
 from app.services.s3_storage import ensure_bucket_exists
+from app.services.seed import executar_seed
 
 settings = get_settings()
 
 
-def _seed_programas_certificacao() -> None:
-    programas_padrao = [
-        ('FSC', 'FSC', 'Forest Stewardship Council'),
-        ('PEFC', 'PEFC', 'Programme for the Endorsement of Forest Certification'),
-        ('ONCA_PINTADA', 'Onça Pintada', 'Certificação e monitoramento para onça pintada'),
-        ('CARBONO', 'Carbono', 'Programas e auditorias para carbono florestal'),
-    ]
-
-    with SessionLocal() as db:
-        existentes = {codigo for codigo in db.scalars(select(ProgramaCertificacao.codigo)).all()}
-        for codigo, nome, descricao in programas_padrao:
-            if codigo == 'PEFC' and 'PFC' in existentes and 'PEFC' not in existentes:
-                # Será normalizado de PFC -> PEFC na rotina seguinte.
-                continue
-            if codigo in existentes:
-                continue
-            db.add(ProgramaCertificacao(codigo=codigo, nome=nome, descricao=descricao))
-            existentes.add(codigo)
-        db.commit()
-
-
-def _normalizar_programas_certificacao() -> None:
-    padrao_por_codigo = {
-        'FSC': ('FSC', 'Forest Stewardship Council'),
-        'PEFC': ('PEFC', 'Programme for the Endorsement of Forest Certification'),
-        'PFC': ('PEFC', 'Programme for the Endorsement of Forest Certification'),
-        'ONCA_PINTADA': ('Onça Pintada', 'Certificação e monitoramento para onça pintada'),
-        'CARBONO': ('Carbono', 'Programas e auditorias para carbono florestal'),
-    }
-
-    with SessionLocal() as db:
-        programas = list(db.scalars(select(ProgramaCertificacao)).all())
-        tem_pefc = any(programa.codigo == 'PEFC' for programa in programas)
-        alterou = False
-        for programa in programas:
-            padrao = padrao_por_codigo.get(programa.codigo)
-            if not padrao:
-                continue
-
-            if programa.codigo == 'PFC' and tem_pefc:
-                # Mantém legado quando já existe PEFC para evitar conflito de unicidade.
-                continue
-
-            nome, descricao = padrao
-            if programa.codigo == 'PFC' and not tem_pefc:
-                programa.codigo = 'PEFC'
-                alterou = True
-            if programa.nome != nome:
-                programa.nome = nome
-                alterou = True
-            if programa.descricao != descricao:
-                programa.descricao = descricao
-                alterou = True
-
-        if alterou:
-            db.commit()
-
-
-def _seed_auditorias_iniciais() -> None:
-    ano_atual = date.today().year
-    with SessionLocal() as db:
-        programas = list(db.scalars(select(ProgramaCertificacao)).all())
-        alterou = False
-        for programa in programas:
-            possui_auditoria = db.scalar(
-                select(AuditoriaAno.id).where(AuditoriaAno.programa_id == programa.id).limit(1)
-            )
-            if possui_auditoria:
-                continue
-            db.add(
-                AuditoriaAno(
-                    programa_id=programa.id,
-                    year=ano_atual,
-                    tipo='Certificação',
-                )
-            )
-            alterou = True
-
-        if alterou:
-            db.commit()
-
-
-def _seed_evidence_types() -> None:
-    tipos_padrao = [
-        ('Foto', 'Registro fotográfico de campo.'),
-        ('Mapa', 'Mapas temáticos e georreferenciados.'),
-        ('Licença/Autorização', 'Licenças, autorizações e documentos legais.'),
-        ('Procedimento', 'Procedimentos operacionais e instruções de trabalho.'),
-        ('Relatório', 'Relatórios técnicos e de auditoria.'),
-        ('Registro', 'Registros operacionais e evidências documentais.'),
-        ('Ata/Consulta', 'Atas de reunião e consultas a partes interessadas.'),
-        ('Monitoramento', 'Dados e relatórios de monitoramento.'),
-    ]
-
-    with SessionLocal() as db:
-        indicadores = list(db.scalars(select(Indicador).order_by(Indicador.id)).all())
-        if not indicadores:
-            return
-        existentes = {
-            (int(programa_id), int(criterio_id), int(indicador_id), str(nome).lower())
-            for programa_id, criterio_id, indicador_id, nome in db.execute(
-                select(
-                    EvidenceType.programa_id,
-                    EvidenceType.criterio_id,
-                    EvidenceType.indicador_id,
-                    EvidenceType.nome,
-                ).where(
-                    EvidenceType.programa_id.is_not(None),
-                    EvidenceType.criterio_id.is_not(None),
-                    EvidenceType.indicador_id.is_not(None),
-                )
-            ).all()
-        }
-        alterou = False
-
-        criterio_por_id = {
-            criterio.id: criterio
-            for criterio in db.scalars(select(Criterio).where(Criterio.id.in_([i.criterio_id for i in indicadores]))).all()
-        }
-        for nome, descricao in tipos_padrao:
-            for indicador in indicadores:
-                criterio = criterio_por_id.get(indicador.criterio_id)
-                if not criterio:
-                    continue
-                chave = (indicador.programa_id, criterio.id, indicador.id, nome.lower())
-                if chave in existentes:
-                    continue
-                db.add(
-                    EvidenceType(
-                        programa_id=indicador.programa_id,
-                        criterio_id=criterio.id,
-                        indicador_id=indicador.id,
-                        nome=nome,
-                        descricao=descricao,
-                        status_conformidade=StatusConformidadeEnum.conforme,
-                    )
-                )
-                existentes.add(chave)
-                alterou = True
-        if alterou:
-            db.commit()
-
-
-def _seed_admin_user() -> None:
-    with SessionLocal() as db:
-        admin = db.scalar(select(User).where(User.email == 'admin@local'))
-        if admin:
-            return
-        db.add(
-            User(
-                nome='Administrador',
-                email='admin@local',
-                role=RoleEnum.ADMIN,
-                password_hash=hash_password('admin123'),
-            )
-        )
-        db.commit()
-
-
-def _seed_configuracao_sistema() -> None:
-    with SessionLocal() as db:
-        existente = db.scalar(select(ConfiguracaoSistema).limit(1))
-        if existente:
-            return
-        db.add(ConfiguracaoSistema(nome_empresa='Empresa'))
-        db.commit()
+def _espera_storage(tentativa: int) -> float:
+    return min(2 ** (tentativa - 1), settings.S3_BOOTSTRAP_BACKOFF_MAX_SECONDS)
 
 
 def _setup_storage_with_retry() -> None:
-    tentativas = 10
-    for tentativa in range(1, tentativas + 1):
+    # Modo estrito (S3_STRICT_STARTUP): o app só sobe com o bucket validado. O prazo é do total de
+    # tentativas, não de cada espera, para caber na janela de health check da plataforma.
+    limite = time.monotonic() + settings.S3_STRICT_STARTUP_MAX_SECONDS
+    tentativa = 0
+    while True:
+        tentativa += 1
         try:
             ensure_bucket_exists()
+            registrar_storage(True, tentativa)
             return
         except Exception as exc:
-            if tentativa == tentativas:
-                if settings.S3_STRICT_STARTUP:
-                    raise
+            registrar_storage(False, tentativa, str(exc))
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                raise
+            time.sleep(min(_espera_storage(tentativa), restante))
+
+
+async def _setup_storage_em_segundo_plano() -> None:
+    tentativa = 0
+    while True:
+        tentativa += 1
+        try:
+            await asyncio.to_thread(ensure_bucket_exists)
+        except Exception as exc:
+            registrar_storage(False, tentativa, str(exc))
+            if tentativa == 1:
                 print(
                     'Aviso: não foi possível validar/criar bucket de evidências no startup. '
-                    f'O upload de arquivos pode falhar até ajustar S3. Erro: {exc}'
+                    f'Nova tentativa em segundo plano; uploads podem falhar até o S3 responder. Erro: {exc}'
                 )
-                return
-            time.sleep(2)
+            await asyncio.sleep(_espera_storage(tentativa))
+        else:
+            registrar_storage(True, tentativa)
+            if tentativa > 1:
+                print(f'Bucket de evidências validado após {tentativa} tentativas.')
+            return
+
+
+async def _manter_particoes_periodicamente() -> None:
+    # A primeira rodada também fica em segundo plano: a partição DEFAULT (migração 0023) já garante as
+    # escritas, então uma falha ou espera por lock aqui não deve travar nem abortar o startup.
+    while True:
+        try:
+            await asyncio.to_thread(manter_particoes_audit_logs)
+        except Exception as exc:
+            print(f'Aviso: falha na manutenção das partições de audit_logs. Erro: {exc}')
+        await asyncio.sleep(settings.AUDIT_LOGS_MANUTENCAO_INTERVALO_HORAS * 3600)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    _setup_storage_with_retry()
-    _seed_programas_certificacao()
-    _normalizar_programas_certificacao()
-    _seed_auditorias_iniciais()
-    _seed_evidence_types()
-    _seed_admin_user()
-    _seed_configuracao_sistema()
+    tarefas = []
+    if settings.S3_STRICT_STARTUP:
+        _setup_storage_with_retry()
+    else:
+        tarefas.append(asyncio.create_task(_setup_storage_em_segundo_plano()))
+    registrar_seed(executar_seed())
+    tarefas.append(asyncio.create_task(_manter_particoes_periodicamente()))
     yield
+    for tarefa in tarefas:
+        tarefa.cancel()
+        with suppress(asyncio.CancelledError):
+            await tarefa
 
 
 app = FastAPI(title=settings.APP_NAME, version='1.0.0', lifespan=lifespan)
 
+configurar_log()
+app.add_middleware(MetricasSqlMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins(),
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=['X-Next-Cursor', 'X-Total-Count'],
 )
 
 app.include_router(auth.router)
 app.include_router(fsc.router)
+app.include_router(jobs.router)
 app.include_router(reports.router)
 
 
@@ -246,3 +115,12 @@ def root() -> dict[str, str]:
 @app.get('/api/health')
 def health() -> dict[str, str]:
     return {'status': 'ok'}
+
+
+@app.get('/api/ready')
+def ready(response: Response) -> dict:
+    # Storage e seed vêm das verificações já feitas (não consulta S3 a cada chamada); o banco é testado com SELECT 1.
+    pronto, estado = estado_prontidao()
+    if not pronto:
+        response.status_code = 503
+    return estado
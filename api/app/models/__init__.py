@@ -1,15 +1,17 @@
-﻿from app.models.auditlog import AcaoAuditEnum, AuditLog
+﻿from app.models.auditlog import AcaoAuditEnum, AuditLog, FormatoAuditEnum
 from app.models.base import Base
 from app.models.fsc import (
     AuditoriaAno,
     AnaliseNaoConformidade,
     AvaliacaoIndicador,
+    ContadorConformidade,
     Criterio,
     Demanda,
     DocumentoEvidencia,
     MonitoramentoCriterio,
     NotificacaoMonitoramento,
     ResolucaoNotificacao,
+    SeedVersao,
     EvidenceType,
     Evidencia,
     EvidenciaKindEnum,
@@ -25,6 +27,7 @@ from app.models.fsc import (
     StatusMonitoramentoCriterioEnum,
     StatusNotificacaoEnum,
 )
+from app.models.job import Job, StatusJobEnum
 from app.models.user import RoleEnum, User
 
 __all__ = [
@@ -38,6 +41,7 @@ __all__ = [
     'AuditoriaAno',
     'AnaliseNaoConformidade',
     'AvaliacaoIndicador',
+    'ContadorConformidade',
     'StatusConformidadeEnum',
     'Demanda',
     'DocumentoEvidencia',
@@ -48,6 +52,7 @@ __all__ = [
     'StatusAnaliseNcEnum',
     'PrioridadeEnum',
     'ConfiguracaoSistema',
+    'SeedVersao',
     'EvidenceType',
     'Evidencia',
     'EvidenciaKindEnum',
@@ -56,4 +61,7 @@ __all__ = [
     'StatusNotificacaoEnum',
     'AuditLog',
     'AcaoAuditEnum',
+    'FormatoAuditEnum',
+    'Job',
+    'StatusJobEnum',
 ]
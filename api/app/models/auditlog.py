@@ -1,7 +1,7 @@
 ﻿import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, JSON, String, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, JSON, Sequence, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -14,18 +14,46 @@ class AcaoAuditEnum(str, enum.Enum):
     STATUS_CHANGE = 'STATUS_CHANGE'
 
 
+class FormatoAuditEnum(str, enum.Enum):
+    # completo: old/new inteiros; diff: só os campos alterados; checkpoint: diff em old e estado inteiro em new.
+    completo = 'completo'
+    diff = 'diff'
+    checkpoint = 'checkpoint'
+
+
 class AuditLog(Base):
+    # Particionada por mês em created_at (migração 0016); partições futuras e retenção em
+    # app/services/particoes_audit_logs.py. A chave primária inclui created_at por exigência do particionamento.
     __tablename__ = 'audit_logs'
-
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    entidade: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    entidade_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    __table_args__ = (
+        Index('ix_audit_logs_created_at_brin', 'created_at', postgresql_using='brin'),
+        Index('ix_audit_logs_entidade_entidade_id_created_at', 'entidade', 'entidade_id', 'created_at'),
+        Index('ix_audit_logs_auditoria_programa_created_at', 'auditoria_ano_id', 'programa_id', 'created_at'),
+        Index('ix_audit_logs_programa_created_at', 'programa_id', 'created_at'),
+        Index('ix_audit_logs_created_at_id', 'created_at', 'id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, Sequence('audit_logs_id_seq'), primary_key=True)
+    entidade: Mapped[str] = mapped_column(String(100), nullable=False)
+    entidade_id: Mapped[int] = mapped_column(Integer, nullable=False)
     acao: Mapped[AcaoAuditEnum] = mapped_column(Enum(AcaoAuditEnum, name='acao_audit_enum', native_enum=False), nullable=False)
     old_value: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     new_value: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    formato: Mapped[FormatoAuditEnum] = mapped_column(
+        Enum(FormatoAuditEnum, name='formato_audit_enum', native_enum=False),
+        nullable=False,
+        default=FormatoAuditEnum.completo,
+        server_default=FormatoAuditEnum.completo.value,
+    )
     created_by: Mapped[int | None] = mapped_column(ForeignKey('usuarios.id', ondelete='SET NULL'), nullable=True)
-    programa_id: Mapped[int | None] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='SET NULL'), nullable=True, index=True)
-    auditoria_ano_id: Mapped[int | None] = mapped_column(ForeignKey('auditorias_ano.id', ondelete='SET NULL'), nullable=True, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+    programa_id: Mapped[int | None] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='SET NULL'), nullable=True)
+    auditoria_ano_id: Mapped[int | None] = mapped_column(ForeignKey('auditorias_ano.id', ondelete='SET NULL'), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=func.now(),
+    )
 
     autor = relationship('User', back_populates='logs')
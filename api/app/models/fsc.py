@@ -1,7 +1,22 @@
 import enum
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import (
+    Computed,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    extract,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -63,6 +78,19 @@ class StatusAnaliseNcEnum(str, enum.Enum):
     concluida = 'concluida'
 
 
+# Coluna gerada `busca` de princípios, critérios e indicadores (migração 0018). O código entra sem stemming.
+EXPRESSAO_BUSCA_CATALOGO = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(codigo, '')), 'A') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(titulo, '')), 'A') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(descricao, '')), 'B')"
+)
+
+
+def _coluna_busca() -> Mapped[str | None]:
+    # deferred: o tsvector só é usado em WHERE/ORDER BY, nunca carregado nos objetos.
+    return mapped_column(TSVECTOR, Computed(EXPRESSAO_BUSCA_CATALOGO, persisted=True), deferred=True)
+
+
 class ProgramaCertificacao(Base):
     __tablename__ = 'programas_certificacao'
 
@@ -71,6 +99,8 @@ class ProgramaCertificacao(Base):
     nome: Mapped[str] = mapped_column(String(120), nullable=False, unique=True)
     descricao: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Incrementada no commit de qualquer alteração em princípios, critérios, indicadores ou tipos de evidência.
+    catalogo_versao: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default='1')
 
     principios = relationship('Principio', back_populates='programa')
     criterios = relationship('Criterio', back_populates='programa')
@@ -89,6 +119,7 @@ class ProgramaCertificacao(Base):
 
 class Principio(Base):
     __tablename__ = 'principios'
+    __table_args__ = (Index('ix_principios_busca', 'busca', postgresql_using='gin'),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     programa_id: Mapped[int] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='RESTRICT'), nullable=False, index=True)
@@ -96,6 +127,7 @@ class Principio(Base):
     titulo: Mapped[str] = mapped_column(String(255), nullable=False)
     descricao: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    busca: Mapped[str | None] = _coluna_busca()
 
     programa = relationship('ProgramaCertificacao', back_populates='principios')
     criterios = relationship('Criterio', back_populates='principio', cascade='all, delete-orphan')
@@ -103,6 +135,7 @@ class Principio(Base):
 
 class Criterio(Base):
     __tablename__ = 'criterios'
+    __table_args__ = (Index('ix_criterios_busca', 'busca', postgresql_using='gin'),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     programa_id: Mapped[int] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='RESTRICT'), nullable=False, index=True)
@@ -110,6 +143,7 @@ class Criterio(Base):
     codigo: Mapped[str | None] = mapped_column(String(50), nullable=True)
     titulo: Mapped[str] = mapped_column(Text, nullable=False)
     descricao: Mapped[str | None] = mapped_column(Text, nullable=True)
+    busca: Mapped[str | None] = _coluna_busca()
 
     programa = relationship('ProgramaCertificacao', back_populates='criterios')
     principio = relationship('Principio', back_populates='criterios')
@@ -121,6 +155,7 @@ class Criterio(Base):
 
 class Indicador(Base):
     __tablename__ = 'indicadores'
+    __table_args__ = (Index('ix_indicadores_busca', 'busca', postgresql_using='gin'),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     programa_id: Mapped[int] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='RESTRICT'), nullable=False, index=True)
@@ -128,6 +163,7 @@ class Indicador(Base):
     codigo: Mapped[str | None] = mapped_column(String(50), nullable=True)
     titulo: Mapped[str] = mapped_column(String(255), nullable=False)
     descricao: Mapped[str | None] = mapped_column(Text, nullable=True)
+    busca: Mapped[str | None] = _coluna_busca()
 
     programa = relationship('ProgramaCertificacao', back_populates='indicadores')
     criterio = relationship('Criterio', back_populates='indicadores')
@@ -160,7 +196,14 @@ class AuditoriaAno(Base):
 
 class AvaliacaoIndicador(Base):
     __tablename__ = 'avaliacoes_indicador'
-    __table_args__ = (UniqueConstraint('indicator_id', 'auditoria_ano_id', name='uq_avaliacao_indicator_auditoria'),)
+    __table_args__ = (
+        UniqueConstraint('indicator_id', 'auditoria_ano_id', name='uq_avaliacao_indicator_auditoria'),
+        Index(
+            'ix_avaliacoes_indicador_auditoria_mes',
+            'auditoria_ano_id',
+            extract('month', func.timezone('UTC', text('assessed_at'))),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     programa_id: Mapped[int] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='RESTRICT'), nullable=False, index=True)
@@ -187,6 +230,18 @@ class AvaliacaoIndicador(Base):
     analises_nc = relationship('AnaliseNaoConformidade', back_populates='avaliacao', cascade='all, delete-orphan')
 
 
+class ContadorConformidade(Base):
+    __tablename__ = 'contadores_conformidade'
+
+    auditoria_ano_id: Mapped[int] = mapped_column(ForeignKey('auditorias_ano.id', ondelete='CASCADE'), primary_key=True)
+    principio_id: Mapped[int] = mapped_column(ForeignKey('principios.id', ondelete='CASCADE'), primary_key=True, index=True)
+    status_conformidade: Mapped[StatusConformidadeEnum] = mapped_column(
+        Enum(StatusConformidadeEnum, name='status_conformidade_enum', native_enum=False),
+        primary_key=True,
+    )
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+
+
 class EvidenceType(Base):
     __tablename__ = 'tipos_evidencia'
     __table_args__ = (
@@ -226,6 +281,10 @@ class EvidenceType(Base):
 
 class Evidencia(Base):
     __tablename__ = 'evidencias'
+    __table_args__ = (
+        Index('ix_evidencias_avaliacao_mes', 'avaliacao_id', extract('month', func.timezone('UTC', text('created_at')))),
+        Index('ux_evidencias_arquivo_url', 'url_or_path', unique=True, postgresql_where=text("kind = 'arquivo'")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     programa_id: Mapped[int] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='RESTRICT'), nullable=False, index=True)
@@ -247,6 +306,21 @@ class Evidencia(Base):
 
 class DocumentoEvidencia(Base):
     __tablename__ = 'documentos_evidencia'
+    __table_args__ = (
+        # Criados pela migração 0019 quando o pg_trgm está disponível; atendem ILIKE '%termo%'.
+        Index(
+            'ix_documentos_evidencia_titulo_trgm',
+            'titulo',
+            postgresql_using='gin',
+            postgresql_ops={'titulo': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_documentos_evidencia_conteudo_trgm',
+            'conteudo',
+            postgresql_using='gin',
+            postgresql_ops={'conteudo': 'gin_trgm_ops'},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     programa_id: Mapped[int] = mapped_column(ForeignKey('programas_certificacao.id', ondelete='RESTRICT'), nullable=False, index=True)
@@ -266,7 +340,7 @@ class DocumentoEvidencia(Base):
     responsavel_id: Mapped[int | None] = mapped_column(ForeignKey('usuarios.id', ondelete='SET NULL'), nullable=True, index=True)
     revisado_por_id: Mapped[int | None] = mapped_column(ForeignKey('usuarios.id', ondelete='SET NULL'), nullable=True, index=True)
     data_revisao: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_by: Mapped[int] = mapped_column(ForeignKey('usuarios.id', ondelete='RESTRICT'), nullable=False)
+    created_by: Mapped[int] = mapped_column(ForeignKey('usuarios.id', ondelete='RESTRICT'), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -497,3 +571,12 @@ class ConfiguracaoSistema(Base):
     )
 
     autor_atualizacao = relationship('User')
+
+
+class SeedVersao(Base):
+    __tablename__ = 'seed_versoes'
+
+    versao: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    programa_max_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    indicador_max_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    aplicado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,60 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class StatusJobEnum(str, enum.Enum):
+    pendente = 'pendente'
+    executando = 'executando'
+    concluido = 'concluido'
+    falhou = 'falhou'
+
+
+class Job(Base):
+    # Fila de tarefas longas; o worker (python -m app.cli worker) reivindica com FOR UPDATE SKIP LOCKED.
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        Index(
+            'ix_jobs_pendentes',
+            'executar_apos',
+            'id',
+            postgresql_where=text("status = 'pendente'"),
+        ),
+        Index(
+            'ix_jobs_executando_heartbeat',
+            'heartbeat_em',
+            postgresql_where=text("status = 'executando'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    tipo: Mapped[str] = mapped_column(String(100), nullable=False)
+    parametros: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    status: Mapped[StatusJobEnum] = mapped_column(
+        Enum(StatusJobEnum, name='status_job_enum', native_enum=False),
+        nullable=False,
+        default=StatusJobEnum.pendente,
+        server_default=StatusJobEnum.pendente.value,
+    )
+    progresso: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    mensagem: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    resultado: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    erro: Mapped[str | None] = mapped_column(Text, nullable=True)
+    tentativas: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    max_tentativas: Mapped[int] = mapped_column(Integer, nullable=False, default=3, server_default='3')
+    executar_apos: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    iniciado_em: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_em: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    concluido_em: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_by: Mapped[int | None] = mapped_column(ForeignKey('usuarios.id', ondelete='SET NULL'), nullable=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -1,13 +1,17 @@
 ﻿from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.rbac import require_roles
 from app.core.security import (
+    UsuarioAutenticado,
     authenticate_user,
     create_access_token,
     get_current_user,
+    gravar_novo_usuario,
     hash_password,
+    invalidar_usuario_cache,
     verify_password,
 )
 from app.db.session import get_db
@@ -19,8 +23,8 @@ router = APIRouter(prefix='/api/auth', tags=['Autenticação'])
 
 
 @router.post('/login', response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
-    user = authenticate_user(db, payload.email, payload.senha)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
+    user = await authenticate_user(db, payload.email, payload.senha)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Email ou senha inválidos.')
 
@@ -29,12 +33,12 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse
 
 
 @router.post('/register', response_model=UserOut)
-def register(
+async def register(
     payload: UserCreate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN)),
 ) -> UserOut:
-    existing = db.scalar(select(User).where(User.email == payload.email))
+    existing = await run_in_threadpool(db.scalar, select(User).where(User.email == payload.email))
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Já existe usuário com este email.')
 
@@ -42,26 +46,26 @@ def register(
         nome=payload.nome,
         email=payload.email,
         role=payload.role,
-        password_hash=hash_password(payload.senha),
+        password_hash=await hash_password(payload.senha),
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await run_in_threadpool(gravar_novo_usuario, db, new_user)
 
 
 @router.get('/me', response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)) -> UserOut:
+def me(current_user: UsuarioAutenticado = Depends(get_current_user)) -> UserOut:
     return current_user
 
 
 @router.post('/alterar-senha', response_model=MensagemAuthOut)
-def alterar_senha(
+async def alterar_senha(
     payload: AlterarSenhaRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN)),
 ) -> MensagemAuthOut:
-    if not verify_password(payload.senha_atual, current_user.password_hash):
+    user = await run_in_threadpool(db.get, User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token inválido ou expirado.')
+    if not await verify_password(payload.senha_atual, user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Senha atual invalida.')
 
     if payload.senha_atual == payload.nova_senha:
@@ -70,6 +74,7 @@ def alterar_senha(
             detail='A nova senha deve ser diferente da senha atual.',
         )
 
-    current_user.password_hash = hash_password(payload.nova_senha)
-    db.commit()
+    user.password_hash = await hash_password(payload.nova_senha)
+    await run_in_threadpool(db.commit)
+    invalidar_usuario_cache(user.id)
     return MensagemAuthOut(mensagem='Senha alterada com sucesso.')
@@ -1,15 +1,30 @@
 ﻿
+import re
 from datetime import UTC, date, datetime
+from email.utils import format_datetime
 from pathlib import Path
+from typing import Any
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func, or_, select
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import String, and_, cast, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, defer, joinedload, selectinload
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import get_settings
 from app.core.rbac import require_roles
-from app.core.security import get_current_user, hash_password, verify_password
+from app.core.security import (
+    UsuarioAutenticado,
+    fingerprint_hash,
+    get_current_user,
+    gravar_novo_usuario,
+    hash_password,
+    invalidar_usuario_cache,
+    verificar_alguma_senha,
+)
+from app.db.metricas import orcamento_sql
 from app.db.session import get_db
 from app.models.auditlog import AcaoAuditEnum, AuditLog
 from app.models.fsc import (
@@ -36,6 +51,7 @@ from app.models.fsc import (
     StatusMonitoramentoCriterioEnum,
     StatusNotificacaoEnum,
 )
+from app.models.job import Job
 from app.models.user import RoleEnum, User
 from app.schemas.fsc import (
     AnaliseNcCreate,
@@ -43,14 +59,17 @@ from app.schemas.fsc import (
     AnaliseNcStatusPatch,
     AnaliseNcUpdate,
     AuditLogOut,
+    EstadoAuditLogOut,
     AuditoriaCreate,
     AuditoriaOut,
     AuditoriaUpdate,
     AvaliacaoCreate,
+    AvaliacaoDetalheCompletoOut,
     AvaliacaoDetalheOut,
     AvaliacaoOut,
     AvaliacaoPatch,
     AvaliacaoUpdate,
+    CatalogoProgramaOut,
     ConfiguracaoSistemaOut,
     ConfiguracaoSistemaUpdate,
     ConfirmacaoSenhaRequest,
@@ -61,6 +80,7 @@ from app.schemas.fsc import (
     DemandaOut,
     DemandaPatch,
     DemandaUpdate,
+    DocumentoEvidenciaBuscaOut,
     DocumentoEvidenciaCreate,
     DocumentoEvidenciaOut,
     DocumentoEvidenciaStatusPatch,
@@ -74,15 +94,19 @@ from app.schemas.fsc import (
     NotificacaoMonitoramentoUpdate,
     ResolucaoNotificacaoCreate,
     ResolucaoNotificacaoOut,
+    ResultadoBuscaCatalogoOut,
     EvidenceTypeCreate,
     EvidenceTypeOut,
     EvidenceTypeUpdate,
+    GradeAvaliacaoItem,
     EvidenciaCreate,
     EvidenciaOut,
+    GeracaoAvaliacoesOut,
     IndicadorCreate,
     IndicadorOut,
     IndicadorUpdate,
     MensagemOut,
+    OrdenacaoGradeEnum,
     ProgramaCertificacaoCreate,
     ProgramaCertificacaoOut,
     ProgramaCertificacaoUpdate,
@@ -90,10 +114,40 @@ from app.schemas.fsc import (
     PrincipioOut,
     PrincipioUpdate,
     ResponsavelCreate,
+    SituacaoEvidenciaEnum,
+    UploadArquivoUrlRequest,
+    UploadEvidenciaFinalizarRequest,
+    UploadEvidenciaUrlRequest,
+    UploadLogoFinalizarRequest,
+    UploadPreAssinadoOut,
 )
+from app.schemas.job import JobOut
 from app.schemas.user import UserOut
-from app.services.audit_logger import registrar_log
-from app.services.s3_storage import baixar_arquivo_s3, upload_fileobj
+from app.services.audit_logger import reconstruir_estado, registrar_log
+from app.services.busca_catalogo import buscar_no_catalogo, consulta_busca, filtrar_por_busca
+from app.services.busca_documentos import filtro_texto_documentos, trechos_documentos
+from app.services.catalogo import obter_catalogo, versao_catalogo
+from app.services.contadores_conformidade import ajustar_contadores, reconstruir_contadores
+from app.services.jobs import enfileirar_job
+from app.services.paginacao import ChaveOrdenacao, Paginacao, paginar, parametros_paginacao
+from app.services.s3_storage import (
+    IntervaloS3Invalido,
+    ObjetoS3NaoModificado,
+    abrir_objeto_s3,
+    consultar_objeto_s3,
+    gerar_upload_pre_assinado,
+    montar_uri_s3,
+    upload_fileobj,
+)
+from app.services.serializacao import serializar_modelo
+from app.services.tarefas import (
+    TAREFA_GERAR_AVALIACOES,
+    TAREFA_REMOVER_AUDITORIA,
+    excluir_auditoria,
+    gerar_avaliacoes,
+)
+
+settings = get_settings()
 
 router = APIRouter(prefix='/api', tags=['Certificações'])
 
@@ -109,15 +163,45 @@ STATUS_AVALIACAO_CRONOGRAMA = (
     StatusConformidadeEnum.oportunidade_melhoria,
 )
 
+INTERVALO_BYTES = re.compile(r'bytes=(\d+-\d*|-\d+)')
+SUFIXO_INVALIDO = re.compile(r'[^A-Za-z0-9.]')
+KEY_UPLOAD = re.compile(r'[0-9a-f]{32}[A-Za-z0-9.]{0,16}')
+PREFIXO_LOGO = 'configuracoes/logo_empresa_'
+
 STATUS_AVALIACAO_ANALISE_NC = (
     StatusConformidadeEnum.nc_menor,
     StatusConformidadeEnum.nc_maior,
     StatusConformidadeEnum.oportunidade_melhoria,
 )
 
-
-def _dump_model(model) -> dict:
-    return jsonable_encoder({column.name: getattr(model, column.name) for column in model.__table__.columns})
+# Ordenações das listagens; a última chave é sempre única para o cursor de paginação.
+ORDEM_AVALIACOES = [ChaveOrdenacao(AvaliacaoIndicador.id)]
+ORDEM_EVIDENCIAS = [
+    ChaveOrdenacao(Evidencia.created_at, decrescente=True),
+    ChaveOrdenacao(Evidencia.id, decrescente=True),
+]
+ORDEM_DOCUMENTOS_EVIDENCIA = [
+    ChaveOrdenacao(DocumentoEvidencia.updated_at, decrescente=True),
+    ChaveOrdenacao(DocumentoEvidencia.id, decrescente=True),
+]
+ORDEM_MONITORAMENTOS_CRITERIO = [
+    ChaveOrdenacao(MonitoramentoCriterio.mes_referencia, decrescente=True),
+    ChaveOrdenacao(MonitoramentoCriterio.updated_at, decrescente=True),
+    ChaveOrdenacao(MonitoramentoCriterio.id, decrescente=True),
+]
+ORDEM_ANALISES_NC = [
+    ChaveOrdenacao(AnaliseNaoConformidade.updated_at, decrescente=True),
+    ChaveOrdenacao(AnaliseNaoConformidade.id, decrescente=True),
+]
+ORDEM_DEMANDAS = [
+    ChaveOrdenacao(Demanda.start_date, nulos_no_fim=True),
+    ChaveOrdenacao(Demanda.due_date, nulos_no_fim=True),
+    ChaveOrdenacao(Demanda.id, decrescente=True),
+]
+ORDEM_LOGS = [
+    ChaveOrdenacao(AuditLog.created_at, decrescente=True),
+    ChaveOrdenacao(AuditLog.id, decrescente=True),
+]
 
 
 def _texto_preenchido(valor: str | None) -> bool:
@@ -344,6 +428,108 @@ def _validar_tipo_evidencia_compativel_com_avaliacao(
         )
 
 
+def _validar_evidencia_arquivo(
+    db: Session,
+    avaliacao: AvaliacaoIndicador,
+    tipo_evidencia_id: int | None,
+    nao_conforme: bool,
+    observacoes: str | None,
+) -> None:
+    if nao_conforme and not (observacoes or '').strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Informe observações para evidência marcada como não conforme.',
+        )
+    if tipo_evidencia_id is not None:
+        tipo = _buscar_tipo_evidencia(db, tipo_evidencia_id)
+        _validar_tipo_evidencia_compativel_com_avaliacao(db, tipo, avaliacao)
+
+
+def _registrar_evidencia_arquivo(
+    db: Session,
+    avaliacao: AvaliacaoIndicador,
+    url_or_path: str,
+    tipo_evidencia_id: int | None,
+    nao_conforme: bool,
+    observacoes: str | None,
+    current_user: UsuarioAutenticado,
+) -> Evidencia:
+    evidencia = Evidencia(
+        programa_id=avaliacao.programa_id,
+        avaliacao_id=avaliacao.id,
+        tipo_evidencia_id=tipo_evidencia_id,
+        kind=EvidenciaKindEnum.arquivo,
+        url_or_path=url_or_path,
+        nao_conforme=nao_conforme,
+        observacoes=observacoes,
+        created_by=current_user.id,
+    )
+    db.add(evidencia)
+    db.flush()
+    registrar_log(
+        db,
+        entidade='evidencia',
+        entidade_id=evidencia.id,
+        acao=AcaoAuditEnum.CREATE,
+        created_by=current_user.id,
+        new_value=serializar_modelo(evidencia),
+        programa_id=avaliacao.programa_id,
+        auditoria_ano_id=avaliacao.auditoria_ano_id,
+    )
+    db.commit()
+    db.refresh(evidencia)
+    return evidencia
+
+
+def _prefixo_arquivos_avaliacao(avaliacao: AvaliacaoIndicador) -> str:
+    return f'auditoria_{avaliacao.auditoria_ano_id}/avaliacao_{avaliacao.id}/'
+
+
+def _sufixo_arquivo(nome_arquivo: str | None) -> str:
+    return SUFIXO_INVALIDO.sub('', Path(nome_arquivo or 'arquivo').suffix)[:16]
+
+
+def _upload_pre_assinado(key: str, content_type: str, tamanho: int) -> UploadPreAssinadoOut:
+    expira_em = settings.S3_UPLOAD_URL_EXPIRES_SECONDS
+    try:
+        upload = gerar_upload_pre_assinado(key, content_type, tamanho, expira_em)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Não foi possível preparar o envio para o armazenamento.',
+        ) from exc
+    return UploadPreAssinadoOut(url=upload['url'], campos=upload['fields'], key=key, expira_em_segundos=expira_em)
+
+
+def _validar_key_upload(key: str, prefixo: str) -> None:
+    # Só aceita chaves geradas por este servidor: prefixo esperado + uuid hex + sufixo sanitizado.
+    if not key.startswith(prefixo) or not KEY_UPLOAD.fullmatch(key[len(prefixo):]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Chave de upload inválida.')
+
+
+def _verificar_objeto_enviado(key: str, tamanho_maximo: int, tipo_prefixo: str | None = None) -> dict:
+    try:
+        objeto = consultar_objeto_s3(key)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Não foi possível consultar o armazenamento.',
+        ) from exc
+    if objeto is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Arquivo não encontrado no armazenamento. Conclua o envio antes de finalizar.',
+        )
+    if objeto['tamanho'] > tamanho_maximo:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'Arquivo excede o limite de {tamanho_maximo} bytes.',
+        )
+    if tipo_prefixo and not (objeto['content_type'] or '').startswith(tipo_prefixo):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Tipo de arquivo enviado não é permitido.')
+    return objeto
+
+
 def _buscar_demanda(db: Session, demanda_id: int) -> Demanda:
     demanda = db.get(Demanda, demanda_id)
     if not demanda:
@@ -475,6 +661,10 @@ def _obter_ou_criar_configuracao(db: Session) -> ConfiguracaoSistema:
     return configuracao
 
 
+def _versao_logo(configuracao: ConfiguracaoSistema) -> str:
+    return str(int(configuracao.updated_at.timestamp()) if configuracao.updated_at else configuracao.id)
+
+
 def _montar_logo_preview_url(configuracao: ConfiguracaoSistema, request: Request) -> str | None:
     if not configuracao.logo_url:
         return None
@@ -482,8 +672,76 @@ def _montar_logo_preview_url(configuracao: ConfiguracaoSistema, request: Request
         return configuracao.logo_url
 
     base_url = str(request.base_url).rstrip('/')
-    versao = int(configuracao.updated_at.timestamp()) if configuracao.updated_at else configuracao.id
-    return f'{base_url}/api/configuracoes/logo?v={versao}'
+    return f'{base_url}/api/configuracoes/logo?v={_versao_logo(configuracao)}'
+
+
+def _resposta_arquivo_s3(
+    s3_uri: str,
+    request: Request,
+    cache_control: str,
+    content_disposition: str | None = None,
+) -> Response:
+    # Apenas um intervalo simples é repassado ao S3; pedidos multi-range recebem o arquivo inteiro.
+    intervalo = request.headers.get('range')
+    if intervalo and not INTERVALO_BYTES.fullmatch(intervalo.strip()):
+        intervalo = None
+
+    try:
+        objeto = abrir_objeto_s3(s3_uri, intervalo=intervalo, if_none_match=request.headers.get('if-none-match'))
+    except ObjetoS3NaoModificado as exc:
+        headers = {'Cache-Control': cache_control}
+        if exc.etag:
+            headers['ETag'] = exc.etag
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    except IntervaloS3Invalido as exc:
+        headers = {'Content-Range': f'bytes */{exc.tamanho_total}'} if exc.tamanho_total is not None else None
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail='Intervalo solicitado inválido.',
+            headers=headers,
+        ) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Arquivo não encontrado no armazenamento.') from exc
+
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': cache_control,
+        'Content-Length': str(objeto.tamanho),
+    }
+    if objeto.etag:
+        headers['ETag'] = objeto.etag
+    if objeto.last_modified:
+        headers['Last-Modified'] = format_datetime(objeto.last_modified.astimezone(UTC), usegmt=True)
+    if objeto.content_range:
+        headers['Content-Range'] = objeto.content_range
+    if content_disposition:
+        headers['Content-Disposition'] = content_disposition
+    return StreamingResponse(
+        objeto.iterar(),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if objeto.content_range else status.HTTP_200_OK,
+        media_type=objeto.content_type or 'application/octet-stream',
+        headers=headers,
+    )
+
+
+def _atualizar_logo(db: Session, request: Request, logo_url: str, current_user: UsuarioAutenticado) -> ConfiguracaoSistemaOut:
+    configuracao = _obter_ou_criar_configuracao(db)
+    old_value = serializar_modelo(configuracao)
+    configuracao.logo_url = logo_url
+    configuracao.updated_by = current_user.id
+
+    registrar_log(
+        db,
+        entidade='configuracao_sistema',
+        entidade_id=configuracao.id,
+        acao=AcaoAuditEnum.UPDATE,
+        created_by=current_user.id,
+        old_value=old_value,
+        new_value=serializar_modelo(configuracao),
+    )
+    db.commit()
+    db.refresh(configuracao)
+    return _configuracao_out(configuracao, request)
 
 
 def _configuracao_out(configuracao: ConfiguracaoSistema, request: Request) -> ConfiguracaoSistemaOut:
@@ -506,20 +764,26 @@ def _validar_mesmo_programa(programa_a: int, programa_b: int, contexto: str) ->
         )
 
 
-def _validar_senha_sistema(senha_sistema: str | None, current_user: User) -> None:
+async def _validar_senha_sistema(db: Session, senha_sistema: str | None, current_user: UsuarioAutenticado) -> None:
     if not senha_sistema:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Informe a senha de login do usuário atual para confirmar esta ação.',
         )
-    senha_digitada = senha_sistema
-    senha_sem_espacos = senha_sistema.strip()
-    senha_valida = verify_password(senha_digitada, current_user.password_hash)
-    if not senha_valida and senha_sem_espacos != senha_digitada:
+    # O usuário em cache não carrega o hash; ele é lido só nas ações que pedem confirmação de senha.
+    password_hash = await run_in_threadpool(db.scalar, select(User.password_hash).where(User.id == current_user.id))
+    if password_hash is None:
+        invalidar_usuario_cache(current_user.id)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token inválido ou expirado.')
+    if fingerprint_hash(password_hash) != current_user.hash_fingerprint:
+        invalidar_usuario_cache(current_user.id)
+
+    senhas = [senha_sistema]
+    if senha_sistema.strip() != senha_sistema:
         # Tolerância para espaços acidentais no início/fim ao digitar no modal.
-        senha_valida = verify_password(senha_sem_espacos, current_user.password_hash)
+        senhas.append(senha_sistema.strip())
 
-    if not senha_valida:
+    if not await verificar_alguma_senha(senhas, password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Senha inválida. Use a mesma senha do login do usuário atual.',
@@ -530,7 +794,7 @@ def _validar_senha_sistema(senha_sistema: str | None, current_user: User) -> Non
 def obter_configuracoes_sistema(
     request: Request,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> ConfiguracaoSistemaOut:
     configuracao = _obter_ou_criar_configuracao(db)
     db.commit()
@@ -543,14 +807,14 @@ def atualizar_configuracoes_sistema(
     request: Request,
     payload: ConfiguracaoSistemaUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> ConfiguracaoSistemaOut:
     data = payload.model_dump(exclude_unset=True)
     if not data:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Nenhum campo foi informado para atualização.')
 
     configuracao = _obter_ou_criar_configuracao(db)
-    old_value = _dump_model(configuracao)
+    old_value = serializar_modelo(configuracao)
 
     if 'nome_empresa' in data:
         nome = data['nome_empresa']
@@ -572,7 +836,7 @@ def atualizar_configuracoes_sistema(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(configuracao),
+        new_value=serializar_modelo(configuracao),
     )
     db.commit()
     db.refresh(configuracao)
@@ -581,6 +845,8 @@ def atualizar_configuracoes_sistema(
 
 @router.get('/configuracoes/logo')
 def obter_logo_empresa(
+    request: Request,
+    v: str | None = Query(default=None),
     db: Session = Depends(get_db),
 ) -> Response:
     configuracao = _obter_ou_criar_configuracao(db)
@@ -592,16 +858,10 @@ def obter_logo_empresa(
             detail='Logo cadastrada não está em armazenamento interno.',
         )
 
-    try:
-        conteudo, content_type = baixar_arquivo_s3(configuracao.logo_url)
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Não foi possível carregar a logo.') from exc
-
-    return Response(
-        content=conteudo,
-        media_type=content_type or 'application/octet-stream',
-        headers={'Cache-Control': 'no-store'},
-    )
+    # Só a URL com a versão atual (_montar_logo_preview_url) pode ficar em cache indefinidamente;
+    # qualquer outro ?v= serviria a logo nova sob um endereço que não muda no próximo upload.
+    cache_control = 'public, max-age=31536000, immutable' if v == _versao_logo(configuracao) else 'no-cache'
+    return _resposta_arquivo_s3(configuracao.logo_url, request, cache_control)
 
 
 @router.post('/configuracoes/logo-upload', response_model=ConfiguracaoSistemaOut)
@@ -609,48 +869,79 @@ def upload_logo_empresa(
     request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> ConfiguracaoSistemaOut:
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Arquivo de logo inválido.')
     if file.content_type and not file.content_type.startswith('image/'):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Envie um arquivo de imagem para a logo.')
 
-    configuracao = _obter_ou_criar_configuracao(db)
-    old_value = _dump_model(configuracao)
+    key = f'{PREFIXO_LOGO}{uuid4().hex}{_sufixo_arquivo(file.filename)}'
+    logo_url = upload_fileobj(file.file, key, file.content_type)
+    return _atualizar_logo(db, request, logo_url, current_user)
 
-    suffix = Path(file.filename).suffix
-    key = f'configuracoes/logo_empresa_{uuid4().hex}{suffix}'
-    configuracao.logo_url = upload_fileobj(file.file, key, file.content_type)
-    configuracao.updated_by = current_user.id
 
-    registrar_log(
-        db,
-        entidade='configuracao_sistema',
-        entidade_id=configuracao.id,
-        acao=AcaoAuditEnum.UPDATE,
-        created_by=current_user.id,
-        old_value=old_value,
-        new_value=_dump_model(configuracao),
-    )
-    db.commit()
-    db.refresh(configuracao)
-    return _configuracao_out(configuracao, request)
+@router.post('/configuracoes/logo-upload-url', response_model=UploadPreAssinadoOut)
+def solicitar_upload_logo_empresa(
+    payload: UploadArquivoUrlRequest,
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+) -> UploadPreAssinadoOut:
+    if not payload.content_type.startswith('image/'):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Envie um arquivo de imagem para a logo.')
+    if payload.tamanho > settings.S3_LOGO_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'Logo excede o limite de {settings.S3_LOGO_MAX_BYTES} bytes.',
+        )
+    key = f'{PREFIXO_LOGO}{uuid4().hex}{_sufixo_arquivo(payload.nome_arquivo)}'
+    return _upload_pre_assinado(key, payload.content_type, payload.tamanho)
+
+
+@router.post('/configuracoes/logo-upload-finalizar', response_model=ConfiguracaoSistemaOut)
+def finalizar_upload_logo_empresa(
+    request: Request,
+    payload: UploadLogoFinalizarRequest,
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+) -> ConfiguracaoSistemaOut:
+    _validar_key_upload(payload.key, PREFIXO_LOGO)
+    _verificar_objeto_enviado(payload.key, settings.S3_LOGO_MAX_BYTES, tipo_prefixo='image/')
+    return _atualizar_logo(db, request, montar_uri_s3(payload.key), current_user)
 
 
 @router.get('/programas-certificacao', response_model=list[ProgramaCertificacaoOut])
 def listar_programas_certificacao(
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[ProgramaCertificacaoOut]:
     return list(db.scalars(select(ProgramaCertificacao).order_by(ProgramaCertificacao.id)).all())
 
 
+@router.get('/programas-certificacao/{programa_id}/catalogo', response_model=CatalogoProgramaOut)
+def obter_catalogo_programa(
+    programa_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(get_current_user),
+) -> Response:
+    # Princípios > critérios > indicadores > tipos de evidência do programa, cacheados por catalogo_versao.
+    versao = versao_catalogo(db, programa_id)
+    if versao is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Programa de certificação não encontrado.')
+    etag, corpo = obter_catalogo(db, programa_id, versao)
+    # no-cache: o navegador guarda a resposta, mas revalida sempre com If-None-Match.
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if_none_match = request.headers.get('if-none-match', '')
+    if etag in {valor.strip() for valor in if_none_match.split(',')} or if_none_match.strip() == '*':
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=corpo, media_type='application/json', headers=headers)
+
+
 @router.post('/programas-certificacao', response_model=ProgramaCertificacaoOut, status_code=status.HTTP_201_CREATED)
 def criar_programa_certificacao(
     payload: ProgramaCertificacaoCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN)),
 ) -> ProgramaCertificacaoOut:
     existente_codigo = db.scalar(
         select(ProgramaCertificacao).where(func.lower(ProgramaCertificacao.codigo) == payload.codigo.lower())
@@ -672,7 +963,7 @@ def criar_programa_certificacao(
         entidade_id=programa.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(programa),
+        new_value=serializar_modelo(programa),
         programa_id=programa.id,
     )
     db.commit()
@@ -685,7 +976,7 @@ def atualizar_programa_certificacao(
     programa_id: int,
     payload: ProgramaCertificacaoUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN)),
 ) -> ProgramaCertificacaoOut:
     programa = _buscar_programa(db, programa_id)
     data = payload.model_dump(exclude_unset=True)
@@ -708,7 +999,7 @@ def atualizar_programa_certificacao(
         if existe:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Já existe programa com este nome.')
 
-    old_value = _dump_model(programa)
+    old_value = serializar_modelo(programa)
     for field, value in data.items():
         setattr(programa, field, value)
     registrar_log(
@@ -718,7 +1009,7 @@ def atualizar_programa_certificacao(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(programa),
+        new_value=serializar_modelo(programa),
         programa_id=programa.id,
     )
     db.commit()
@@ -730,7 +1021,7 @@ def atualizar_programa_certificacao(
 def remover_programa_certificacao(
     programa_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN)),
 ) -> MensagemOut:
     programa = _buscar_programa(db, programa_id)
     uso = db.scalar(
@@ -741,7 +1032,7 @@ def remover_programa_certificacao(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Não é possível excluir programa com auditorias vinculadas.',
         )
-    old_value = _dump_model(programa)
+    old_value = serializar_modelo(programa)
     db.delete(programa)
     registrar_log(
         db,
@@ -759,12 +1050,14 @@ def remover_programa_certificacao(
 @router.get('/principios', response_model=list[PrincipioOut])
 def listar_principios(
     programa_id: int | None = Query(default=None),
+    q: str | None = Query(default=None, description='Busca textual por código/título/descrição, ordenada por relevância'),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[PrincipioOut]:
     query = select(Principio).order_by(Principio.id)
     if programa_id:
         query = query.where(Principio.programa_id == programa_id)
+    query = filtrar_por_busca(query, Principio, q)
     return list(db.scalars(query).all())
 
 
@@ -772,7 +1065,7 @@ def listar_principios(
 def criar_principio(
     payload: PrincipioCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> PrincipioOut:
     _buscar_programa(db, payload.programa_id)
     principio = Principio(**payload.model_dump())
@@ -784,7 +1077,7 @@ def criar_principio(
         entidade_id=principio.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(principio),
+        new_value=serializar_modelo(principio),
         programa_id=principio.programa_id,
     )
     db.commit()
@@ -796,7 +1089,7 @@ def criar_principio(
 def obter_principio(
     principio_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> PrincipioOut:
     return _buscar_principio(db, principio_id)
 
@@ -806,14 +1099,14 @@ def atualizar_principio(
     principio_id: int,
     payload: PrincipioUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> PrincipioOut:
     principio = _buscar_principio(db, principio_id)
     data = payload.model_dump(exclude_unset=True)
     if 'programa_id' in data and data['programa_id'] is not None:
         _buscar_programa(db, data['programa_id'])
 
-    old_value = _dump_model(principio)
+    old_value = serializar_modelo(principio)
     for field, value in data.items():
         setattr(principio, field, value)
 
@@ -824,7 +1117,7 @@ def atualizar_principio(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(principio),
+        new_value=serializar_modelo(principio),
         programa_id=principio.programa_id,
     )
     db.commit()
@@ -836,10 +1129,10 @@ def atualizar_principio(
 def remover_principio(
     principio_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> MensagemOut:
     principio = _buscar_principio(db, principio_id)
-    old_value = _dump_model(principio)
+    old_value = serializar_modelo(principio)
     db.delete(principio)
     registrar_log(
         db,
@@ -858,14 +1151,16 @@ def remover_principio(
 def listar_criterios(
     programa_id: int | None = Query(default=None),
     principio_id: int | None = Query(default=None),
+    q: str | None = Query(default=None, description='Busca textual por código/título/descrição, ordenada por relevância'),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[CriterioOut]:
     query = select(Criterio).order_by(Criterio.id)
     if programa_id:
         query = query.where(Criterio.programa_id == programa_id)
     if principio_id:
         query = query.where(Criterio.principio_id == principio_id)
+    query = filtrar_por_busca(query, Criterio, q)
     return list(db.scalars(query).all())
 
 
@@ -873,7 +1168,7 @@ def listar_criterios(
 def criar_criterio(
     payload: CriterioCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> CriterioOut:
     _buscar_programa(db, payload.programa_id)
     principio = _buscar_principio(db, payload.principio_id)
@@ -887,7 +1182,7 @@ def criar_criterio(
         entidade_id=criterio.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(criterio),
+        new_value=serializar_modelo(criterio),
         programa_id=criterio.programa_id,
     )
     db.commit()
@@ -899,7 +1194,7 @@ def criar_criterio(
 def obter_criterio(
     criterio_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> CriterioOut:
     return _buscar_criterio(db, criterio_id)
 
@@ -909,7 +1204,7 @@ def atualizar_criterio(
     criterio_id: int,
     payload: CriterioUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> CriterioOut:
     criterio = _buscar_criterio(db, criterio_id)
     data = payload.model_dump(exclude_unset=True)
@@ -918,9 +1213,15 @@ def atualizar_criterio(
     principio_id = data.get('principio_id', criterio.principio_id)
     principio = _buscar_principio(db, principio_id)
     _validar_mesmo_programa(programa_id, principio.programa_id, 'atualização de critério')
-    old_value = _dump_model(criterio)
+    old_value = serializar_modelo(criterio)
+    programa_anterior_id = criterio.programa_id
+    principio_anterior_id = criterio.principio_id
     for field, value in data.items():
         setattr(criterio, field, value)
+    if criterio.principio_id != principio_anterior_id:
+        db.flush()
+        for programa_afetado_id in {programa_anterior_id, criterio.programa_id}:
+            reconstruir_contadores(db, programa_id=programa_afetado_id)
     registrar_log(
         db,
         entidade='criterio',
@@ -928,7 +1229,7 @@ def atualizar_criterio(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(criterio),
+        new_value=serializar_modelo(criterio),
         programa_id=criterio.programa_id,
     )
     db.commit()
@@ -940,11 +1241,13 @@ def atualizar_criterio(
 def remover_criterio(
     criterio_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> MensagemOut:
     criterio = _buscar_criterio(db, criterio_id)
-    old_value = _dump_model(criterio)
+    old_value = serializar_modelo(criterio)
     db.delete(criterio)
+    db.flush()
+    reconstruir_contadores(db, programa_id=criterio.programa_id)
     registrar_log(
         db,
         entidade='criterio',
@@ -961,32 +1264,36 @@ def remover_criterio(
 def listar_indicadores(
     programa_id: int | None = Query(default=None),
     criterio_id: int | None = Query(default=None),
-    q: str | None = Query(default=None, description='Busca por código/título/descrição'),
+    q: str | None = Query(default=None, description='Busca textual por código/título/descrição, ordenada por relevância'),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[IndicadorOut]:
     query = select(Indicador).order_by(Indicador.id)
     if programa_id:
         query = query.where(Indicador.programa_id == programa_id)
     if criterio_id:
         query = query.where(Indicador.criterio_id == criterio_id)
-    if q and q.strip():
-        termo = f"%{q.strip()}%"
-        query = query.where(
-            or_(
-                Indicador.codigo.ilike(termo),
-                Indicador.titulo.ilike(termo),
-                Indicador.descricao.ilike(termo),
-            )
-        )
+    query = filtrar_por_busca(query, Indicador, q)
     return list(db.scalars(query).all())
 
 
+@router.get('/catalogo/busca', response_model=list[ResultadoBuscaCatalogoOut])
+def buscar_catalogo(
+    q: str = Query(min_length=1, description='Termos da busca; cada palavra casa por prefixo'),
+    programa_id: int | None = Query(default=None),
+    limite: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(get_current_user),
+) -> list[ResultadoBuscaCatalogoOut]:
+    # Princípios, critérios e indicadores numa só lista, com o caminho até o princípio de cada resultado.
+    return [ResultadoBuscaCatalogoOut(**item) for item in buscar_no_catalogo(db, q, programa_id, limite)]
+
+
 @router.post('/indicadores', response_model=IndicadorOut, status_code=status.HTTP_201_CREATED)
 def criar_indicador(
     payload: IndicadorCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> IndicadorOut:
     _buscar_programa(db, payload.programa_id)
     criterio = _buscar_criterio(db, payload.criterio_id)
@@ -1000,7 +1307,7 @@ def criar_indicador(
         entidade_id=indicador.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(indicador),
+        new_value=serializar_modelo(indicador),
         programa_id=indicador.programa_id,
     )
     db.commit()
@@ -1012,7 +1319,7 @@ def criar_indicador(
 def obter_indicador(
     indicador_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> IndicadorOut:
     return _buscar_indicador(db, indicador_id)
 
@@ -1022,7 +1329,7 @@ def atualizar_indicador(
     indicador_id: int,
     payload: IndicadorUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> IndicadorOut:
     indicador = _buscar_indicador(db, indicador_id)
     data = payload.model_dump(exclude_unset=True)
@@ -1031,9 +1338,15 @@ def atualizar_indicador(
     criterio_id = data.get('criterio_id', indicador.criterio_id)
     criterio = _buscar_criterio(db, criterio_id)
     _validar_mesmo_programa(programa_id, criterio.programa_id, 'atualização de indicador')
-    old_value = _dump_model(indicador)
+    old_value = serializar_modelo(indicador)
+    programa_anterior_id = indicador.programa_id
+    criterio_anterior_id = indicador.criterio_id
     for field, value in data.items():
         setattr(indicador, field, value)
+    if indicador.criterio_id != criterio_anterior_id:
+        db.flush()
+        for programa_afetado_id in {programa_anterior_id, indicador.programa_id}:
+            reconstruir_contadores(db, programa_id=programa_afetado_id)
     registrar_log(
         db,
         entidade='indicador',
@@ -1041,7 +1354,7 @@ def atualizar_indicador(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(indicador),
+        new_value=serializar_modelo(indicador),
         programa_id=indicador.programa_id,
     )
     db.commit()
@@ -1053,11 +1366,13 @@ def atualizar_indicador(
 def remover_indicador(
     indicador_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> MensagemOut:
     indicador = _buscar_indicador(db, indicador_id)
-    old_value = _dump_model(indicador)
+    old_value = serializar_modelo(indicador)
     db.delete(indicador)
+    db.flush()
+    reconstruir_contadores(db, programa_id=indicador.programa_id)
     registrar_log(
         db,
         entidade='indicador',
@@ -1075,7 +1390,7 @@ def remover_indicador(
 def listar_auditorias(
     programa_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[AuditoriaOut]:
     query = select(AuditoriaAno).order_by(AuditoriaAno.year.desc())
     if programa_id:
@@ -1087,7 +1402,7 @@ def listar_auditorias(
 def criar_auditoria(
     payload: AuditoriaCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> AuditoriaOut:
     _buscar_programa(db, payload.programa_id)
     _validar_datas_auditoria(payload.data_inicio, payload.data_fim)
@@ -1109,7 +1424,7 @@ def criar_auditoria(
         entidade_id=auditoria.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(auditoria),
+        new_value=serializar_modelo(auditoria),
         programa_id=auditoria.programa_id,
         auditoria_ano_id=auditoria.id,
     )
@@ -1122,23 +1437,137 @@ def criar_auditoria(
 def obter_auditoria(
     auditoria_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> AuditoriaOut:
     return _buscar_auditoria(db, auditoria_id)
 
 
+def _ordem_grade(grade, ordenar_por: OrdenacaoGradeEnum, decrescente: bool) -> list[ChaveOrdenacao]:
+    colunas = {
+        OrdenacaoGradeEnum.indicador: [grade.c.indicador_codigo],
+        OrdenacaoGradeEnum.criterio: [grade.c.criterio_codigo, grade.c.indicador_codigo],
+        OrdenacaoGradeEnum.status: [grade.c.status_conformidade],
+        OrdenacaoGradeEnum.evidencias: [grade.c.evidencias],
+        OrdenacaoGradeEnum.pendencias: [grade.c.evidencias_nao_conformes],
+        OrdenacaoGradeEnum.demandas: [grade.c.demandas_ativas],
+        OrdenacaoGradeEnum.atualizacao: [grade.c.updated_at],
+    }[ordenar_por]
+    # Códigos são opcionais: nulos sempre no fim. O id desempata e mantém o cursor estável.
+    opcionais = {'indicador_codigo', 'criterio_codigo'}
+    return [
+        *(ChaveOrdenacao(coluna, decrescente=decrescente, nulos_no_fim=coluna.key in opcionais) for coluna in colunas),
+        ChaveOrdenacao(grade.c.id, decrescente=decrescente),
+    ]
+
+
+@router.get('/auditorias/{auditoria_id}/grade-avaliacoes', response_model=list[GradeAvaliacaoItem])
+def listar_grade_avaliacoes(
+    auditoria_id: int,
+    response: Response,
+    status_conformidade: StatusConformidadeEnum | None = Query(default=None),
+    principio_id: int | None = Query(default=None),
+    criterio_id: int | None = Query(default=None),
+    situacao_evidencia: SituacaoEvidenciaEnum | None = Query(default=None),
+    q: str | None = Query(default=None, description='Busca textual no indicador ou no critério'),
+    ordenar_por: OrdenacaoGradeEnum = Query(default=OrdenacaoGradeEnum.indicador),
+    decrescente: bool = Query(default=False),
+    paginacao: Paginacao = Depends(parametros_paginacao),
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(get_current_user),
+) -> list[GradeAvaliacaoItem]:
+    # Uma linha por avaliação com os códigos/títulos do catálogo e as contagens já agregadas no banco,
+    # no lugar de avaliações + todas as evidências da auditoria.
+    _buscar_auditoria(db, auditoria_id)
+    evidencias = (
+        select(
+            Evidencia.avaliacao_id,
+            func.count().label('total'),
+            func.count().filter(Evidencia.nao_conforme.is_(True)).label('nao_conformes'),
+        )
+        .join(AvaliacaoIndicador, AvaliacaoIndicador.id == Evidencia.avaliacao_id)
+        .where(AvaliacaoIndicador.auditoria_ano_id == auditoria_id)
+        .group_by(Evidencia.avaliacao_id)
+        .subquery()
+    )
+    demandas = (
+        select(Demanda.avaliacao_id, func.count().label('ativas'))
+        .join(AvaliacaoIndicador, AvaliacaoIndicador.id == Demanda.avaliacao_id)
+        .where(
+            AvaliacaoIndicador.auditoria_ano_id == auditoria_id,
+            Demanda.status_andamento.in_(STATUS_DEMANDA_ATIVA),
+        )
+        .group_by(Demanda.avaliacao_id)
+        .subquery()
+    )
+    total_evidencias = func.coalesce(evidencias.c.total, 0)
+    nao_conformes = func.coalesce(evidencias.c.nao_conformes, 0)
+    query = (
+        select(
+            AvaliacaoIndicador.id,
+            AvaliacaoIndicador.indicator_id,
+            AvaliacaoIndicador.status_conformidade,
+            AvaliacaoIndicador.observacoes,
+            AvaliacaoIndicador.updated_at,
+            Indicador.codigo.label('indicador_codigo'),
+            Indicador.titulo.label('indicador_titulo'),
+            Criterio.id.label('criterio_id'),
+            Criterio.codigo.label('criterio_codigo'),
+            Criterio.titulo.label('criterio_titulo'),
+            Principio.id.label('principio_id'),
+            Principio.codigo.label('principio_codigo'),
+            Principio.titulo.label('principio_titulo'),
+            total_evidencias.label('evidencias'),
+            nao_conformes.label('evidencias_nao_conformes'),
+            func.coalesce(demandas.c.ativas, 0).label('demandas_ativas'),
+        )
+        .join(Indicador, Indicador.id == AvaliacaoIndicador.indicator_id)
+        .join(Criterio, Criterio.id == Indicador.criterio_id)
+        .join(Principio, Principio.id == Criterio.principio_id)
+        .outerjoin(evidencias, evidencias.c.avaliacao_id == AvaliacaoIndicador.id)
+        .outerjoin(demandas, demandas.c.avaliacao_id == AvaliacaoIndicador.id)
+        .where(AvaliacaoIndicador.auditoria_ano_id == auditoria_id)
+    )
+    if status_conformidade:
+        query = query.where(AvaliacaoIndicador.status_conformidade == status_conformidade)
+    if principio_id:
+        query = query.where(Criterio.principio_id == principio_id)
+    if criterio_id:
+        query = query.where(Indicador.criterio_id == criterio_id)
+    if situacao_evidencia == SituacaoEvidenciaEnum.sem_evidencia:
+        query = query.where(total_evidencias == 0)
+    elif situacao_evidencia == SituacaoEvidenciaEnum.com_pendencia:
+        query = query.where(nao_conformes > 0)
+    elif situacao_evidencia == SituacaoEvidenciaEnum.sem_pendencia:
+        query = query.where(total_evidencias > 0, nao_conformes == 0)
+    consulta = consulta_busca(q)
+    if consulta is not None:
+        query = query.where(or_(Indicador.busca.op('@@')(consulta), Criterio.busca.op('@@')(consulta)))
+
+    grade = query.subquery('grade')
+    linhas = paginar(db, select(grade), _ordem_grade(grade, ordenar_por, decrescente), paginacao, response, escalares=False)
+    return [GradeAvaliacaoItem.model_validate(linha._mapping) for linha in linhas]
+
+
 @router.put('/auditorias/{auditoria_id}', response_model=AuditoriaOut)
-def atualizar_auditoria(
+async def atualizar_auditoria(
     auditoria_id: int,
     payload: AuditoriaUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> AuditoriaOut:
-    auditoria = _buscar_auditoria(db, auditoria_id)
+    auditoria = await run_in_threadpool(_buscar_auditoria, db, auditoria_id)
     data = payload.model_dump(exclude_unset=True)
     senha_sistema = data.pop('senha_sistema', None)
-    _validar_senha_sistema(senha_sistema, current_user)
+    await _validar_senha_sistema(db, senha_sistema, current_user)
+    return await run_in_threadpool(_aplicar_atualizacao_auditoria, db, auditoria, data, current_user)
 
+
+def _aplicar_atualizacao_auditoria(
+    db: Session,
+    auditoria: AuditoriaAno,
+    data: dict[str, Any],
+    current_user: UsuarioAutenticado,
+) -> AuditoriaAno:
     data_inicio = data.get('data_inicio', auditoria.data_inicio)
     data_fim = data.get('data_fim', auditoria.data_fim)
     _validar_datas_auditoria(data_inicio, data_fim)
@@ -1158,7 +1587,7 @@ def atualizar_auditoria(
         if existente:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Já existe auditoria deste programa para este ano.')
 
-    old_value = _dump_model(auditoria)
+    old_value = serializar_modelo(auditoria)
     for field, value in data.items():
         setattr(auditoria, field, value)
     registrar_log(
@@ -1168,7 +1597,7 @@ def atualizar_auditoria(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(auditoria),
+        new_value=serializar_modelo(auditoria),
         programa_id=auditoria.programa_id,
         auditoria_ano_id=auditoria.id,
     )
@@ -1177,87 +1606,74 @@ def atualizar_auditoria(
     return auditoria
 
 
-@router.delete('/auditorias/{auditoria_id}', response_model=MensagemOut)
-def remover_auditoria(
+def _resposta_job(db: Session, tipo: str, parametros: dict[str, Any], created_by: int) -> JSONResponse:
+    # 202 + Location: o cliente acompanha em GET /api/jobs/{id} enquanto o worker executa.
+    job: Job = enfileirar_job(db, tipo, {**parametros, 'created_by': created_by}, created_by)
+    db.commit()
+    db.refresh(job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobOut.model_validate(job).model_dump(mode='json'),
+        headers={'Location': f'/api/jobs/{job.id}'},
+    )
+
+
+@router.delete('/auditorias/{auditoria_id}', response_model=MensagemOut, responses={202: {'model': JobOut}})
+async def remover_auditoria(
     auditoria_id: int,
     payload: ConfirmacaoSenhaRequest,
+    assincrono: bool = Query(default=False),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
-) -> MensagemOut:
-    _validar_senha_sistema(payload.senha_sistema, current_user)
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+) -> MensagemOut | JSONResponse:
+    await _validar_senha_sistema(db, payload.senha_sistema, current_user)
+    return await run_in_threadpool(_remover_auditoria, db, auditoria_id, assincrono, current_user)
+
+
+def _remover_auditoria(
+    db: Session,
+    auditoria_id: int,
+    assincrono: bool,
+    current_user: UsuarioAutenticado,
+) -> MensagemOut | JSONResponse:
     auditoria = _buscar_auditoria(db, auditoria_id)
-    old_value = _dump_model(auditoria)
-    db.delete(auditoria)
-    registrar_log(
-        db,
-        entidade='auditoria',
-        entidade_id=auditoria_id,
-        acao=AcaoAuditEnum.DELETE,
-        created_by=current_user.id,
-        old_value=old_value,
-        programa_id=auditoria.programa_id,
-        auditoria_ano_id=auditoria_id,
-    )
+    if assincrono:
+        return _resposta_job(db, TAREFA_REMOVER_AUDITORIA, {'auditoria_id': auditoria_id}, current_user.id)
+    resultado = excluir_auditoria(db, auditoria, current_user.id)
     db.commit()
-    return MensagemOut(mensagem='Auditoria removida com sucesso.')
+    return resultado
 
 
-@router.post('/auditorias/{auditoria_id}/gerar-avaliacoes', response_model=MensagemOut)
+@router.post(
+    '/auditorias/{auditoria_id}/gerar-avaliacoes',
+    response_model=GeracaoAvaliacoesOut,
+    responses={202: {'model': JobOut}},
+)
 def gerar_avaliacoes_para_auditoria(
     auditoria_id: int,
+    assincrono: bool = Query(default=False),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
-) -> MensagemOut:
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+) -> GeracaoAvaliacoesOut | JSONResponse:
     auditoria = _buscar_auditoria(db, auditoria_id)
-    indicadores = list(
-        db.scalars(select(Indicador).where(Indicador.programa_id == auditoria.programa_id)).all()
-    )
-    criadas = 0
-    for indicador in indicadores:
-        existente = db.scalar(
-            select(AvaliacaoIndicador).where(
-                AvaliacaoIndicador.indicator_id == indicador.id,
-                AvaliacaoIndicador.auditoria_ano_id == auditoria.id,
-            )
-        )
-        if existente:
-            continue
-        avaliacao = AvaliacaoIndicador(
-            programa_id=auditoria.programa_id,
-            indicator_id=indicador.id,
-            auditoria_ano_id=auditoria.id,
-            status_conformidade=StatusConformidadeEnum.conforme,
-            observacoes=None,
-            assessed_at=datetime.now(UTC),
-        )
-        db.add(avaliacao)
-        db.flush()
-        registrar_log(
-            db,
-            entidade='avaliacao',
-            entidade_id=avaliacao.id,
-            acao=AcaoAuditEnum.CREATE,
-            created_by=current_user.id,
-            new_value=_dump_model(avaliacao),
-            programa_id=auditoria.programa_id,
-            auditoria_ano_id=auditoria.id,
-        )
-        criadas += 1
+    if assincrono:
+        return _resposta_job(db, TAREFA_GERAR_AVALIACOES, {'auditoria_id': auditoria_id}, current_user.id)
+    resultado = gerar_avaliacoes(db, auditoria, current_user.id)
     db.commit()
-    return MensagemOut(
-        mensagem=f'Avaliações geradas para Auditoria {auditoria.year}. Total de novas avaliações: {criadas}.'
-    )
+    return resultado
 
 @router.get('/avaliacoes', response_model=list[AvaliacaoOut])
 def listar_avaliacoes(
+    response: Response,
     programa_id: int | None = Query(default=None),
     auditoria_id: int | None = Query(default=None, alias='auditoria_id'),
     indicator_id: int | None = Query(default=None),
     status_conformidade: StatusConformidadeEnum | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[AvaliacaoOut]:
-    query = select(AvaliacaoIndicador).order_by(AvaliacaoIndicador.id)
+    query = select(AvaliacaoIndicador)
     if programa_id:
         query = query.where(AvaliacaoIndicador.programa_id == programa_id)
     if auditoria_id:
@@ -1266,14 +1682,14 @@ def listar_avaliacoes(
         query = query.where(AvaliacaoIndicador.indicator_id == indicator_id)
     if status_conformidade:
         query = query.where(AvaliacaoIndicador.status_conformidade == status_conformidade)
-    return list(db.scalars(query).all())
+    return paginar(db, query, ORDEM_AVALIACOES, paginacao, response)
 
 
 @router.post('/avaliacoes', response_model=AvaliacaoOut, status_code=status.HTTP_201_CREATED)
 def criar_avaliacao(
     payload: AvaliacaoCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> AvaliacaoOut:
     indicador = _buscar_indicador(db, payload.indicator_id)
     auditoria = _buscar_auditoria(db, payload.auditoria_ano_id)
@@ -1299,13 +1715,14 @@ def criar_avaliacao(
     )
     db.add(avaliacao)
     db.flush()
+    ajustar_contadores(db, [avaliacao.id], 1)
     registrar_log(
         db,
         entidade='avaliacao',
         entidade_id=avaliacao.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(avaliacao),
+        new_value=serializar_modelo(avaliacao),
         programa_id=auditoria.programa_id,
         auditoria_ano_id=auditoria.id,
     )
@@ -1318,7 +1735,7 @@ def criar_avaliacao(
 def obter_avaliacao(
     avaliacao_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> AvaliacaoOut:
     return _buscar_avaliacao(db, avaliacao_id)
 
@@ -1328,7 +1745,7 @@ def atualizar_avaliacao(
     avaliacao_id: int,
     payload: AvaliacaoUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> AvaliacaoOut:
     avaliacao = _buscar_avaliacao(db, avaliacao_id)
     data = payload.model_dump(exclude_unset=True)
@@ -1357,11 +1774,14 @@ def atualizar_avaliacao(
                 detail='Já existe avaliação deste indicador para esta Auditoria.',
             )
 
-    old_value = _dump_model(avaliacao)
+    old_value = serializar_modelo(avaliacao)
     status_anterior = avaliacao.status_conformidade
+    ajustar_contadores(db, [avaliacao.id], -1)
     avaliacao.programa_id = auditoria.programa_id
     for field, value in data.items():
         setattr(avaliacao, field, value)
+    db.flush()
+    ajustar_contadores(db, [avaliacao.id], 1)
 
     acao = AcaoAuditEnum.STATUS_CHANGE if status_anterior != avaliacao.status_conformidade else AcaoAuditEnum.UPDATE
     registrar_log(
@@ -1371,7 +1791,7 @@ def atualizar_avaliacao(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(avaliacao),
+        new_value=serializar_modelo(avaliacao),
         programa_id=auditoria.programa_id,
         auditoria_ano_id=auditoria_ano_id,
     )
@@ -1385,7 +1805,7 @@ def patch_avaliacao(
     avaliacao_id: int,
     payload: AvaliacaoPatch,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> AvaliacaoOut:
     avaliacao = _buscar_avaliacao(db, avaliacao_id)
     data = payload.model_dump(exclude_unset=True)
@@ -1396,10 +1816,13 @@ def patch_avaliacao(
     observacoes = data.get('observacoes', avaliacao.observacoes)
     _validar_regras_avaliacao(db, status_conformidade, observacoes, avaliacao.id)
 
-    old_value = _dump_model(avaliacao)
+    old_value = serializar_modelo(avaliacao)
     status_anterior = avaliacao.status_conformidade
+    ajustar_contadores(db, [avaliacao.id], -1)
     for field, value in data.items():
         setattr(avaliacao, field, value)
+    db.flush()
+    ajustar_contadores(db, [avaliacao.id], 1)
     acao = AcaoAuditEnum.STATUS_CHANGE if status_anterior != avaliacao.status_conformidade else AcaoAuditEnum.UPDATE
     registrar_log(
         db,
@@ -1408,7 +1831,7 @@ def patch_avaliacao(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(avaliacao),
+        new_value=serializar_modelo(avaliacao),
         programa_id=avaliacao.programa_id,
         auditoria_ano_id=avaliacao.auditoria_ano_id,
     )
@@ -1421,11 +1844,12 @@ def patch_avaliacao(
 def remover_avaliacao(
     avaliacao_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MensagemOut:
     avaliacao = _buscar_avaliacao(db, avaliacao_id)
-    old_value = _dump_model(avaliacao)
+    old_value = serializar_modelo(avaliacao)
     auditoria_id = avaliacao.auditoria_ano_id
+    ajustar_contadores(db, [avaliacao_id], -1)
     db.delete(avaliacao)
     registrar_log(
         db,
@@ -1441,34 +1865,99 @@ def remover_avaliacao(
     return MensagemOut(mensagem='Avaliação removida com sucesso.')
 
 
-@router.get('/avaliacoes/{avaliacao_id}/detalhe', response_model=AvaliacaoDetalheOut)
-def detalhar_avaliacao(
-    avaliacao_id: int,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
-) -> AvaliacaoDetalheOut:
+FILHOS_COM_AVALIACAO_ID = ('evidencia', 'demanda', 'analise_nc')
+
+
+def _logs_removidos(avaliacao: AvaliacaoIndicador, entidades: tuple[str, ...], evidencia_ids: list[int]) -> list:
+    # Filhos já excluídos não estão mais nas listas de ids: o DELETE é achado pelo old_value (estado completo),
+    # restrito aos DELETEs da auditoria pelo índice (auditoria_ano_id, programa_id, created_at).
+    def remocoes(log) -> tuple:
+        return (log.auditoria_ano_id == avaliacao.auditoria_ano_id, log.acao == AcaoAuditEnum.DELETE)
+
+    def da_avaliacao(log):
+        return log.old_value['avaliacao_id'].as_string() == str(avaliacao.id)
+
+    condicoes = []
+    com_avaliacao = [entidade for entidade in entidades if entidade in FILHOS_COM_AVALIACAO_ID]
+    if com_avaliacao:
+        condicoes.append(and_(*remocoes(AuditLog), AuditLog.entidade.in_(com_avaliacao), da_avaliacao(AuditLog)))
+    if 'documento_evidencia' in entidades:
+        # Documentos guardam só evidencia_id: valem as evidências atuais e as já excluídas desta avaliação.
+        log_evidencia = aliased(AuditLog)
+        evidencias_removidas = select(cast(log_evidencia.entidade_id, String)).where(
+            *remocoes(log_evidencia), log_evidencia.entidade == 'evidencia', da_avaliacao(log_evidencia)
+        )
+        evidencias_atuais = [str(evidencia_id) for evidencia_id in evidencia_ids]
+        evidencia_do_documento = AuditLog.old_value['evidencia_id'].as_string()
+        condicoes.append(
+            and_(
+                *remocoes(AuditLog),
+                AuditLog.entidade == 'documento_evidencia',
+                or_(evidencia_do_documento.in_(evidencias_atuais), evidencia_do_documento.in_(evidencias_removidas)),
+            )
+        )
+    return condicoes
+
+
+def _logs_avaliacao(
+    db: Session,
+    avaliacao: AvaliacaoIndicador,
+    filhos: dict[str, Any],
+    removidos: tuple[str, ...] = (*FILHOS_COM_AVALIACAO_ID, 'documento_evidencia'),
+) -> list[AuditLog]:
+    # Um par (entidade, ids) por entidade: cada ramo do OR usa o índice (entidade, entidade_id, created_at),
+    # sem percorrer o histórico inteiro da auditoria.
+    condicoes = [and_(AuditLog.entidade == 'avaliacao', AuditLog.entidade_id == avaliacao.id)]
+    for entidade, ids in filhos.items():
+        if isinstance(ids, list) and not ids:
+            continue
+        condicoes.append(and_(AuditLog.entidade == entidade, AuditLog.entidade_id.in_(ids)))
+    condicoes.extend(_logs_removidos(avaliacao, removidos, filhos.get('evidencia', [])))
+    return list(
+        db.scalars(
+            select(AuditLog).where(or_(*condicoes)).order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(30)
+        ).all()
+    )
+
+
+def _buscar_avaliacao_detalhe(db: Session, avaliacao_id: int, *colecoes) -> AvaliacaoIndicador:
+    # Relações muitos-para-um no mesmo SELECT; cada coleção em um SELECT ... IN próprio, sem produto cartesiano.
     avaliacao = db.scalar(
         select(AvaliacaoIndicador)
         .where(AvaliacaoIndicador.id == avaliacao_id)
         .options(
             joinedload(AvaliacaoIndicador.indicador).joinedload(Indicador.criterio).joinedload(Criterio.principio),
-            joinedload(AvaliacaoIndicador.evidencias),
-            joinedload(AvaliacaoIndicador.demandas),
+            *colecoes,
         )
     )
     if not avaliacao:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Avaliação não encontrada.')
+    return avaliacao
 
-    logs = list(
-        db.scalars(
-            select(AuditLog)
-            .where(
-                AuditLog.auditoria_ano_id == avaliacao.auditoria_ano_id,
-                AuditLog.programa_id == avaliacao.programa_id,
-            )
-            .order_by(AuditLog.created_at.desc())
-            .limit(30)
-        ).all()
+
+@router.get('/avaliacoes/{avaliacao_id}/detalhe', response_model=AvaliacaoDetalheOut, dependencies=[orcamento_sql(5)])
+def detalhar_avaliacao(
+    avaliacao_id: int,
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(get_current_user),
+) -> AvaliacaoDetalheOut:
+    avaliacao = _buscar_avaliacao_detalhe(
+        db,
+        avaliacao_id,
+        selectinload(AvaliacaoIndicador.evidencias),
+        selectinload(AvaliacaoIndicador.demandas),
+    )
+    logs = _logs_avaliacao(
+        db,
+        avaliacao,
+        {
+            'evidencia': [evidencia.id for evidencia in avaliacao.evidencias],
+            'demanda': [demanda.id for demanda in avaliacao.demandas],
+            'documento_evidencia': select(DocumentoEvidencia.id)
+            .join(Evidencia, Evidencia.id == DocumentoEvidencia.evidencia_id)
+            .where(Evidencia.avaliacao_id == avaliacao.id),
+            'analise_nc': select(AnaliseNaoConformidade.id).where(AnaliseNaoConformidade.avaliacao_id == avaliacao.id),
+        },
     )
     indicador = avaliacao.indicador
     criterio = indicador.criterio
@@ -1483,13 +1972,90 @@ def detalhar_avaliacao(
         logs=logs,
     )
 
+
+@router.get(
+    '/avaliacoes/{avaliacao_id}/detalhe-completo',
+    response_model=AvaliacaoDetalheCompletoOut,
+    dependencies=[orcamento_sql(10)],
+)
+def detalhar_avaliacao_completa(
+    avaliacao_id: int,
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
+) -> AvaliacaoDetalheCompletoOut:
+    avaliacao = _buscar_avaliacao_detalhe(
+        db,
+        avaliacao_id,
+        selectinload(AvaliacaoIndicador.evidencias).selectinload(Evidencia.documentos),
+        selectinload(AvaliacaoIndicador.demandas),
+        selectinload(AvaliacaoIndicador.analises_nc),
+    )
+    indicador = avaliacao.indicador
+    criterio = indicador.criterio
+    documentos = [documento for evidencia in avaliacao.evidencias for documento in evidencia.documentos]
+    analises = list(avaliacao.analises_nc)
+    removidos = (*FILHOS_COM_AVALIACAO_ID, 'documento_evidencia')
+    # Mesmas restrições de /documentos-evidencia e /analises-nc para o RESPONSAVEL, aplicadas antes dos logs
+    # para que o histórico não exponha old_value/new_value do que a resposta esconde.
+    if current_user.role == RoleEnum.RESPONSAVEL:
+        removidos = ('evidencia', 'demanda')
+        documentos = [
+            documento
+            for documento in documentos
+            if current_user.id in (documento.responsavel_id, documento.created_by)
+        ]
+        demandas_proprias = {demanda.id for demanda in avaliacao.demandas if demanda.responsavel_id == current_user.id}
+        analises = [
+            analise
+            for analise in analises
+            if analise.responsavel_id == current_user.id or analise.demanda_id in demandas_proprias
+        ]
+    logs = _logs_avaliacao(
+        db,
+        avaliacao,
+        {
+            'evidencia': [evidencia.id for evidencia in avaliacao.evidencias],
+            'demanda': [demanda.id for demanda in avaliacao.demandas],
+            'documento_evidencia': [documento.id for documento in documentos],
+            'analise_nc': [analise.id for analise in analises],
+        },
+        removidos,
+    )
+
+    tipos = db.scalars(
+        select(EvidenceType)
+        .where(
+            EvidenceType.programa_id == avaliacao.programa_id,
+            EvidenceType.criterio_id == criterio.id,
+            EvidenceType.indicador_id == indicador.id,
+        )
+        .order_by(EvidenceType.nome)
+    ).all()
+    responsaveis = []
+    if current_user.role in (RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR):
+        responsaveis = db.scalars(select(User).where(User.role == RoleEnum.RESPONSAVEL).order_by(User.nome)).all()
+
+    return AvaliacaoDetalheCompletoOut(
+        avaliacao=avaliacao,
+        indicador=indicador,
+        criterio=criterio,
+        principio=criterio.principio,
+        evidencias=avaliacao.evidencias,
+        demandas=avaliacao.demandas,
+        logs=logs,
+        tipos_evidencia=tipos,
+        responsaveis=responsaveis,
+        documentos=sorted(documentos, key=lambda documento: documento.id),
+        analises_nc=sorted(analises, key=lambda analise: analise.id),
+    )
+
 @router.get('/tipos-evidencia', response_model=list[EvidenceTypeOut])
 def listar_tipos_evidencia(
     programa_id: int | None = Query(default=None),
     criterio_id: int | None = Query(default=None),
     indicator_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[EvidenceTypeOut]:
     query = select(EvidenceType).where(
         EvidenceType.programa_id.is_not(None),
@@ -1509,7 +2075,7 @@ def listar_tipos_evidencia(
 def criar_tipo_evidencia(
     payload: EvidenceTypeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> EvidenceTypeOut:
     _validar_vinculo_tipo_evidencia(db, payload.programa_id, payload.criterio_id, payload.indicador_id)
     existente = db.scalar(
@@ -1535,7 +2101,7 @@ def criar_tipo_evidencia(
         entidade_id=tipo.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(tipo),
+        new_value=serializar_modelo(tipo),
         programa_id=tipo.programa_id,
     )
     db.commit()
@@ -1547,7 +2113,7 @@ def criar_tipo_evidencia(
 def obter_tipo_evidencia(
     tipo_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> EvidenceTypeOut:
     return _buscar_tipo_evidencia(db, tipo_id)
 
@@ -1557,7 +2123,7 @@ def atualizar_tipo_evidencia(
     tipo_id: int,
     payload: EvidenceTypeUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> EvidenceTypeOut:
     tipo = _buscar_tipo_evidencia(db, tipo_id)
     data = payload.model_dump(exclude_unset=True)
@@ -1589,7 +2155,7 @@ def atualizar_tipo_evidencia(
                 detail='Já existe tipo de evidência com este nome para este indicador.',
             )
 
-    old_value = _dump_model(tipo)
+    old_value = serializar_modelo(tipo)
     for field, value in data.items():
         setattr(tipo, field, value)
     registrar_log(
@@ -1599,7 +2165,7 @@ def atualizar_tipo_evidencia(
         acao=AcaoAuditEnum.UPDATE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(tipo),
+        new_value=serializar_modelo(tipo),
         programa_id=tipo.programa_id,
     )
     db.commit()
@@ -1611,10 +2177,10 @@ def atualizar_tipo_evidencia(
 def remover_tipo_evidencia(
     tipo_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> MensagemOut:
     tipo = _buscar_tipo_evidencia(db, tipo_id)
-    old_value = _dump_model(tipo)
+    old_value = serializar_modelo(tipo)
     db.delete(tipo)
     registrar_log(
         db,
@@ -1631,11 +2197,13 @@ def remover_tipo_evidencia(
 
 @router.get('/evidencias', response_model=list[EvidenciaOut])
 def listar_evidencias(
+    response: Response,
     programa_id: int | None = Query(default=None),
     avaliacao_id: int | None = Query(default=None),
     auditoria_id: int | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[EvidenciaOut]:
     if avaliacao_id is None and auditoria_id is None:
         raise HTTPException(
@@ -1649,14 +2217,19 @@ def listar_evidencias(
         query = query.where(Evidencia.avaliacao_id == avaliacao_id)
     if auditoria_id:
         query = query.where(AvaliacaoIndicador.auditoria_ano_id == auditoria_id)
-    return list(db.scalars(query.order_by(Evidencia.created_at.desc())).all())
+    return paginar(db, query, ORDEM_EVIDENCIAS, paginacao, response)
 
 
-@router.post('/evidencias', response_model=EvidenciaOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    '/evidencias',
+    response_model=EvidenciaOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[orcamento_sql(8)],
+)
 def criar_evidencia(
     payload: EvidenciaCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
 ) -> EvidenciaOut:
     if payload.kind == EvidenciaKindEnum.arquivo:
         raise HTTPException(
@@ -1683,7 +2256,7 @@ def criar_evidencia(
         entidade_id=evidencia.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(evidencia),
+        new_value=serializar_modelo(evidencia),
         programa_id=avaliacao.programa_id,
         auditoria_ano_id=avaliacao.auditoria_ano_id,
     )
@@ -1692,7 +2265,12 @@ def criar_evidencia(
     return evidencia
 
 
-@router.post('/evidencias/upload', response_model=EvidenciaOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    '/evidencias/upload',
+    response_model=EvidenciaOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[orcamento_sql(8)],
+)
 def upload_evidencia(
     avaliacao_id: int = Form(...),
     tipo_evidencia_id: int | None = Form(default=None),
@@ -1700,63 +2278,107 @@ def upload_evidencia(
     observacoes: str | None = Form(default=None),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
 ) -> EvidenciaOut:
     avaliacao = _buscar_avaliacao(db, avaliacao_id)
-    if nao_conforme and not (observacoes or '').strip():
+    _validar_evidencia_arquivo(db, avaliacao, tipo_evidencia_id, nao_conforme, observacoes)
+
+    key = f'{_prefixo_arquivos_avaliacao(avaliacao)}{uuid4().hex}{_sufixo_arquivo(file.filename)}'
+    url_or_path = upload_fileobj(file.file, key, file.content_type)
+    return _registrar_evidencia_arquivo(db, avaliacao, url_or_path, tipo_evidencia_id, nao_conforme, observacoes, current_user)
+
+
+@router.post('/evidencias/upload-url', response_model=UploadPreAssinadoOut)
+def solicitar_upload_evidencia(
+    payload: UploadEvidenciaUrlRequest,
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+) -> UploadPreAssinadoOut:
+    avaliacao = _buscar_avaliacao(db, payload.avaliacao_id)
+    if payload.tamanho > settings.S3_UPLOAD_MAX_BYTES:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail='Informe observações para evidência marcada como não conforme.',
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'Arquivo excede o limite de {settings.S3_UPLOAD_MAX_BYTES} bytes.',
         )
-    if tipo_evidencia_id is not None:
-        tipo = _buscar_tipo_evidencia(db, tipo_evidencia_id)
-        _validar_tipo_evidencia_compativel_com_avaliacao(db, tipo, avaliacao)
+    key = f'{_prefixo_arquivos_avaliacao(avaliacao)}{uuid4().hex}{_sufixo_arquivo(payload.nome_arquivo)}'
+    return _upload_pre_assinado(key, payload.content_type, payload.tamanho)
 
-    suffix = Path(file.filename or 'arquivo').suffix
-    key = f'auditoria_{avaliacao.auditoria_ano_id}/avaliacao_{avaliacao.id}/{uuid4().hex}{suffix}'
-    url_or_path = upload_fileobj(file.file, key, file.content_type)
 
-    evidencia = Evidencia(
-        programa_id=avaliacao.programa_id,
-        avaliacao_id=avaliacao.id,
-        tipo_evidencia_id=tipo_evidencia_id,
-        kind=EvidenciaKindEnum.arquivo,
-        url_or_path=url_or_path,
-        nao_conforme=nao_conforme,
-        observacoes=observacoes,
-        created_by=current_user.id,
-    )
-    db.add(evidencia)
-    db.flush()
-    registrar_log(
-        db,
-        entidade='evidencia',
-        entidade_id=evidencia.id,
-        acao=AcaoAuditEnum.CREATE,
-        created_by=current_user.id,
-        new_value=_dump_model(evidencia),
-        programa_id=avaliacao.programa_id,
-        auditoria_ano_id=avaliacao.auditoria_ano_id,
-    )
-    db.commit()
-    db.refresh(evidencia)
-    return evidencia
+@router.post(
+    '/evidencias/upload-finalizar',
+    response_model=EvidenciaOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[orcamento_sql(9)],
+)
+def finalizar_upload_evidencia(
+    payload: UploadEvidenciaFinalizarRequest,
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+) -> EvidenciaOut:
+    avaliacao = _buscar_avaliacao(db, payload.avaliacao_id)
+    _validar_evidencia_arquivo(db, avaliacao, payload.tipo_evidencia_id, payload.nao_conforme, payload.observacoes)
+    _validar_key_upload(payload.key, _prefixo_arquivos_avaliacao(avaliacao))
+    _verificar_objeto_enviado(payload.key, settings.S3_UPLOAD_MAX_BYTES)
+
+    url_or_path = montar_uri_s3(payload.key)
+    duplicado = HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Este arquivo já foi registrado como evidência.')
+    if db.scalar(select(Evidencia.id).where(Evidencia.url_or_path == url_or_path)) is not None:
+        raise duplicado
+    try:
+        return _registrar_evidencia_arquivo(
+            db,
+            avaliacao,
+            url_or_path,
+            payload.tipo_evidencia_id,
+            payload.nao_conforme,
+            payload.observacoes,
+            current_user,
+        )
+    except IntegrityError as exc:
+        # Dois finalizar simultâneos com a mesma chave: o índice único ux_evidencias_arquivo_url decide.
+        db.rollback()
+        if getattr(getattr(exc.orig, 'diag', None), 'constraint_name', None) == 'ux_evidencias_arquivo_url':
+            raise duplicado from exc
+        raise
 
 
 @router.get('/evidencias/{evidencia_id}', response_model=EvidenciaOut)
 def obter_evidencia(
     evidencia_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    _: UsuarioAutenticado = Depends(get_current_user),
 ) -> EvidenciaOut:
     return _buscar_evidencia(db, evidencia_id)
 
 
+@router.get('/evidencias/{evidencia_id}/arquivo')
+def baixar_arquivo_evidencia(
+    evidencia_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(get_current_user),
+) -> Response:
+    evidencia = _buscar_evidencia(db, evidencia_id)
+    if evidencia.kind != EvidenciaKindEnum.arquivo or not evidencia.url_or_path.startswith('s3://'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Evidência não possui arquivo armazenado.',
+        )
+
+    nome_arquivo = f'evidencia_{evidencia.id}{Path(evidencia.url_or_path).suffix}'
+    return _resposta_arquivo_s3(
+        evidencia.url_or_path,
+        request,
+        'private, no-cache',
+        content_disposition=f'inline; filename="{nome_arquivo}"',
+    )
+
+
 @router.delete('/evidencias/{evidencia_id}', response_model=MensagemOut)
 def remover_evidencia(
     evidencia_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> MensagemOut:
     evidencia = _buscar_evidencia(db, evidencia_id)
     if current_user.role == RoleEnum.RESPONSAVEL and evidencia.created_by != current_user.id:
@@ -1764,7 +2386,7 @@ def remover_evidencia(
     if current_user.role not in (RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Você não possui permissão para esta ação.')
 
-    old_value = _dump_model(evidencia)
+    old_value = serializar_modelo(evidencia)
     avaliacao = _buscar_avaliacao(db, evidencia.avaliacao_id)
     db.delete(evidencia)
     registrar_log(
@@ -1781,18 +2403,16 @@ def remover_evidencia(
     return MensagemOut(mensagem='Evidência removida com sucesso.')
 
 
-@router.get('/documentos-evidencia', response_model=list[DocumentoEvidenciaOut])
-def listar_documentos_evidencia(
-    programa_id: int | None = Query(default=None),
-    auditoria_id: int | None = Query(default=None),
-    evidencia_id: int | None = Query(default=None),
-    status_documento: StatusDocumentoEnum | None = Query(default=None),
-    responsavel_id: int | None = Query(default=None),
-    q: str | None = Query(default=None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> list[DocumentoEvidenciaOut]:
-    query = select(DocumentoEvidencia).order_by(DocumentoEvidencia.updated_at.desc(), DocumentoEvidencia.id.desc())
+def _query_documentos_evidencia(
+    current_user: UsuarioAutenticado,
+    programa_id: int | None,
+    auditoria_id: int | None,
+    evidencia_id: int | None,
+    status_documento: StatusDocumentoEnum | None,
+    responsavel_id: int | None,
+    q: str | None,
+):
+    query = select(DocumentoEvidencia)
     if programa_id:
         query = query.where(DocumentoEvidencia.programa_id == programa_id)
     if auditoria_id:
@@ -1811,21 +2431,76 @@ def listar_documentos_evidencia(
             )
         )
     if q and q.strip():
-        termo = f"%{q.strip().lower()}%"
-        query = query.where(
-            or_(
-                func.lower(DocumentoEvidencia.titulo).like(termo),
-                func.lower(func.coalesce(DocumentoEvidencia.conteudo, '')).like(termo),
-            )
+        query = query.where(filtro_texto_documentos(q.strip()))
+    return query
+
+
+@router.get('/documentos-evidencia', response_model=list[DocumentoEvidenciaOut])
+def listar_documentos_evidencia(
+    response: Response,
+    programa_id: int | None = Query(default=None),
+    auditoria_id: int | None = Query(default=None),
+    evidencia_id: int | None = Query(default=None),
+    status_documento: StatusDocumentoEnum | None = Query(default=None),
+    responsavel_id: int | None = Query(default=None),
+    q: str | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
+) -> list[DocumentoEvidenciaOut]:
+    query = _query_documentos_evidencia(
+        current_user, programa_id, auditoria_id, evidencia_id, status_documento, responsavel_id, q
+    )
+    return paginar(db, query, ORDEM_DOCUMENTOS_EVIDENCIA, paginacao, response)
+
+
+@router.get('/documentos-evidencia/busca', response_model=list[DocumentoEvidenciaBuscaOut])
+def buscar_documentos_evidencia(
+    response: Response,
+    q: str = Query(min_length=1),
+    programa_id: int | None = Query(default=None),
+    auditoria_id: int | None = Query(default=None),
+    evidencia_id: int | None = Query(default=None),
+    status_documento: StatusDocumentoEnum | None = Query(default=None),
+    responsavel_id: int | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
+) -> list[DocumentoEvidenciaBuscaOut]:
+    # Só espaços passariam pelo min_length e listariam tudo sem filtro de texto.
+    if not q.strip():
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Informe um termo de busca.')
+    # Mesmos filtros da listagem, mas o conteudo não sai do banco: só os trechos destacados da página.
+    query = _query_documentos_evidencia(
+        current_user, programa_id, auditoria_id, evidencia_id, status_documento, responsavel_id, q
+    ).options(defer(DocumentoEvidencia.conteudo))
+    documentos = paginar(db, query, ORDEM_DOCUMENTOS_EVIDENCIA, paginacao, response)
+    trechos = trechos_documentos(db, [documento.id for documento in documentos], q.strip())
+    return [
+        DocumentoEvidenciaBuscaOut(
+            id=documento.id,
+            programa_id=documento.programa_id,
+            auditoria_ano_id=documento.auditoria_ano_id,
+            evidencia_id=documento.evidencia_id,
+            titulo=documento.titulo,
+            titulo_destacado=trechos[documento.id][0],
+            trecho=trechos[documento.id][1],
+            versao=documento.versao,
+            status_documento=documento.status_documento,
+            data_limite=documento.data_limite,
+            responsavel_id=documento.responsavel_id,
+            created_by=documento.created_by,
+            updated_at=documento.updated_at,
         )
-    return list(db.scalars(query).all())
+        for documento in documentos
+    ]
 
 
 @router.post('/documentos-evidencia', response_model=DocumentoEvidenciaOut, status_code=status.HTTP_201_CREATED)
 def criar_documento_evidencia(
     payload: DocumentoEvidenciaCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
 ) -> DocumentoEvidenciaOut:
     evidencia = _buscar_evidencia(db, payload.evidencia_id)
     avaliacao = _buscar_avaliacao(db, evidencia.avaliacao_id)
@@ -1848,7 +2523,7 @@ def criar_documento_evidencia(
         entidade_id=documento.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(documento),
+        new_value=serializar_modelo(documento),
         programa_id=documento.programa_id,
         auditoria_ano_id=documento.auditoria_ano_id,
     )
@@ -1861,7 +2536,7 @@ def criar_documento_evidencia(
 def obter_documento_evidencia(
     documento_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> DocumentoEvidenciaOut:
     documento = _buscar_documento_evidencia(db, documento_id)
     if current_user.role == RoleEnum.RESPONSAVEL and documento.responsavel_id != current_user.id and documento.created_by != current_user.id:
@@ -1877,7 +2552,7 @@ def atualizar_documento_evidencia(
     documento_id: int,
     payload: DocumentoEvidenciaUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
 ) -> DocumentoEvidenciaOut:
     documento = _buscar_documento_evidencia(db, documento_id)
     if current_user.role == RoleEnum.RESPONSAVEL and documento.created_by != current_user.id and documento.responsavel_id != current_user.id:
@@ -1898,7 +2573,7 @@ def atualizar_documento_evidencia(
     observacoes_revisao = data.get('observacoes_revisao', documento.observacoes_revisao)
     _validar_status_documento(status_destino, observacoes_revisao)
 
-    old_value = _dump_model(documento)
+    old_value = serializar_modelo(documento)
     status_anterior = documento.status_documento
     conteudo_anterior = documento.conteudo
     titulo_anterior = documento.titulo
@@ -1917,7 +2592,7 @@ def atualizar_documento_evidencia(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(documento),
+        new_value=serializar_modelo(documento),
         programa_id=documento.programa_id,
         auditoria_ano_id=documento.auditoria_ano_id,
     )
@@ -1931,11 +2606,11 @@ def revisar_status_documento_evidencia(
     documento_id: int,
     payload: DocumentoEvidenciaStatusPatch,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> DocumentoEvidenciaOut:
     documento = _buscar_documento_evidencia(db, documento_id)
     _validar_status_documento(payload.status_documento, payload.observacoes_revisao)
-    old_value = _dump_model(documento)
+    old_value = serializar_modelo(documento)
     documento.status_documento = payload.status_documento
     documento.observacoes_revisao = payload.observacoes_revisao
     _atualizar_metadados_revisao(documento, payload.status_documento, current_user.id)
@@ -1946,7 +2621,7 @@ def revisar_status_documento_evidencia(
         acao=AcaoAuditEnum.STATUS_CHANGE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(documento),
+        new_value=serializar_modelo(documento),
         programa_id=documento.programa_id,
         auditoria_ano_id=documento.auditoria_ano_id,
     )
@@ -1959,10 +2634,10 @@ def revisar_status_documento_evidencia(
 def remover_documento_evidencia(
     documento_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MensagemOut:
     documento = _buscar_documento_evidencia(db, documento_id)
-    old_value = _dump_model(documento)
+    old_value = serializar_modelo(documento)
     db.delete(documento)
     registrar_log(
         db,
@@ -1980,19 +2655,17 @@ def remover_documento_evidencia(
 
 @router.get('/monitoramentos-criterio', response_model=list[MonitoramentoCriterioOut])
 def listar_monitoramentos_criterio(
+    response: Response,
     programa_id: int | None = Query(default=None),
     auditoria_id: int | None = Query(default=None),
     criterio_id: int | None = Query(default=None),
     mes_referencia: date | None = Query(default=None),
     status_monitoramento: StatusMonitoramentoCriterioEnum | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[MonitoramentoCriterioOut]:
-    query = select(MonitoramentoCriterio).order_by(
-        MonitoramentoCriterio.mes_referencia.desc(),
-        MonitoramentoCriterio.updated_at.desc(),
-        MonitoramentoCriterio.id.desc(),
-    )
+    query = select(MonitoramentoCriterio)
     if programa_id:
         query = query.where(MonitoramentoCriterio.programa_id == programa_id)
     if auditoria_id:
@@ -2013,14 +2686,14 @@ def listar_monitoramentos_criterio(
                 MonitoramentoCriterio.id.in_(notificacoes_subq),
             )
         )
-    return list(db.scalars(query).all())
+    return paginar(db, query, ORDEM_MONITORAMENTOS_CRITERIO, paginacao, response)
 
 
 @router.post('/monitoramentos-criterio', response_model=MonitoramentoCriterioOut, status_code=status.HTTP_201_CREATED)
 def criar_monitoramento_criterio(
     payload: MonitoramentoCriterioCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MonitoramentoCriterioOut:
     mes_referencia = _normalizar_mes_referencia(payload.mes_referencia)
     auditoria = _buscar_auditoria(db, payload.auditoria_ano_id)
@@ -2056,7 +2729,7 @@ def criar_monitoramento_criterio(
         entidade_id=monitoramento.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(monitoramento),
+        new_value=serializar_modelo(monitoramento),
         programa_id=monitoramento.programa_id,
         auditoria_ano_id=monitoramento.auditoria_ano_id,
     )
@@ -2069,7 +2742,7 @@ def criar_monitoramento_criterio(
 def obter_monitoramento_criterio(
     monitoramento_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> MonitoramentoCriterioOut:
     monitoramento = _buscar_monitoramento_criterio(db, monitoramento_id)
     if current_user.role == RoleEnum.RESPONSAVEL:
@@ -2092,7 +2765,7 @@ def atualizar_monitoramento_criterio(
     monitoramento_id: int,
     payload: MonitoramentoCriterioUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MonitoramentoCriterioOut:
     monitoramento = _buscar_monitoramento_criterio(db, monitoramento_id)
     data = payload.model_dump(exclude_unset=True)
@@ -2124,7 +2797,7 @@ def atualizar_monitoramento_criterio(
 
     data['criterio_id'] = criterio_id
     data['mes_referencia'] = mes_referencia
-    old_value = _dump_model(monitoramento)
+    old_value = serializar_modelo(monitoramento)
     status_anterior = monitoramento.status_monitoramento
     for field, value in data.items():
         setattr(monitoramento, field, value)
@@ -2136,7 +2809,7 @@ def atualizar_monitoramento_criterio(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(monitoramento),
+        new_value=serializar_modelo(monitoramento),
         programa_id=monitoramento.programa_id,
         auditoria_ano_id=monitoramento.auditoria_ano_id,
     )
@@ -2149,10 +2822,10 @@ def atualizar_monitoramento_criterio(
 def remover_monitoramento_criterio(
     monitoramento_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> MensagemOut:
     monitoramento = _buscar_monitoramento_criterio(db, monitoramento_id)
-    old_value = _dump_model(monitoramento)
+    old_value = serializar_modelo(monitoramento)
     db.delete(monitoramento)
     registrar_log(
         db,
@@ -2174,7 +2847,7 @@ def listar_notificacoes_monitoramento(
     status_notificacao: StatusNotificacaoEnum | None = Query(default=None),
     responsavel_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[NotificacaoMonitoramentoOut]:
     monitoramento = _buscar_monitoramento_criterio(db, monitoramento_id)
     query = select(NotificacaoMonitoramento).where(NotificacaoMonitoramento.monitoramento_id == monitoramento.id)
@@ -2196,7 +2869,7 @@ def criar_notificacao_monitoramento(
     monitoramento_id: int,
     payload: NotificacaoMonitoramentoCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> NotificacaoMonitoramentoOut:
     monitoramento = _buscar_monitoramento_criterio(db, monitoramento_id)
     if payload.responsavel_id is not None:
@@ -2222,7 +2895,7 @@ def criar_notificacao_monitoramento(
         entidade_id=notificacao.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(notificacao),
+        new_value=serializar_modelo(notificacao),
         programa_id=notificacao.programa_id,
         auditoria_ano_id=notificacao.auditoria_ano_id,
     )
@@ -2236,7 +2909,7 @@ def atualizar_notificacao_monitoramento(
     notificacao_id: int,
     payload: NotificacaoMonitoramentoUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> NotificacaoMonitoramentoOut:
     notificacao = _buscar_notificacao_monitoramento(db, notificacao_id)
     data = payload.model_dump(exclude_unset=True)
@@ -2245,7 +2918,7 @@ def atualizar_notificacao_monitoramento(
     if 'responsavel_id' in data and data['responsavel_id'] is not None:
         _buscar_usuario(db, data['responsavel_id'])
 
-    old_value = _dump_model(notificacao)
+    old_value = serializar_modelo(notificacao)
     status_anterior = notificacao.status_notificacao
     for field, value in data.items():
         setattr(notificacao, field, value)
@@ -2257,7 +2930,7 @@ def atualizar_notificacao_monitoramento(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(notificacao),
+        new_value=serializar_modelo(notificacao),
         programa_id=notificacao.programa_id,
         auditoria_ano_id=notificacao.auditoria_ano_id,
     )
@@ -2271,7 +2944,7 @@ def patch_status_notificacao_monitoramento(
     notificacao_id: int,
     payload: NotificacaoMonitoramentoStatusPatch,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> NotificacaoMonitoramentoOut:
     notificacao = _buscar_notificacao_monitoramento(db, notificacao_id)
     if current_user.role == RoleEnum.RESPONSAVEL and notificacao.responsavel_id != current_user.id:
@@ -2282,7 +2955,7 @@ def patch_status_notificacao_monitoramento(
     if current_user.role not in (RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Você não possui permissão para esta ação.')
 
-    old_value = _dump_model(notificacao)
+    old_value = serializar_modelo(notificacao)
     notificacao.status_notificacao = payload.status_notificacao
     registrar_log(
         db,
@@ -2291,7 +2964,7 @@ def patch_status_notificacao_monitoramento(
         acao=AcaoAuditEnum.STATUS_CHANGE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(notificacao),
+        new_value=serializar_modelo(notificacao),
         programa_id=notificacao.programa_id,
         auditoria_ano_id=notificacao.auditoria_ano_id,
     )
@@ -2304,10 +2977,10 @@ def patch_status_notificacao_monitoramento(
 def remover_notificacao_monitoramento(
     notificacao_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MensagemOut:
     notificacao = _buscar_notificacao_monitoramento(db, notificacao_id)
-    old_value = _dump_model(notificacao)
+    old_value = serializar_modelo(notificacao)
     db.delete(notificacao)
     registrar_log(
         db,
@@ -2327,7 +3000,7 @@ def remover_notificacao_monitoramento(
 def listar_resolucoes_notificacao(
     notificacao_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[ResolucaoNotificacaoOut]:
     notificacao = _buscar_notificacao_monitoramento(db, notificacao_id)
     if current_user.role == RoleEnum.RESPONSAVEL and notificacao.responsavel_id != current_user.id:
@@ -2348,7 +3021,7 @@ def criar_resolucao_notificacao(
     notificacao_id: int,
     payload: ResolucaoNotificacaoCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> ResolucaoNotificacaoOut:
     notificacao = _buscar_notificacao_monitoramento(db, notificacao_id)
     if current_user.role == RoleEnum.RESPONSAVEL and notificacao.responsavel_id != current_user.id:
@@ -2366,7 +3039,7 @@ def criar_resolucao_notificacao(
         resultado=payload.resultado,
         created_by=current_user.id,
     )
-    old_notificacao = _dump_model(notificacao)
+    old_notificacao = serializar_modelo(notificacao)
     if notificacao.status_notificacao == StatusNotificacaoEnum.aberta:
         notificacao.status_notificacao = StatusNotificacaoEnum.em_tratamento
 
@@ -2378,7 +3051,7 @@ def criar_resolucao_notificacao(
         entidade_id=resolucao.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(resolucao),
+        new_value=serializar_modelo(resolucao),
         programa_id=resolucao.programa_id,
         auditoria_ano_id=notificacao.auditoria_ano_id,
     )
@@ -2390,7 +3063,7 @@ def criar_resolucao_notificacao(
             acao=AcaoAuditEnum.STATUS_CHANGE,
             created_by=current_user.id,
             old_value=old_notificacao,
-            new_value=_dump_model(notificacao),
+            new_value=serializar_modelo(notificacao),
             programa_id=notificacao.programa_id,
             auditoria_ano_id=notificacao.auditoria_ano_id,
         )
@@ -2403,11 +3076,11 @@ def criar_resolucao_notificacao(
 def remover_resolucao_notificacao(
     resolucao_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MensagemOut:
     resolucao = _buscar_resolucao_notificacao(db, resolucao_id)
     notificacao = _buscar_notificacao_monitoramento(db, resolucao.notificacao_id)
-    old_value = _dump_model(resolucao)
+    old_value = serializar_modelo(resolucao)
     db.delete(resolucao)
     registrar_log(
         db,
@@ -2425,20 +3098,18 @@ def remover_resolucao_notificacao(
 
 @router.get('/analises-nc', response_model=list[AnaliseNcOut])
 def listar_analises_nc(
+    response: Response,
     programa_id: int | None = Query(default=None),
     auditoria_id: int | None = Query(default=None),
     avaliacao_id: int | None = Query(default=None),
     demanda_id: int | None = Query(default=None),
     status_analise: StatusAnaliseNcEnum | None = Query(default=None),
     responsavel_id: int | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[AnaliseNcOut]:
-    query = (
-        select(AnaliseNaoConformidade)
-        .options(joinedload(AnaliseNaoConformidade.demanda))
-        .order_by(AnaliseNaoConformidade.updated_at.desc(), AnaliseNaoConformidade.id.desc())
-    )
+    query = select(AnaliseNaoConformidade).options(joinedload(AnaliseNaoConformidade.demanda))
     if programa_id:
         query = query.where(AnaliseNaoConformidade.programa_id == programa_id)
     if auditoria_id:
@@ -2459,14 +3130,19 @@ def listar_analises_nc(
                 AnaliseNaoConformidade.demanda_id.in_(demandas_responsavel_subq),
             )
         )
-    return list(db.scalars(query).all())
+    return paginar(db, query, ORDEM_ANALISES_NC, paginacao, response)
 
 
-@router.post('/analises-nc', response_model=AnaliseNcOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    '/analises-nc',
+    response_model=AnaliseNcOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[orcamento_sql(10)],
+)
 def criar_analise_nc(
     payload: AnaliseNcCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> AnaliseNcOut:
     auditoria = _buscar_auditoria(db, payload.auditoria_ano_id)
     _, _, _ = _validar_vinculos_analise_nc(
@@ -2510,7 +3186,7 @@ def criar_analise_nc(
         entidade_id=analise.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(analise),
+        new_value=serializar_modelo(analise),
         programa_id=analise.programa_id,
         auditoria_ano_id=analise.auditoria_ano_id,
     )
@@ -2523,7 +3199,7 @@ def criar_analise_nc(
 def obter_analise_nc(
     analise_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> AnaliseNcOut:
     analise = db.scalar(
         select(AnaliseNaoConformidade)
@@ -2540,12 +3216,12 @@ def obter_analise_nc(
     return analise
 
 
-@router.put('/analises-nc/{analise_id}', response_model=AnaliseNcOut)
+@router.put('/analises-nc/{analise_id}', response_model=AnaliseNcOut, dependencies=[orcamento_sql(10)])
 def atualizar_analise_nc(
     analise_id: int,
     payload: AnaliseNcUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> AnaliseNcOut:
     analise = _buscar_analise_nc(db, analise_id)
     data = payload.model_dump(exclude_unset=True)
@@ -2563,7 +3239,7 @@ def atualizar_analise_nc(
     acao_nova = data.get('acao_corretiva', analise.acao_corretiva)
     _validar_campos_analise_nc(status_novo, causa_nova, acao_nova)
 
-    old_value = _dump_model(analise)
+    old_value = serializar_modelo(analise)
     status_anterior = analise.status_analise
     for field, value in data.items():
         setattr(analise, field, value)
@@ -2575,7 +3251,7 @@ def atualizar_analise_nc(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(analise),
+        new_value=serializar_modelo(analise),
         programa_id=analise.programa_id,
         auditoria_ano_id=analise.auditoria_ano_id,
     )
@@ -2589,7 +3265,7 @@ def atualizar_status_analise_nc(
     analise_id: int,
     payload: AnaliseNcStatusPatch,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> AnaliseNcOut:
     analise = db.scalar(
         select(AnaliseNaoConformidade)
@@ -2607,7 +3283,7 @@ def atualizar_status_analise_nc(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Você não possui permissão para esta ação.')
     _validar_campos_analise_nc(payload.status_analise, analise.causa_raiz, analise.acao_corretiva)
 
-    old_value = _dump_model(analise)
+    old_value = serializar_modelo(analise)
     analise.status_analise = payload.status_analise
     registrar_log(
         db,
@@ -2616,7 +3292,7 @@ def atualizar_status_analise_nc(
         acao=AcaoAuditEnum.STATUS_CHANGE,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(analise),
+        new_value=serializar_modelo(analise),
         programa_id=analise.programa_id,
         auditoria_ano_id=analise.auditoria_ano_id,
     )
@@ -2629,10 +3305,10 @@ def atualizar_status_analise_nc(
 def remover_analise_nc(
     analise_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MensagemOut:
     analise = _buscar_analise_nc(db, analise_id)
-    old_value = _dump_model(analise)
+    old_value = serializar_modelo(analise)
     db.delete(analise)
     registrar_log(
         db,
@@ -2652,7 +3328,7 @@ def remover_analise_nc(
 def listar_logs_analise_nc(
     analise_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[AuditLogOut]:
     analise = db.scalar(
         select(AnaliseNaoConformidade)
@@ -2676,6 +3352,7 @@ def listar_logs_analise_nc(
 
 @router.get('/demandas', response_model=list[DemandaOut])
 def listar_demandas(
+    response: Response,
     programa_id: int | None = Query(default=None),
     auditoria_id: int | None = Query(default=None),
     avaliacao_id: int | None = Query(default=None),
@@ -2684,8 +3361,9 @@ def listar_demandas(
     status_andamento: StatusAndamentoEnum | None = Query(default=None),
     responsavel_id: int | None = Query(default=None),
     atrasadas: bool | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> list[DemandaOut]:
     query = select(Demanda).join(AvaliacaoIndicador, Demanda.avaliacao_id == AvaliacaoIndicador.id)
     if programa_id:
@@ -2714,15 +3392,14 @@ def listar_demandas(
             Demanda.due_date < date.today(),
             Demanda.status_andamento != StatusAndamentoEnum.concluida,
         )
-    query = query.order_by(Demanda.start_date.asc().nulls_last(), Demanda.due_date.asc().nulls_last(), Demanda.id.desc())
-    return list(db.scalars(query).all())
+    return paginar(db, query, ORDEM_DEMANDAS, paginacao, response)
 
 
 @router.post('/demandas', response_model=DemandaOut, status_code=status.HTTP_201_CREATED)
 def criar_demanda(
     payload: DemandaCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> DemandaOut:
     avaliacao = _buscar_avaliacao(db, payload.avaliacao_id)
     if payload.responsavel_id is not None:
@@ -2745,7 +3422,7 @@ def criar_demanda(
         entidade_id=demanda.id,
         acao=AcaoAuditEnum.CREATE,
         created_by=current_user.id,
-        new_value=_dump_model(demanda),
+        new_value=serializar_modelo(demanda),
         programa_id=avaliacao.programa_id,
         auditoria_ano_id=avaliacao.auditoria_ano_id,
     )
@@ -2758,7 +3435,7 @@ def criar_demanda(
 def obter_demanda(
     demanda_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> DemandaOut:
     demanda = _buscar_demanda(db, demanda_id)
     if current_user.role == RoleEnum.RESPONSAVEL and demanda.responsavel_id != current_user.id:
@@ -2771,7 +3448,7 @@ def atualizar_demanda(
     demanda_id: int,
     payload: DemandaUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> DemandaOut:
     demanda = _buscar_demanda(db, demanda_id)
     data = payload.model_dump(exclude_unset=True)
@@ -2785,7 +3462,7 @@ def atualizar_demanda(
     data['start_date'] = start_date_value
     data['due_date'] = due_date_value
 
-    old_value = _dump_model(demanda)
+    old_value = serializar_modelo(demanda)
     status_anterior = demanda.status_andamento
     for field, value in data.items():
         setattr(demanda, field, value)
@@ -2798,7 +3475,7 @@ def atualizar_demanda(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(demanda),
+        new_value=serializar_modelo(demanda),
         programa_id=demanda.programa_id,
         auditoria_ano_id=demanda.avaliacao.auditoria_ano_id,
     )
@@ -2812,7 +3489,7 @@ def patch_demanda(
     demanda_id: int,
     payload: DemandaPatch,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
 ) -> DemandaOut:
     demanda = _buscar_demanda(db, demanda_id)
     data = payload.model_dump(exclude_unset=True)
@@ -2841,7 +3518,7 @@ def patch_demanda(
     data['start_date'] = start_date_value
     data['due_date'] = due_date_value
 
-    old_value = _dump_model(demanda)
+    old_value = serializar_modelo(demanda)
     status_anterior = demanda.status_andamento
     for field, value in data.items():
         setattr(demanda, field, value)
@@ -2854,7 +3531,7 @@ def patch_demanda(
         acao=acao,
         created_by=current_user.id,
         old_value=old_value,
-        new_value=_dump_model(demanda),
+        new_value=serializar_modelo(demanda),
         programa_id=demanda.programa_id,
         auditoria_ano_id=demanda.avaliacao.auditoria_ano_id,
     )
@@ -2867,11 +3544,11 @@ def patch_demanda(
 def remover_demanda(
     demanda_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    current_user: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> MensagemOut:
     demanda = _buscar_demanda(db, demanda_id)
     avaliacao = demanda.avaliacao
-    old_value = _dump_model(demanda)
+    old_value = serializar_modelo(demanda)
     auditoria_id = avaliacao.auditoria_ano_id
 
     db.delete(demanda)
@@ -2893,14 +3570,16 @@ def remover_demanda(
 
 @router.get('/logs', response_model=list[AuditLogOut])
 def listar_logs(
+    response: Response,
     entidade: str | None = Query(default=None),
     entidade_id: int | None = Query(default=None),
     programa_id: int | None = Query(default=None),
     auditoria_id: int | None = Query(default=None),
+    paginacao: Paginacao = Depends(parametros_paginacao),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> list[AuditLogOut]:
-    query = select(AuditLog).order_by(AuditLog.created_at.desc())
+    query = select(AuditLog)
     if entidade:
         query = query.where(AuditLog.entidade == entidade)
     if entidade_id:
@@ -2909,14 +3588,24 @@ def listar_logs(
         query = query.where(AuditLog.programa_id == programa_id)
     if auditoria_id:
         query = query.where(AuditLog.auditoria_ano_id == auditoria_id)
-    return list(db.scalars(query).all())
+    return paginar(db, query, ORDEM_LOGS, paginacao, response)
+
+
+@router.get('/logs/{log_id}/estado', response_model=EstadoAuditLogOut)
+def obter_estado_log(
+    log_id: int,
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+) -> EstadoAuditLogOut:
+    # Logs em formato diff guardam só os campos alterados; o estado completo é remontado a partir do último checkpoint.
+    return EstadoAuditLogOut(**reconstruir_estado(db, log_id))
 
 
 @router.get('/usuarios', response_model=list[UserOut])
 def listar_usuarios(
     role: RoleEnum | None = Query(default=None),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> list[UserOut]:
     query = select(User).order_by(User.nome)
     if role:
@@ -2925,12 +3614,12 @@ def listar_usuarios(
 
 
 @router.post('/usuarios/responsaveis', response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def criar_responsavel(
+async def criar_responsavel(
     payload: ResponsavelCreate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR)),
 ) -> UserOut:
-    existente = db.scalar(select(User).where(func.lower(User.email) == payload.email.lower()))
+    existente = await run_in_threadpool(db.scalar, select(User).where(func.lower(User.email) == payload.email.lower()))
     if existente:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Já existe usuário com este email.')
 
@@ -2938,9 +3627,6 @@ def criar_responsavel(
         nome=payload.nome.strip(),
         email=payload.email.strip().lower(),
         role=RoleEnum.RESPONSAVEL,
-        password_hash=hash_password(payload.senha),
+        password_hash=await hash_password(payload.senha),
     )
-    db.add(responsavel)
-    db.commit()
-    db.refresh(responsavel)
-    return responsavel
+    return await run_in_threadpool(gravar_novo_usuario, db, responsavel)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.security import UsuarioAutenticado, get_current_user
+from app.db.session import get_db
+from app.models.job import Job
+from app.models.user import RoleEnum
+from app.schemas.job import JobOut
+
+router = APIRouter(prefix='/api/jobs', tags=['Jobs'])
+
+
+@router.get('/{job_id}', response_model=JobOut)
+def obter_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(get_current_user),
+) -> Job:
+    # Só quem enfileirou (ou ADMIN) acompanha o job; para os demais ele não existe.
+    job = db.get(Job, job_id)
+    if not job or (current_user.role != RoleEnum.ADMIN and job.created_by != current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Job não encontrado.')
+    return job
@@ -1,14 +1,23 @@
-﻿from datetime import date
+﻿import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import case, extract, func, select
+from sqlalchemy import String, case, cast, distinct, extract, func, literal, null, select, tuple_, union_all
 from sqlalchemy.orm import Session
 
 from app.core.rbac import require_roles
-from app.db.session import get_db
+from app.core.security import UsuarioAutenticado
+from app.core.config import get_settings
+from app.db.metricas import MetricasSql, acumular_metricas, metricas_isoladas
+from app.db.session import SessionLocal, get_db
 from app.models.fsc import (
     AuditoriaAno,
     AvaliacaoIndicador,
+    ContadorConformidade,
     Criterio,
     Demanda,
     Evidencia,
@@ -22,17 +31,33 @@ from app.models.fsc import (
 from app.models.user import RoleEnum, User
 from app.schemas.fsc import (
     AvaliacaoSemEvidenciaOut,
+    CriterioDirecionadorOut,
     CronogramaGanttItem,
+    DashboardOut,
     DemandaOut,
+    DiagramaDirecionadoresOut,
+    IdeiaDirecionadorOut,
     MonitoramentoMensalItem,
     NcPorPrincipioItem,
+    PrincipioDirecionadorOut,
+    ProgramaCertificacaoOut,
     ResumoConformidadeCertificacaoItem,
     ResumoStatusItem,
     STATUS_CONFORMIDADE_LABELS,
 )
+from app.services.cache_relatorios import guardar_relatorio, obter_relatorio
+
+settings = get_settings()
 
 router = APIRouter(prefix='/api/reports', tags=['Relatórios'])
 
+# Cada seção do dashboard roda numa thread deste pool com sessão (e conexão) própria.
+_executor_dashboard = ThreadPoolExecutor(
+    max_workers=max(settings.REPORTS_DASHBOARD_CONEXOES, 1),
+    thread_name_prefix='dashboard',
+)
+_vagas_dashboard = threading.BoundedSemaphore(max(settings.REPORTS_DASHBOARD_CONEXOES, 1))
+
 STATUS_CRONOGRAMA = (
     StatusConformidadeEnum.nc_menor,
     StatusConformidadeEnum.nc_maior,
@@ -68,18 +93,30 @@ def _buscar_auditoria(db: Session, auditoria_id: int) -> AuditoriaAno:
     return auditoria
 
 
+def _soma_contadores(*status_values: StatusConformidadeEnum):
+    return func.sum(
+        case(
+            (ContadorConformidade.status_conformidade.in_(status_values), ContadorConformidade.quantidade),
+            else_=0,
+        )
+    )
+
+
 @router.get('/resumo-status', response_model=list[ResumoStatusItem])
 def resumo_status(
     auditoria_id: int = Query(...),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> list[ResumoStatusItem]:
     _buscar_auditoria(db, auditoria_id)
+    return _resumo_status(db, auditoria_id)
+
 
+def _resumo_status(db: Session, auditoria_id: int) -> list[ResumoStatusItem]:
     rows = db.execute(
-        select(AvaliacaoIndicador.status_conformidade, func.count(AvaliacaoIndicador.id))
-        .where(AvaliacaoIndicador.auditoria_ano_id == auditoria_id)
-        .group_by(AvaliacaoIndicador.status_conformidade)
+        select(ContadorConformidade.status_conformidade, func.sum(ContadorConformidade.quantidade))
+        .where(ContadorConformidade.auditoria_ano_id == auditoria_id)
+        .group_by(ContadorConformidade.status_conformidade)
     ).all()
 
     count_by_status = {status_value: int(qtd) for status_value, qtd in rows}
@@ -99,7 +136,7 @@ def resumo_status(
 def avaliacoes_sem_evidencias(
     auditoria_id: int = Query(...),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> list[AvaliacaoSemEvidenciaOut]:
     _buscar_auditoria(db, auditoria_id)
 
@@ -140,10 +177,13 @@ def avaliacoes_sem_evidencias(
 def demandas_atrasadas(
     auditoria_id: int = Query(...),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> list[DemandaOut]:
     _buscar_auditoria(db, auditoria_id)
+    return _demandas_atrasadas(db, auditoria_id)
 
+
+def _demandas_atrasadas(db: Session, auditoria_id: int) -> list[Demanda]:
     demandas = db.scalars(
         select(Demanda)
         .join(AvaliacaoIndicador, AvaliacaoIndicador.id == Demanda.avaliacao_id)
@@ -162,28 +202,24 @@ def demandas_atrasadas(
 def nc_por_principio(
     auditoria_id: int = Query(...),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
 ) -> list[NcPorPrincipioItem]:
     _buscar_auditoria(db, auditoria_id)
 
-    nc_menor_case = case((AvaliacaoIndicador.status_conformidade == StatusConformidadeEnum.nc_menor, 1), else_=0)
-    nc_maior_case = case((AvaliacaoIndicador.status_conformidade == StatusConformidadeEnum.nc_maior, 1), else_=0)
-
     rows = db.execute(
         select(
             Principio.id,
             Principio.titulo,
-            func.sum(nc_menor_case).label('nc_menor'),
-            func.sum(nc_maior_case).label('nc_maior'),
+            _soma_contadores(StatusConformidadeEnum.nc_menor).label('nc_menor'),
+            _soma_contadores(StatusConformidadeEnum.nc_maior).label('nc_maior'),
         )
-        .join(Criterio, Criterio.principio_id == Principio.id)
-        .join(Indicador, Indicador.criterio_id == Criterio.id)
-        .join(AvaliacaoIndicador, AvaliacaoIndicador.indicator_id == Indicador.id)
+        .join(ContadorConformidade, ContadorConformidade.principio_id == Principio.id)
         .where(
-            AvaliacaoIndicador.auditoria_ano_id == auditoria_id,
-            AvaliacaoIndicador.status_conformidade.in_(
+            ContadorConformidade.auditoria_ano_id == auditoria_id,
+            ContadorConformidade.status_conformidade.in_(
                 (StatusConformidadeEnum.nc_menor, StatusConformidadeEnum.nc_maior)
             ),
+            ContadorConformidade.quantidade > 0,
         )
         .group_by(Principio.id, Principio.titulo)
         .order_by(Principio.titulo)
@@ -210,36 +246,28 @@ def resumo_conformidade_por_certificacao(
     year: int = Query(..., ge=2000, le=2100),
     programa_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR)),
+) -> list[ResumoConformidadeCertificacaoItem]:
+    return _resumo_conformidade_por_certificacao(db, year, programa_id)
+
+
+def _resumo_conformidade_por_certificacao(
+    db: Session, year: int, programa_id: int | None
 ) -> list[ResumoConformidadeCertificacaoItem]:
     query = (
         select(
             ProgramaCertificacao.id.label('programa_id'),
             ProgramaCertificacao.nome.label('programa_nome'),
             AuditoriaAno.year.label('year'),
-            func.sum(case((AvaliacaoIndicador.status_conformidade == StatusConformidadeEnum.conforme, 1), else_=0)).label('conformes'),
-            func.sum(
-                case(
-                    (
-                        AvaliacaoIndicador.status_conformidade.in_(
-                            (StatusConformidadeEnum.nc_menor, StatusConformidadeEnum.nc_maior)
-                        ),
-                        1,
-                    ),
-                    else_=0,
-                )
-            ).label('nao_conformes'),
-            func.sum(
-                case((AvaliacaoIndicador.status_conformidade == StatusConformidadeEnum.oportunidade_melhoria, 1), else_=0)
-            ).label('oportunidades_melhoria'),
-            func.sum(
-                case((AvaliacaoIndicador.status_conformidade == StatusConformidadeEnum.nao_se_aplica, 1), else_=0)
-            ).label('nao_se_aplica'),
-            func.count(AvaliacaoIndicador.id).label('total_avaliacoes'),
+            _soma_contadores(StatusConformidadeEnum.conforme).label('conformes'),
+            _soma_contadores(StatusConformidadeEnum.nc_menor, StatusConformidadeEnum.nc_maior).label('nao_conformes'),
+            _soma_contadores(StatusConformidadeEnum.oportunidade_melhoria).label('oportunidades_melhoria'),
+            _soma_contadores(StatusConformidadeEnum.nao_se_aplica).label('nao_se_aplica'),
+            func.sum(ContadorConformidade.quantidade).label('total_avaliacoes'),
         )
         .join(AuditoriaAno, AuditoriaAno.programa_id == ProgramaCertificacao.id)
-        .join(AvaliacaoIndicador, AvaliacaoIndicador.auditoria_ano_id == AuditoriaAno.id)
-        .where(AuditoriaAno.year == year)
+        .join(ContadorConformidade, ContadorConformidade.auditoria_ano_id == AuditoriaAno.id)
+        .where(AuditoriaAno.year == year, ContadorConformidade.quantidade > 0)
         .group_by(ProgramaCertificacao.id, ProgramaCertificacao.nome, AuditoriaAno.year)
         .order_by(ProgramaCertificacao.nome)
     )
@@ -269,7 +297,7 @@ def cronograma_nc(
     auditoria_id: int = Query(...),
     incluir_concluidas: bool = Query(default=True),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
 ) -> list[CronogramaGanttItem]:
     auditoria = _buscar_auditoria(db, auditoria_id)
     if auditoria.programa_id != programa_id:
@@ -396,13 +424,21 @@ def cronograma_nc(
     return resultado
 
 
-@router.get('/monitoramento-mensal', response_model=list[MonitoramentoMensalItem])
-def monitoramento_mensal(
+def _chave_codigo_titulo(modelo):
+    # Mesma ordenação da tela: "codigo titulo" sem diferenciar maiúsculas.
+    return func.lower(func.trim(func.concat(func.coalesce(modelo.codigo, ''), ' ', modelo.titulo)))
+
+
+@router.get('/direcionadores', response_model=DiagramaDirecionadoresOut)
+def diagrama_direcionadores(
     programa_id: int = Query(...),
     auditoria_id: int = Query(...),
+    apenas_ativas: bool = Query(default=True),
     db: Session = Depends(get_db),
-    _: User = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
-) -> list[MonitoramentoMensalItem]:
+    current_user: UsuarioAutenticado = Depends(
+        require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)
+    ),
+) -> DiagramaDirecionadoresOut:
     auditoria = _buscar_auditoria(db, auditoria_id)
     if auditoria.programa_id != programa_id:
         raise HTTPException(
@@ -410,75 +446,297 @@ def monitoramento_mensal(
             detail='A auditoria informada não pertence ao programa selecionado.',
         )
 
-    principios_cadastrados = int(
-        db.scalar(select(func.count(Principio.id)).where(Principio.programa_id == programa_id)) or 0
-    )
-    criterios_cadastrados = int(
-        db.scalar(select(func.count(Criterio.id)).where(Criterio.programa_id == programa_id)) or 0
-    )
-
-    avaliacoes_mes_rows = db.execute(
-        select(extract('month', AvaliacaoIndicador.assessed_at).label('mes'), func.count(AvaliacaoIndicador.id))
-        .where(
-            AvaliacaoIndicador.programa_id == programa_id,
-            AvaliacaoIndicador.auditoria_ano_id == auditoria_id,
-        )
-        .group_by('mes')
-    ).all()
-    avaliacoes_por_mes = {int(row[0]): int(row[1] or 0) for row in avaliacoes_mes_rows}
-
-    principios_mes_rows = db.execute(
+    # RESPONSAVEL só enxerga as próprias demandas, como em /api/demandas.
+    responsavel_id = current_user.id if current_user.role == RoleEnum.RESPONSAVEL else None
+    chave_cache = ('direcionadores', programa_id, auditoria_id, apenas_ativas, responsavel_id)
+    em_cache = obter_relatorio(chave_cache)
+    if em_cache is not None:
+        return em_cache
+
+    condicao_demanda = Demanda.avaliacao_id == AvaliacaoIndicador.id
+    if apenas_ativas:
+        condicao_demanda = condicao_demanda & (Demanda.status_andamento != StatusAndamentoEnum.concluida)
+    if responsavel_id is not None:
+        condicao_demanda = condicao_demanda & (Demanda.responsavel_id == responsavel_id)
+
+    # Uma linha por (avaliação NC/OM, demanda) já na ordem final: princípio, critério, prioridade e id decrescente.
+    linhas = db.execute(
         select(
-            extract('month', AvaliacaoIndicador.assessed_at).label('mes'),
-            func.count(func.distinct(Principio.id)),
+            Principio.id.label('principio_id'),
+            Principio.codigo.label('principio_codigo'),
+            Principio.titulo.label('principio_titulo'),
+            Criterio.id.label('criterio_id'),
+            Criterio.codigo.label('criterio_codigo'),
+            Criterio.titulo.label('criterio_titulo'),
+            AvaliacaoIndicador.id.label('avaliacao_id'),
+            AvaliacaoIndicador.status_conformidade.label('status_conformidade'),
+            Demanda.id.label('demanda_id'),
+            Demanda.titulo.label('demanda_titulo'),
+            Demanda.descricao.label('demanda_descricao'),
+            Demanda.prioridade.label('prioridade'),
+            Demanda.status_andamento.label('status_andamento'),
         )
         .join(Indicador, Indicador.id == AvaliacaoIndicador.indicator_id)
         .join(Criterio, Criterio.id == Indicador.criterio_id)
         .join(Principio, Principio.id == Criterio.principio_id)
+        .outerjoin(Demanda, condicao_demanda)
         .where(
             AvaliacaoIndicador.programa_id == programa_id,
             AvaliacaoIndicador.auditoria_ano_id == auditoria_id,
+            AvaliacaoIndicador.status_conformidade.in_(STATUS_CRONOGRAMA),
+        )
+        .order_by(
+            _chave_codigo_titulo(Principio),
+            Principio.id,
+            _chave_codigo_titulo(Criterio),
+            Criterio.id,
+            cast(Demanda.prioridade, String).asc().nulls_last(),
+            Demanda.id.desc().nulls_last(),
+            AvaliacaoIndicador.id,
         )
-        .group_by('mes')
     ).all()
-    principios_monitorados_por_mes = {int(row[0]): int(row[1] or 0) for row in principios_mes_rows}
 
-    criterios_mes_rows = db.execute(
+    principios: list[PrincipioDirecionadorOut] = []
+    avaliacoes_nc: set[int] = set()
+    principio_atual: PrincipioDirecionadorOut | None = None
+    criterio_atual: CriterioDirecionadorOut | None = None
+    for row in linhas:
+        if principio_atual is None or principio_atual.id != row.principio_id:
+            principio_atual = PrincipioDirecionadorOut(
+                id=row.principio_id,
+                codigo=row.principio_codigo or '',
+                titulo=row.principio_titulo,
+                total_avaliacoes=0,
+                total_ideias=0,
+                criterios=[],
+            )
+            principios.append(principio_atual)
+            criterio_atual = None
+        if criterio_atual is None or criterio_atual.id != row.criterio_id:
+            criterio_atual = CriterioDirecionadorOut(
+                id=row.criterio_id,
+                codigo=row.criterio_codigo or '',
+                titulo=row.criterio_titulo,
+                avaliacao_ids=[],
+                total_avaliacoes=0,
+                ideias=[],
+            )
+            principio_atual.criterios.append(criterio_atual)
+        if row.avaliacao_id not in avaliacoes_nc:
+            # Cada avaliação pertence a um único critério: o conjunto global basta para não repetir.
+            avaliacoes_nc.add(row.avaliacao_id)
+            criterio_atual.avaliacao_ids.append(row.avaliacao_id)
+            criterio_atual.total_avaliacoes += 1
+            principio_atual.total_avaliacoes += 1
+        if row.demanda_id is not None:
+            criterio_atual.ideias.append(
+                IdeiaDirecionadorOut(
+                    id=row.demanda_id,
+                    avaliacao_id=row.avaliacao_id,
+                    titulo=row.demanda_titulo,
+                    descricao=row.demanda_descricao,
+                    prioridade=row.prioridade,
+                    status_andamento=row.status_andamento,
+                    status_conformidade=row.status_conformidade,
+                )
+            )
+            principio_atual.total_ideias += 1
+
+    resultado = DiagramaDirecionadoresOut(
+        auditoria_id=auditoria_id,
+        apenas_ativas=apenas_ativas,
+        total_avaliacoes_nc=len(avaliacoes_nc),
+        principios=principios,
+    )
+    guardar_relatorio(chave_cache, resultado)
+    return resultado
+
+
+@router.get('/monitoramento-mensal', response_model=list[MonitoramentoMensalItem])
+def monitoramento_mensal(
+    programa_id: int = Query(...),
+    auditoria_id: int = Query(...),
+    db: Session = Depends(get_db),
+    _: UsuarioAutenticado = Depends(require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)),
+) -> list[MonitoramentoMensalItem]:
+    auditoria = _buscar_auditoria(db, auditoria_id)
+    if auditoria.programa_id != programa_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='A auditoria informada não pertence ao programa selecionado.',
+        )
+    return _monitoramento_mensal(db, programa_id, auditoria_id)
+
+
+def _monitoramento_mensal(db: Session, programa_id: int, auditoria_id: int) -> list[MonitoramentoMensalItem]:
+    chave_cache = ('monitoramento_mensal', programa_id, auditoria_id)
+    em_cache = obter_relatorio(chave_cache)
+    if em_cache is not None:
+        return em_cache
+
+    # Mês calculado em UTC: com timestamptz puro o extract depende do fuso da sessão e não pode ser indexado.
+    mes_avaliacao = extract('month', func.timezone('UTC', AvaliacaoIndicador.assessed_at))
+    mes_evidencia = extract('month', func.timezone('UTC', Evidencia.created_at))
+    eventos = union_all(
         select(
-            extract('month', AvaliacaoIndicador.assessed_at).label('mes'),
-            func.count(func.distinct(Criterio.id)),
+            mes_avaliacao.label('mes'),
+            literal('avaliacao').label('tipo'),
+            Criterio.principio_id.label('principio_id'),
+            Indicador.criterio_id.label('criterio_id'),
         )
         .join(Indicador, Indicador.id == AvaliacaoIndicador.indicator_id)
         .join(Criterio, Criterio.id == Indicador.criterio_id)
         .where(
             AvaliacaoIndicador.programa_id == programa_id,
             AvaliacaoIndicador.auditoria_ano_id == auditoria_id,
+        ),
+        select(
+            mes_evidencia.label('mes'),
+            literal('evidencia').label('tipo'),
+            null().label('principio_id'),
+            null().label('criterio_id'),
         )
-        .group_by('mes')
-    ).all()
-    criterios_monitorados_por_mes = {int(row[0]): int(row[1] or 0) for row in criterios_mes_rows}
-
-    evidencias_mes_rows = db.execute(
-        select(extract('month', Evidencia.created_at).label('mes'), func.count(Evidencia.id))
         .join(AvaliacaoIndicador, AvaliacaoIndicador.id == Evidencia.avaliacao_id)
         .where(
             AvaliacaoIndicador.programa_id == programa_id,
             AvaliacaoIndicador.auditoria_ano_id == auditoria_id,
-        )
-        .group_by('mes')
+        ),
+    ).cte('eventos')
+
+    # O conjunto vazio de GROUPING SETS garante uma linha com os totais cadastrados mesmo sem eventos.
+    linhas = db.execute(
+        select(
+            eventos.c.mes,
+            func.count().filter(eventos.c.tipo == 'avaliacao').label('avaliacoes'),
+            func.count(distinct(eventos.c.principio_id)).label('principios'),
+            func.count(distinct(eventos.c.criterio_id)).label('criterios'),
+            func.count().filter(eventos.c.tipo == 'evidencia').label('evidencias'),
+            select(func.count(Principio.id))
+            .where(Principio.programa_id == programa_id)
+            .scalar_subquery()
+            .label('principios_cadastrados'),
+            select(func.count(Criterio.id))
+            .where(Criterio.programa_id == programa_id)
+            .scalar_subquery()
+            .label('criterios_cadastrados'),
+        ).group_by(func.grouping_sets(tuple_(eventos.c.mes), tuple_()))
     ).all()
-    evidencias_por_mes = {int(row[0]): int(row[1] or 0) for row in evidencias_mes_rows}
 
-    return [
+    principios_cadastrados = 0
+    criterios_cadastrados = 0
+    por_mes = {}
+    for row in linhas:
+        principios_cadastrados = int(row.principios_cadastrados or 0)
+        criterios_cadastrados = int(row.criterios_cadastrados or 0)
+        if row.mes is not None:
+            por_mes[int(row.mes)] = row
+
+    resultado = [
         MonitoramentoMensalItem(
             mes=mes,
             mes_nome=NOMES_MESES[mes],
             principios_cadastrados=principios_cadastrados,
-            principios_monitorados=principios_monitorados_por_mes.get(mes, 0),
+            principios_monitorados=int(por_mes[mes].principios) if mes in por_mes else 0,
             criterios_cadastrados=criterios_cadastrados,
-            criterios_monitorados=criterios_monitorados_por_mes.get(mes, 0),
-            avaliacoes_registradas=avaliacoes_por_mes.get(mes, 0),
-            evidencias_registradas=evidencias_por_mes.get(mes, 0),
+            criterios_monitorados=int(por_mes[mes].criterios) if mes in por_mes else 0,
+            avaliacoes_registradas=int(por_mes[mes].avaliacoes) if mes in por_mes else 0,
+            evidencias_registradas=int(por_mes[mes].evidencias) if mes in por_mes else 0,
         )
         for mes in range(1, 13)
     ]
+    guardar_relatorio(chave_cache, resultado)
+    return resultado
+
+
+def _executar_secao(secao: Callable[[Session], Any]) -> tuple[Any, MetricasSql, float]:
+    inicio = time.perf_counter()
+    with metricas_isoladas() as metricas, SessionLocal() as db:
+        resultado = secao(db)
+    return resultado, metricas, round((time.perf_counter() - inicio) * 1000, 1)
+
+
+def _iniciar_secao(secao: Callable[[Session], Any]) -> Future:
+    # Sem vaga no pool, a seção roda na própria thread da requisição em vez de esperar atrás
+    # do dashboard de outra requisição.
+    if _vagas_dashboard.acquire(blocking=False):
+        try:
+            futuro = _executor_dashboard.submit(_executar_secao, secao)
+        except BaseException:
+            _vagas_dashboard.release()
+            raise
+        futuro.add_done_callback(lambda _: _vagas_dashboard.release())
+        return futuro
+    futuro: Future = Future()
+    try:
+        futuro.set_result(_executar_secao(secao))
+    except Exception as exc:
+        futuro.set_exception(exc)
+    return futuro
+
+
+def _ano_relatorio(year: int | None, anos_disponiveis: list[int]) -> int:
+    # Mesmo padrão da tela: ano atual, ou o mais recente com auditoria quando o atual não tem.
+    if year is not None:
+        return year
+    ano_atual = date.today().year
+    if not anos_disponiveis or ano_atual in anos_disponiveis:
+        return ano_atual
+    return anos_disponiveis[0]
+
+
+@router.get('/dashboard', response_model=DashboardOut)
+def dashboard(
+    programa_id: int | None = Query(default=None),
+    auditoria_id: int | None = Query(default=None),
+    year: int | None = Query(default=None, ge=2000, le=2100),
+    programa_relatorio_id: int | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: UsuarioAutenticado = Depends(
+        require_roles(RoleEnum.ADMIN, RoleEnum.GESTOR, RoleEnum.AUDITOR, RoleEnum.RESPONSAVEL)
+    ),
+) -> DashboardOut:
+    # Validações e o ano do relatório saem antes: nenhuma seção começa para uma auditoria inválida.
+    if auditoria_id:
+        auditoria = _buscar_auditoria(db, auditoria_id)
+        if programa_id and auditoria.programa_id != programa_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='A auditoria informada não pertence ao programa selecionado.',
+            )
+    anos_disponiveis = list(
+        db.scalars(select(distinct(AuditoriaAno.year)).order_by(AuditoriaAno.year.desc())).all()
+    )
+    ano = _ano_relatorio(year, anos_disponiveis)
+    # Devolve a conexão da requisição ao pool: daqui em diante só as sessões das seções consultam.
+    db.rollback()
+
+    secoes: dict[str, Callable[[Session], Any]] = {
+        'programas': lambda sessao: [
+            ProgramaCertificacaoOut.model_validate(programa)
+            for programa in sessao.scalars(select(ProgramaCertificacao).order_by(ProgramaCertificacao.id))
+        ],
+    }
+    # RESPONSAVEL vê filtros e monitoramento mensal (como no endpoint isolado); as demais seções voltam null.
+    gerencial = current_user.role != RoleEnum.RESPONSAVEL
+    if gerencial:
+        secoes['resumo_conformidade_por_certificacao'] = lambda sessao: _resumo_conformidade_por_certificacao(
+            sessao, ano, programa_relatorio_id
+        )
+    # A auditoria já foi validada acima; as seções usam os corpos dos relatórios sem repetir a busca.
+    if auditoria_id:
+        if gerencial:
+            secoes['resumo_status'] = lambda sessao: _resumo_status(sessao, auditoria_id)
+            secoes['demandas_atrasadas'] = lambda sessao: [
+                DemandaOut.model_validate(demanda) for demanda in _demandas_atrasadas(sessao, auditoria_id)
+            ]
+        if programa_id:
+            # Reaproveita o cache do relatório mensal (mesma chave do endpoint isolado).
+            secoes['monitoramento_mensal'] = lambda sessao: _monitoramento_mensal(sessao, programa_id, auditoria_id)
+
+    futuros = {nome: _iniciar_secao(secao) for nome, secao in secoes.items()}
+    resultados: dict[str, Any] = {}
+    tempos: dict[str, float] = {}
+    for nome, futuro in futuros.items():
+        resultados[nome], metricas, tempos[nome] = futuro.result()
+        acumular_metricas(metricas)
+    return DashboardOut(anos_disponiveis=anos_disponiveis, year=ano, tempos_ms=tempos, **resultados)
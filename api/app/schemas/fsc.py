@@ -1,8 +1,9 @@
-﻿from datetime import date, datetime
+﻿import enum
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from app.models.auditlog import AcaoAuditEnum
+from app.models.auditlog import AcaoAuditEnum, FormatoAuditEnum
 from app.models.fsc import (
     EvidenciaKindEnum,
     PrioridadeEnum,
@@ -13,6 +14,7 @@ from app.models.fsc import (
     StatusMonitoramentoCriterioEnum,
     StatusNotificacaoEnum,
 )
+from app.schemas.user import UserOut
 
 
 STATUS_CONFORMIDADE_LABELS = {
@@ -72,6 +74,11 @@ class MensagemOut(BaseModel):
     mensagem: str
 
 
+class GeracaoAvaliacoesOut(MensagemOut):
+    criadas: int
+    ignoradas: int
+
+
 class ResponsavelCreate(BaseModel):
     nome: str = Field(min_length=2, max_length=150)
     email: str = Field(min_length=3, max_length=255)
@@ -95,6 +102,23 @@ class ConfiguracaoSistemaOut(BaseModel):
     updated_at: datetime
 
 
+class UploadArquivoUrlRequest(BaseModel):
+    nome_arquivo: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(min_length=1, max_length=255)
+    tamanho: int = Field(gt=0)
+
+
+class UploadLogoFinalizarRequest(BaseModel):
+    key: str = Field(min_length=1, max_length=1024)
+
+
+class UploadPreAssinadoOut(BaseModel):
+    url: str
+    campos: dict[str, str]
+    key: str
+    expira_em_segundos: int
+
+
 class ProgramaCertificacaoBase(BaseModel):
     codigo: str = Field(min_length=2, max_length=50)
     nome: str = Field(min_length=2, max_length=120)
@@ -299,6 +323,28 @@ class EvidenceTypeOut(BaseModel):
     status_conformidade: StatusConformidadeEnum
 
 
+class IndicadorCatalogoOut(IndicadorOut):
+    tipos_evidencia: list[EvidenceTypeOut]
+
+
+class CriterioCatalogoOut(CriterioOut):
+    indicadores: list[IndicadorCatalogoOut]
+    # Tipos vinculados ao critério sem indicador.
+    tipos_evidencia: list[EvidenceTypeOut]
+
+
+class PrincipioCatalogoOut(PrincipioOut):
+    criterios: list[CriterioCatalogoOut]
+
+
+class CatalogoProgramaOut(BaseModel):
+    programa_id: int
+    versao: int
+    principios: list[PrincipioCatalogoOut]
+    # Tipos vinculados só ao programa.
+    tipos_evidencia: list[EvidenceTypeOut]
+
+
 class EvidenciaCreate(BaseModel):
     avaliacao_id: int
     tipo_evidencia_id: int | None = None
@@ -308,6 +354,18 @@ class EvidenciaCreate(BaseModel):
     observacoes: str | None = None
 
 
+class UploadEvidenciaUrlRequest(UploadArquivoUrlRequest):
+    avaliacao_id: int
+
+
+class UploadEvidenciaFinalizarRequest(BaseModel):
+    avaliacao_id: int
+    key: str = Field(min_length=1, max_length=1024)
+    tipo_evidencia_id: int | None = None
+    nao_conforme: bool = False
+    observacoes: str | None = None
+
+
 class EvidenciaOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -368,6 +426,23 @@ class DocumentoEvidenciaOut(BaseModel):
     updated_at: datetime
 
 
+class DocumentoEvidenciaBuscaOut(BaseModel):
+    # Resultado da busca: sem o conteudo completo, só os trechos com os termos entre <mark>.
+    id: int
+    programa_id: int
+    auditoria_ano_id: int
+    evidencia_id: int
+    titulo: str
+    titulo_destacado: str
+    trecho: str | None
+    versao: int
+    status_documento: StatusDocumentoEnum
+    data_limite: date | None
+    responsavel_id: int | None
+    created_by: int
+    updated_at: datetime
+
+
 class MonitoramentoCriterioCreate(BaseModel):
     auditoria_ano_id: int
     criterio_id: int
@@ -588,12 +663,76 @@ class AuditLogOut(BaseModel):
     acao: AcaoAuditEnum
     old_value: dict | None
     new_value: dict | None
+    formato: FormatoAuditEnum = FormatoAuditEnum.completo
     created_by: int | None
     programa_id: int | None
     auditoria_ano_id: int | None
     created_at: datetime
 
 
+class EstadoAuditLogOut(BaseModel):
+    log_id: int
+    entidade: str
+    entidade_id: int
+    acao: AcaoAuditEnum
+    estado_anterior: dict | None
+    estado: dict | None
+    base_log_id: int
+    diffs_aplicados: int
+
+
+class ItemCaminhoCatalogoOut(BaseModel):
+    tipo: str
+    id: int
+    codigo: str | None = None
+    titulo: str
+
+
+class ResultadoBuscaCatalogoOut(BaseModel):
+    tipo: str
+    id: int
+    programa_id: int
+    codigo: str | None = None
+    titulo: str
+    relevancia: float
+    caminho: list[ItemCaminhoCatalogoOut]
+
+
+class OrdenacaoGradeEnum(str, enum.Enum):
+    indicador = 'indicador'
+    criterio = 'criterio'
+    status = 'status'
+    evidencias = 'evidencias'
+    pendencias = 'pendencias'
+    demandas = 'demandas'
+    atualizacao = 'atualizacao'
+
+
+class SituacaoEvidenciaEnum(str, enum.Enum):
+    sem_evidencia = 'sem_evidencia'
+    com_pendencia = 'com_pendencia'
+    sem_pendencia = 'sem_pendencia'
+
+
+class GradeAvaliacaoItem(BaseModel):
+    id: int
+    indicator_id: int
+    status_conformidade: StatusConformidadeEnum
+    observacoes: str | None
+    updated_at: datetime
+    indicador_codigo: str | None
+    indicador_titulo: str
+    criterio_id: int
+    criterio_codigo: str | None
+    criterio_titulo: str
+    principio_id: int
+    principio_codigo: str | None
+    principio_titulo: str
+    evidencias: int
+    evidencias_nao_conformes: int
+    demandas_ativas: int
+
+
 class AvaliacaoDetalheOut(BaseModel):
     avaliacao: AvaliacaoOut
     indicador: IndicadorOut
@@ -604,6 +743,14 @@ class AvaliacaoDetalheOut(BaseModel):
     logs: list[AuditLogOut]
 
 
+class AvaliacaoDetalheCompletoOut(AvaliacaoDetalheOut):
+    # Tudo o que a tela de detalhe usa: tipos compatíveis com o indicador e responsáveis atribuíveis inclusos.
+    tipos_evidencia: list[EvidenceTypeOut]
+    responsaveis: list[UserOut]
+    documentos: list[DocumentoEvidenciaOut]
+    analises_nc: list[AnaliseNcOut]
+
+
 class ResumoStatusItem(BaseModel):
     status_conformidade: StatusConformidadeEnum
     label: str
@@ -660,3 +807,49 @@ class MonitoramentoMensalItem(BaseModel):
     criterios_monitorados: int
     avaliacoes_registradas: int
     evidencias_registradas: int
+
+
+class IdeiaDirecionadorOut(BaseModel):
+    id: int
+    avaliacao_id: int
+    titulo: str
+    descricao: str | None = None
+    prioridade: PrioridadeEnum
+    status_andamento: StatusAndamentoEnum
+    status_conformidade: StatusConformidadeEnum
+
+
+class CriterioDirecionadorOut(BaseModel):
+    id: int
+    codigo: str
+    titulo: str
+    avaliacao_ids: list[int]
+    total_avaliacoes: int
+    ideias: list[IdeiaDirecionadorOut]
+
+
+class PrincipioDirecionadorOut(BaseModel):
+    id: int
+    codigo: str
+    titulo: str
+    total_avaliacoes: int
+    total_ideias: int
+    criterios: list[CriterioDirecionadorOut]
+
+
+class DiagramaDirecionadoresOut(BaseModel):
+    auditoria_id: int
+    apenas_ativas: bool
+    total_avaliacoes_nc: int
+    principios: list[PrincipioDirecionadorOut]
+
+
+class DashboardOut(BaseModel):
+    programas: list[ProgramaCertificacaoOut]
+    anos_disponiveis: list[int]
+    year: int
+    resumo_status: list[ResumoStatusItem] | None = None
+    demandas_atrasadas: list[DemandaOut] | None = None
+    monitoramento_mensal: list[MonitoramentoMensalItem] | None = None
+    resumo_conformidade_por_certificacao: list[ResumoConformidadeCertificacaoItem] | None = None
+    tempos_ms: dict[str, float]
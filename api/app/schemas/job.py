@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.job import StatusJobEnum
+
+
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    tipo: str
+    status: StatusJobEnum
+    progresso: int
+    mensagem: str | None = None
+    resultado: dict[str, Any] | None = None
+    erro: str | None = None
+    tentativas: int
+    max_tentativas: int
+    created_at: datetime
+    iniciado_em: datetime | None = None
+    concluido_em: datetime | None = None
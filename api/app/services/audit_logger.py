@@ -1,7 +1,59 @@
-﻿from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+﻿from fastapi import HTTPException, status
+from sqlalchemy import Integer, String, column, event, func, insert, select, values
+from sqlalchemy.orm import Session, aliased
 
-from app.models.auditlog import AcaoAuditEnum, AuditLog
+from app.core.config import get_settings
+from app.models.auditlog import AcaoAuditEnum, AuditLog, FormatoAuditEnum
+from app.services.serializacao import para_json
+
+settings = get_settings()
+
+_CHAVE_PENDENTES = 'audit_logs_pendentes'
+# Estado completo guardado na linha pendente, usado se ela virar checkpoint no commit.
+_ESTADO_COMPLETO = '_estado_completo'
+
+
+def _diferenca(antigo: dict, novo: dict) -> tuple[dict, dict]:
+    chaves = [*novo, *(chave for chave in antigo if chave not in novo)]
+    alteradas = [chave for chave in chaves if antigo.get(chave) != novo.get(chave)]
+    return {chave: antigo.get(chave) for chave in alteradas}, {chave: novo.get(chave) for chave in alteradas}
+
+
+def _linha_log(
+    entidade: str,
+    entidade_id: int,
+    acao: AcaoAuditEnum,
+    created_by: int | None,
+    old_value: dict | None,
+    new_value: dict | None,
+    programa_id: int | None,
+    auditoria_ano_id: int | None,
+) -> dict:
+    # Aceita dicts ou instâncias ORM; modelos passam pelo serializador compilado (ver serializacao).
+    old_json, new_json = para_json(old_value), para_json(new_value)
+    linha = {
+        'entidade': entidade,
+        'entidade_id': entidade_id,
+        'acao': acao,
+        'old_value': old_json,
+        'new_value': new_json,
+        'formato': FormatoAuditEnum.completo,
+        'created_by': created_by,
+        'programa_id': programa_id,
+        'auditoria_ano_id': auditoria_ano_id,
+    }
+    if settings.AUDIT_LOGS_FORMATO == FormatoAuditEnum.diff.value and old_json is not None and new_json is not None:
+        linha['old_value'], linha['new_value'] = _diferenca(old_json, new_json)
+        linha['formato'] = FormatoAuditEnum.diff
+        linha[_ESTADO_COMPLETO] = new_json
+    return linha
+
+
+def _pendentes(db: Session) -> list[dict]:
+    if not db.in_transaction():
+        # Abre a transação já aqui para que um rollback antes de qualquer SQL também descarte os logs.
+        db.begin()
+    return db.info.setdefault(_CHAVE_PENDENTES, [])
 
 
 def registrar_log(
@@ -14,16 +66,142 @@ def registrar_log(
     new_value: dict | None = None,
     programa_id: int | None = None,
     auditoria_ano_id: int | None = None,
-) -> AuditLog:
-    log = AuditLog(
-        entidade=entidade,
-        entidade_id=entidade_id,
-        acao=acao,
-        old_value=jsonable_encoder(old_value) if old_value is not None else None,
-        new_value=jsonable_encoder(new_value) if new_value is not None else None,
-        created_by=created_by,
-        programa_id=programa_id,
-        auditoria_ano_id=auditoria_ano_id,
+) -> None:
+    # Os logs ficam na sessão e são gravados num único INSERT multi-linha no commit (ver _gravar_pendentes).
+    _pendentes(db).append(
+        _linha_log(entidade, entidade_id, acao, created_by, old_value, new_value, programa_id, auditoria_ano_id)
+    )
+
+
+def registrar_logs_em_lote(
+    db: Session,
+    entidade: str,
+    acao: AcaoAuditEnum,
+    created_by: int | None,
+    registros: list[tuple[int, dict | None, dict | None]],
+    programa_id: int | None = None,
+    auditoria_ano_id: int | None = None,
+) -> int:
+    _pendentes(db).extend(
+        _linha_log(entidade, entidade_id, acao, created_by, old_value, new_value, programa_id, auditoria_ano_id)
+        for entidade_id, old_value, new_value in registros
     )
-    db.add(log)
-    return log
+    return len(registros)
+
+
+def _diffs_desde_ultimo_completo(db: Session, entidades: set[tuple[str, int]]) -> dict[tuple[str, int], int]:
+    alvo = values(column('entidade', String), column('entidade_id', Integer), name='alvo').data(sorted(entidades))
+    completo = aliased(AuditLog)
+    ultimo_completo = (
+        select(func.coalesce(func.max(completo.id), 0))
+        .where(
+            completo.entidade == alvo.c.entidade,
+            completo.entidade_id == alvo.c.entidade_id,
+            completo.formato != FormatoAuditEnum.diff,
+        )
+        .scalar_subquery()
+    )
+    diffs = (
+        select(func.count())
+        .where(
+            AuditLog.entidade == alvo.c.entidade,
+            AuditLog.entidade_id == alvo.c.entidade_id,
+            AuditLog.id > ultimo_completo,
+        )
+        .scalar_subquery()
+    )
+    return {(entidade, entidade_id): total for entidade, entidade_id, total in db.execute(select(alvo.c.entidade, alvo.c.entidade_id, diffs)).all()}
+
+
+def _promover_checkpoints(db: Session, linhas: list[dict]) -> None:
+    # A cada AUDIT_LOGS_CHECKPOINT_A_CADA diffs de uma entidade, grava o estado inteiro em new_value.
+    intervalo = settings.AUDIT_LOGS_CHECKPOINT_A_CADA
+    entidades = {(linha['entidade'], linha['entidade_id']) for linha in linhas if linha['formato'] == FormatoAuditEnum.diff}
+    if not entidades:
+        return
+    contagens = _diffs_desde_ultimo_completo(db, entidades) if intervalo > 0 else {}
+    for linha in linhas:
+        chave = (linha['entidade'], linha['entidade_id'])
+        if chave not in entidades:
+            continue
+        if linha['formato'] != FormatoAuditEnum.diff:
+            contagens[chave] = 0
+            continue
+        contagens[chave] = contagens.get(chave, 0) + 1
+        if intervalo > 0 and contagens[chave] >= intervalo:
+            linha['formato'] = FormatoAuditEnum.checkpoint
+            linha['new_value'] = linha[_ESTADO_COMPLETO]
+            contagens[chave] = 0
+
+
+def gravar_logs_pendentes(db: Session) -> int:
+    linhas = db.info.pop(_CHAVE_PENDENTES, None)
+    if not linhas:
+        return 0
+    _promover_checkpoints(db, linhas)
+    for linha in linhas:
+        linha.pop(_ESTADO_COMPLETO, None)
+    # executemany com insertmanyvalues: o psycopg envia lotes de INSERT ... VALUES (...), (...).
+    db.execute(insert(AuditLog), linhas)
+    return len(linhas)
+
+
+def reconstruir_estado(db: Session, log_id: int) -> dict:
+    log = db.scalar(select(AuditLog).where(AuditLog.id == log_id))
+    if not log:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Log não encontrado.')
+
+    mesma_entidade = (AuditLog.entidade == log.entidade, AuditLog.entidade_id == log.entidade_id)
+    base = db.scalar(
+        select(AuditLog)
+        .where(*mesma_entidade, AuditLog.id <= log.id, AuditLog.formato != FormatoAuditEnum.diff)
+        .order_by(AuditLog.id.desc())
+        .limit(1)
+    )
+    if not base:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail='Não há registro completo anterior a este log; o estado não pode ser reconstruído.',
+        )
+
+    # Estado após a base: new_value inteiro (CREATE/UPDATE completo/checkpoint); após um DELETE, nenhum.
+    estado = dict(base.new_value) if base.new_value is not None else None
+    diffs = list(
+        db.scalars(
+            select(AuditLog)
+            .where(*mesma_entidade, AuditLog.id > base.id, AuditLog.id <= log.id)
+            .order_by(AuditLog.id)
+        ).all()
+    )
+    for diff in diffs:
+        estado = {**(estado or {}), **(diff.new_value or {})}
+
+    if log.formato == FormatoAuditEnum.completo:
+        estado_anterior = log.old_value
+    elif estado is not None:
+        estado_anterior = {**estado, **(log.old_value or {})}
+    else:
+        estado_anterior = None
+    if log.acao == AcaoAuditEnum.DELETE:
+        estado = None
+
+    return {
+        'log_id': log.id,
+        'entidade': log.entidade,
+        'entidade_id': log.entidade_id,
+        'acao': log.acao,
+        'estado_anterior': estado_anterior,
+        'estado': estado,
+        'base_log_id': base.id,
+        'diffs_aplicados': len(diffs),
+    }
+
+
+def _descartar_pendentes(session: Session) -> None:
+    session.info.pop(_CHAVE_PENDENTES, None)
+
+
+# Ouvinte na classe Session (e não só em SessionLocal): nenhuma sessão pode commitar e perder logs pendentes.
+# O INSERT roda antes do COMMIT, na mesma transação da alteração registrada.
+event.listen(Session, 'before_commit', gravar_logs_pendentes)
+event.listen(Session, 'after_rollback', _descartar_pendentes)
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.auditlog import AcaoAuditEnum
+from app.models.fsc import AuditoriaAno, AvaliacaoIndicador, Indicador, StatusConformidadeEnum
+from app.services.audit_logger import registrar_logs_em_lote
+from app.services.cache_relatorios import marcar_auditoria_alterada
+from app.services.contadores_conformidade import ajustar_contadores
+
+
+def gerar_avaliacoes_em_lote(db: Session, auditoria: AuditoriaAno, created_by: int | None) -> tuple[int, int]:
+    tabela = AvaliacaoIndicador.__table__
+    indicadores = (
+        select(
+            literal(auditoria.programa_id, type_=tabela.c.programa_id.type),
+            Indicador.id,
+            literal(auditoria.id, type_=tabela.c.auditoria_ano_id.type),
+            literal(StatusConformidadeEnum.conforme, type_=tabela.c.status_conformidade.type),
+            literal(datetime.now(UTC), type_=tabela.c.assessed_at.type),
+        )
+        .where(Indicador.programa_id == auditoria.programa_id)
+        .order_by(Indicador.id)
+    )
+    # ON CONFLICT torna a geração idempotente mesmo com duas requisições simultâneas para a mesma auditoria.
+    stmt = (
+        insert(tabela)
+        .from_select(
+            ['programa_id', 'indicator_id', 'auditoria_ano_id', 'status_conformidade', 'assessed_at'],
+            indicadores,
+        )
+        .on_conflict_do_nothing(index_elements=['indicator_id', 'auditoria_ano_id'])
+        .returning(*tabela.c)
+    )
+    criadas = [dict(row._mapping) for row in db.execute(stmt).all()]
+    if criadas:
+        marcar_auditoria_alterada(db, auditoria.id)
+        ajustar_contadores(db, [int(row['id']) for row in criadas], 1)
+
+    registrar_logs_em_lote(
+        db,
+        entidade='avaliacao',
+        acao=AcaoAuditEnum.CREATE,
+        created_by=created_by,
+        registros=[(int(row['id']), None, row) for row in criadas],
+        programa_id=auditoria.programa_id,
+        auditoria_ano_id=auditoria.id,
+    )
+
+    total_indicadores = int(
+        db.scalar(select(func.count(Indicador.id)).where(Indicador.programa_id == auditoria.programa_id)) or 0
+    )
+    return len(criadas), max(total_indicadores - len(criadas), 0)
@@ -0,0 +1,126 @@
+import re
+from typing import Any
+
+from sqlalchemy import Integer, Select, String, cast, func, literal, null, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.models.fsc import Criterio, Indicador, Principio
+
+# Configuração criada pela migração 0018 (portuguese + unaccent).
+CONFIG_BUSCA = 'pt_unaccent'
+MAX_TERMOS = 8
+# Palavras e códigos com pontos (ex.: "1.2.3"); o restante da entrada é descartado.
+_TERMO = re.compile(r'\w+(?:\.\w+)*')
+
+
+def consulta_busca(termo: str | None):
+    # Todas as palavras precisam aparecer, cada uma como prefixo ("certifica" encontra "certificação").
+    termos = _TERMO.findall(termo or '')[:MAX_TERMOS]
+    if not termos:
+        return None
+    return func.to_tsquery(cast(CONFIG_BUSCA, REGCONFIG), ' & '.join(f'{palavra}:*' for palavra in termos))
+
+
+def relevancia(modelo, consulta):
+    return func.ts_rank_cd(modelo.busca, consulta)
+
+
+def filtrar_por_busca(query: Select, modelo, termo: str | None) -> Select:
+    consulta = consulta_busca(termo)
+    if consulta is None:
+        return query
+    return (
+        query.where(modelo.busca.op('@@')(consulta))
+        .order_by(None)
+        .order_by(relevancia(modelo, consulta).desc(), modelo.id)
+    )
+
+
+def _sem_pai(pai: str):
+    # Rótulos explícitos: a primeira parte do UNION define as colunas do resultado.
+    return (
+        null().cast(Integer).label(f'{pai}_id'),
+        null().cast(String).label(f'{pai}_codigo'),
+        null().cast(String).label(f'{pai}_titulo'),
+    )
+
+
+def buscar_no_catalogo(db: Session, termo: str, programa_id: int | None, limite: int) -> list[dict[str, Any]]:
+    consulta = consulta_busca(termo)
+    if consulta is None:
+        return []
+
+    principios = select(
+        literal('principio').label('tipo'),
+        Principio.id,
+        Principio.programa_id,
+        Principio.codigo,
+        Principio.titulo,
+        relevancia(Principio, consulta).label('relevancia'),
+        *_sem_pai('principio'),
+        *_sem_pai('criterio'),
+    ).where(Principio.busca.op('@@')(consulta))
+    criterios = (
+        select(
+            literal('criterio'),
+            Criterio.id,
+            Criterio.programa_id,
+            Criterio.codigo,
+            Criterio.titulo,
+            relevancia(Criterio, consulta),
+            Principio.id,
+            Principio.codigo,
+            Principio.titulo,
+            *_sem_pai('criterio'),
+        )
+        .join(Principio, Principio.id == Criterio.principio_id)
+        .where(Criterio.busca.op('@@')(consulta))
+    )
+    indicadores = (
+        select(
+            literal('indicador'),
+            Indicador.id,
+            Indicador.programa_id,
+            Indicador.codigo,
+            Indicador.titulo,
+            relevancia(Indicador, consulta),
+            Principio.id,
+            Principio.codigo,
+            Principio.titulo,
+            Criterio.id,
+            Criterio.codigo,
+            Criterio.titulo,
+        )
+        .join(Criterio, Criterio.id == Indicador.criterio_id)
+        .join(Principio, Principio.id == Criterio.principio_id)
+        .where(Indicador.busca.op('@@')(consulta))
+    )
+    if programa_id:
+        principios = principios.where(Principio.programa_id == programa_id)
+        criterios = criterios.where(Criterio.programa_id == programa_id)
+        indicadores = indicadores.where(Indicador.programa_id == programa_id)
+
+    resultados = union_all(principios, criterios, indicadores).subquery()
+    linhas = db.execute(
+        select(resultados).order_by(resultados.c.relevancia.desc(), resultados.c.tipo, resultados.c.id).limit(limite)
+    ).all()
+
+    itens = []
+    for tipo, item_id, item_programa_id, codigo, titulo, rank, *pais in linhas:
+        caminho = []
+        for tipo_pai, (pai_id, pai_codigo, pai_titulo) in (('principio', pais[0:3]), ('criterio', pais[3:6])):
+            if pai_id is not None:
+                caminho.append({'tipo': tipo_pai, 'id': pai_id, 'codigo': pai_codigo, 'titulo': pai_titulo})
+        itens.append(
+            {
+                'tipo': tipo,
+                'id': item_id,
+                'programa_id': item_programa_id,
+                'codigo': codigo,
+                'titulo': titulo,
+                'relevancia': float(rank),
+                'caminho': caminho,
+            }
+        )
+    return itens
@@ -0,0 +1,72 @@
+import html
+import re
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.fsc import DocumentoEvidencia
+
+# Janela do trecho em caracteres, começando um pouco antes da primeira ocorrência do termo no conteúdo.
+_TAMANHO_TRECHO = 200
+_CONTEXTO_ANTES = 60
+
+
+def _padrao_like(termo: str) -> str:
+    # % e _ do termo são literais: a busca e o destaque tratam o termo como substring simples.
+    escapado = termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escapado}%'
+
+
+def filtro_texto_documentos(termo: str):
+    # Sem lower(): ILIKE é atendido direto pelos índices gin_trgm_ops (migração 0019).
+    padrao = _padrao_like(termo)
+    return or_(
+        DocumentoEvidencia.titulo.ilike(padrao, escape='\\'),
+        DocumentoEvidencia.conteudo.ilike(padrao, escape='\\'),
+    )
+
+
+def _destacar(texto: str, termo: str) -> str:
+    # Mesmo critério do filtro (substring sem diferenciar maiúsculas); o texto fora do <mark> sai escapado.
+    if not termo:
+        return html.escape(texto, quote=False)
+    partes = []
+    posicao = 0
+    for ocorrencia in re.finditer(re.escape(termo), texto, re.IGNORECASE):
+        partes.append(html.escape(texto[posicao:ocorrencia.start()], quote=False))
+        partes.append(f'<mark>{html.escape(ocorrencia.group(0), quote=False)}</mark>')
+        posicao = ocorrencia.end()
+    partes.append(html.escape(texto[posicao:], quote=False))
+    return ''.join(partes)
+
+
+def trechos_documentos(db: Session, documento_ids: list[int], termo: str) -> dict[int, tuple[str, str | None]]:
+    # Roda só para a página já selecionada; do conteúdo sai apenas a janela em volta da primeira ocorrência.
+    if not documento_ids:
+        return {}
+    posicao = func.strpos(func.lower(DocumentoEvidencia.conteudo), func.lower(termo))
+    inicio = func.greatest(posicao - _CONTEXTO_ANTES, 1)
+    linhas = db.execute(
+        select(
+            DocumentoEvidencia.id,
+            DocumentoEvidencia.titulo,
+            func.substr(DocumentoEvidencia.conteudo, inicio, _TAMANHO_TRECHO + len(termo)),
+            inicio,
+            func.length(DocumentoEvidencia.conteudo),
+        ).where(DocumentoEvidencia.id.in_(documento_ids))
+    ).all()
+
+    trechos: dict[int, tuple[str, str | None]] = {}
+    for documento_id, titulo, janela, inicio_janela, tamanho in linhas:
+        trecho = None
+        if janela is not None:
+            cortado_antes = inicio_janela > 1
+            cortado_depois = inicio_janela - 1 + len(janela) < tamanho
+            trecho = _destacar(janela.lstrip() if cortado_antes else janela, termo)
+            trecho = trecho.rstrip() if cortado_depois else trecho
+            if cortado_antes:
+                trecho = f'… {trecho}'
+            if cortado_depois:
+                trecho = f'{trecho} …'
+        trechos[documento_id] = (_destacar(titulo, termo), trecho)
+    return trechos
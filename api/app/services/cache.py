@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_AUSENTE = object()
+
+
+class CacheTTL:
+    def __init__(self, ttl_segundos: float, max_itens: int) -> None:
+        self.ttl_segundos = ttl_segundos
+        self.max_itens = max_itens
+        self._itens: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        with self._lock:
+            item = self._itens.get(chave, _AUSENTE)
+            if item is _AUSENTE:
+                return padrao
+            expira_em, valor = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return padrao
+            self._itens.move_to_end(chave)
+            return valor
+
+    def definir(self, chave: Hashable, valor: Any) -> None:
+        if self.ttl_segundos <= 0 or self.max_itens <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def remover(self, chave: Hashable) -> None:
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def remover_onde(self, predicado: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for chave in [chave for chave in self._itens if predicado(chave)]:
+                del self._itens[chave]
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
@@ -0,0 +1,86 @@
+from collections.abc import Hashable
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.fsc import AuditoriaAno, AvaliacaoIndicador, Criterio, Demanda, Evidencia, Indicador, Principio
+from app.services.cache import CacheTTL
+
+settings = get_settings()
+
+# Chaves no formato (relatorio, programa_id, auditoria_id, *parametros). O cache é por processo:
+# a invalidação abaixo só alcança o worker que fez o commit, e o TTL limita o atraso nos demais.
+cache_relatorios = CacheTTL(settings.REPORTS_CACHE_TTL_SECONDS, settings.REPORTS_CACHE_MAX_ITENS)
+
+_CHAVE_AUDITORIAS = 'relatorios_auditorias_alteradas'
+_CHAVE_PROGRAMAS = 'relatorios_programas_alterados'
+
+
+def obter_relatorio(chave: tuple[Hashable, ...]) -> Any:
+    return cache_relatorios.obter(chave)
+
+
+def guardar_relatorio(chave: tuple[Hashable, ...], valor: Any) -> None:
+    cache_relatorios.definir(chave, valor)
+
+
+def invalidar_relatorios(
+    auditoria_ids: set[int] | None = None,
+    programa_ids: set[int] | None = None,
+) -> None:
+    auditoria_ids = auditoria_ids or set()
+    programa_ids = programa_ids or set()
+    if not auditoria_ids and not programa_ids:
+        return
+    cache_relatorios.remover_onde(lambda chave: chave[1] in programa_ids or chave[2] in auditoria_ids)
+
+
+def marcar_auditoria_alterada(db: Session, auditoria_id: int) -> None:
+    # Necessário para escritas feitas com insert/update do Core, que não passam pelo before_flush.
+    db.info.setdefault(_CHAVE_AUDITORIAS, set()).add(auditoria_id)
+
+
+def _valores_atributo(obj: object, atributo: str) -> set[int]:
+    historico = inspect(obj).attrs[atributo].history
+    valores = {*historico.added, *historico.unchanged, *historico.deleted}
+    return {int(valor) for valor in valores if valor is not None}
+
+
+def _coletar_alteracoes(session: Session, flush_context, instances) -> None:
+    auditorias: set[int] = session.info.setdefault(_CHAVE_AUDITORIAS, set())
+    programas: set[int] = session.info.setdefault(_CHAVE_PROGRAMAS, set())
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, AvaliacaoIndicador):
+            auditorias.update(_valores_atributo(obj, 'auditoria_ano_id'))
+        elif isinstance(obj, (Evidencia, Demanda)):
+            avaliacao_ids = _valores_atributo(obj, 'avaliacao_id')
+            if obj.avaliacao is not None and obj.avaliacao.auditoria_ano_id is not None:
+                auditorias.add(obj.avaliacao.auditoria_ano_id)
+                avaliacao_ids.discard(obj.avaliacao.id)
+            for avaliacao_id in avaliacao_ids:
+                with session.no_autoflush:
+                    avaliacao = session.get(AvaliacaoIndicador, avaliacao_id)
+                if avaliacao is not None:
+                    auditorias.add(avaliacao.auditoria_ano_id)
+        elif isinstance(obj, AuditoriaAno) and obj.id is not None:
+            auditorias.add(obj.id)
+        elif isinstance(obj, (Principio, Criterio, Indicador)):
+            programas.update(_valores_atributo(obj, 'programa_id'))
+
+
+def _aplicar_invalidacao(session: Session) -> None:
+    invalidar_relatorios(session.info.pop(_CHAVE_AUDITORIAS, None), session.info.pop(_CHAVE_PROGRAMAS, None))
+
+
+def _descartar_alteracoes(session: Session) -> None:
+    session.info.pop(_CHAVE_AUDITORIAS, None)
+    session.info.pop(_CHAVE_PROGRAMAS, None)
+
+
+event.listen(SessionLocal, 'before_flush', _coletar_alteracoes)
+event.listen(SessionLocal, 'after_commit', _aplicar_invalidacao)
+event.listen(SessionLocal, 'after_rollback', _descartar_alteracoes)
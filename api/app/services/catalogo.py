@@ -0,0 +1,119 @@
+import hashlib
+
+from sqlalchemy import event, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.fsc import Criterio, EvidenceType, Indicador, Principio, ProgramaCertificacao
+from app.schemas.fsc import CatalogoProgramaOut
+from app.services.cache import CacheTTL
+
+settings = get_settings()
+
+# Chave (programa_id, catalogo_versao) -> (etag, corpo JSON). Como a versão vem do banco, um worker nunca
+# serve uma árvore anterior ao último commit; versões antigas saem pelo LRU/TTL.
+cache_catalogo = CacheTTL(settings.CATALOGO_CACHE_TTL_SECONDS, settings.CATALOGO_CACHE_MAX_ITENS)
+
+_CHAVE_PROGRAMAS = 'catalogo_programas_alterados'
+_MODELOS_CATALOGO = (Principio, Criterio, Indicador, EvidenceType)
+
+_TIPO_JSON = """json_build_object(
+    'id', t.id, 'programa_id', t.programa_id, 'criterio_id', t.criterio_id, 'indicador_id', t.indicador_id,
+    'nome', t.nome, 'descricao', t.descricao, 'status_conformidade', t.status_conformidade
+)"""
+
+# A árvore inteira sai de uma consulta; cada nível usa o índice da FK do nível de cima.
+_SQL_ARVORE = text(
+    f"""
+    SELECT json_build_object(
+        'principios', COALESCE((
+            SELECT json_agg(json_build_object(
+                'id', p.id, 'programa_id', p.programa_id, 'codigo', p.codigo, 'titulo', p.titulo,
+                'descricao', p.descricao, 'created_at', p.created_at,
+                'criterios', COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', c.id, 'programa_id', c.programa_id, 'principio_id', c.principio_id,
+                        'codigo', c.codigo, 'titulo', c.titulo, 'descricao', c.descricao,
+                        'indicadores', COALESCE((
+                            SELECT json_agg(json_build_object(
+                                'id', i.id, 'programa_id', i.programa_id, 'criterio_id', i.criterio_id,
+                                'codigo', i.codigo, 'titulo', i.titulo, 'descricao', i.descricao,
+                                'tipos_evidencia', COALESCE((
+                                    SELECT json_agg({_TIPO_JSON} ORDER BY t.id)
+                                    FROM tipos_evidencia t WHERE t.indicador_id = i.id
+                                ), '[]'::json)
+                            ) ORDER BY i.id)
+                            FROM indicadores i WHERE i.criterio_id = c.id
+                        ), '[]'::json),
+                        'tipos_evidencia', COALESCE((
+                            SELECT json_agg({_TIPO_JSON} ORDER BY t.id)
+                            FROM tipos_evidencia t WHERE t.criterio_id = c.id AND t.indicador_id IS NULL
+                        ), '[]'::json)
+                    ) ORDER BY c.id)
+                    FROM criterios c WHERE c.principio_id = p.id
+                ), '[]'::json)
+            ) ORDER BY p.id)
+            FROM principios p WHERE p.programa_id = :programa_id
+        ), '[]'::json),
+        'tipos_evidencia', COALESCE((
+            SELECT json_agg({_TIPO_JSON} ORDER BY t.id)
+            FROM tipos_evidencia t
+            WHERE t.programa_id = :programa_id AND t.criterio_id IS NULL AND t.indicador_id IS NULL
+        ), '[]'::json)
+    )
+    """
+)
+
+
+def versao_catalogo(db: Session, programa_id: int) -> int | None:
+    return db.scalar(select(ProgramaCertificacao.catalogo_versao).where(ProgramaCertificacao.id == programa_id))
+
+
+def obter_catalogo(db: Session, programa_id: int, versao: int) -> tuple[str, bytes]:
+    chave = (programa_id, versao)
+    em_cache = cache_catalogo.obter(chave)
+    if em_cache is not None:
+        return em_cache
+
+    arvore = db.scalar(_SQL_ARVORE, {'programa_id': programa_id})
+    corpo = CatalogoProgramaOut.model_validate({'programa_id': programa_id, 'versao': versao, **arvore}).model_dump_json()
+    dados = corpo.encode('utf-8')
+    # O hash entra no ETag para que uma mudança no formato da resposta (deploy) não reaproveite o do cliente.
+    etag = f'"catalogo-{programa_id}-{versao}-{hashlib.sha1(dados).hexdigest()[:12]}"'
+    cache_catalogo.definir(chave, (etag, dados))
+    return etag, dados
+
+
+def incrementar_versao_catalogo(db: Session, programa_ids: set[int]) -> None:
+    # Também usado por escritas do Core (seed), que não passam pelo before_flush.
+    if programa_ids:
+        db.execute(
+            update(ProgramaCertificacao)
+            .where(ProgramaCertificacao.id.in_(sorted(programa_ids)))
+            .values(catalogo_versao=ProgramaCertificacao.catalogo_versao + 1)
+        )
+
+
+def _coletar_programas(session: Session, flush_context, instances) -> None:
+    programas: set[int] = session.info.setdefault(_CHAVE_PROGRAMAS, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, _MODELOS_CATALOGO) or (obj in session.dirty and not session.is_modified(obj)):
+            continue
+        historico = inspect(obj).attrs['programa_id'].history
+        programas.update(int(valor) for valor in (*historico.added, *historico.unchanged, *historico.deleted) if valor)
+
+
+def _aplicar_versao(session: Session) -> None:
+    # O flush final do commit só acontece depois deste evento: descarrega antes para coletar tudo.
+    session.flush()
+    incrementar_versao_catalogo(session, session.info.pop(_CHAVE_PROGRAMAS, set()))
+
+
+def _descartar_programas(session: Session) -> None:
+    session.info.pop(_CHAVE_PROGRAMAS, None)
+
+
+event.listen(SessionLocal, 'before_flush', _coletar_programas)
+event.listen(SessionLocal, 'before_commit', _aplicar_versao)
+event.listen(SessionLocal, 'after_rollback', _descartar_programas)
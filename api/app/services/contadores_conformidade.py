@@ -0,0 +1,61 @@
+from collections.abc import Iterable
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.fsc import AuditoriaAno, AvaliacaoIndicador, ContadorConformidade, Criterio, Indicador
+
+_COLUNAS = ['auditoria_ano_id', 'principio_id', 'status_conformidade', 'quantidade']
+
+
+def _contagem_avaliacoes(quantidade):
+    return (
+        select(
+            AvaliacaoIndicador.auditoria_ano_id,
+            Criterio.principio_id,
+            AvaliacaoIndicador.status_conformidade,
+            quantidade,
+        )
+        .join(Indicador, Indicador.id == AvaliacaoIndicador.indicator_id)
+        .join(Criterio, Criterio.id == Indicador.criterio_id)
+        .group_by(AvaliacaoIndicador.auditoria_ano_id, Criterio.principio_id, AvaliacaoIndicador.status_conformidade)
+    )
+
+
+def ajustar_contadores(db: Session, avaliacao_ids: Iterable[int], delta: int) -> None:
+    # Lê o estado das avaliações no banco: use -1 antes do flush/delete e +1 depois do flush.
+    ids = sorted(set(avaliacao_ids))
+    if not ids:
+        return
+
+    if delta < 0:
+        # Trava as avaliações para que duas edições simultâneas não descontem o mesmo status duas vezes.
+        db.execute(select(AvaliacaoIndicador.id).where(AvaliacaoIndicador.id.in_(ids)).with_for_update())
+
+    tabela = ContadorConformidade.__table__
+    origem = _contagem_avaliacoes(func.count() * literal(delta)).where(AvaliacaoIndicador.id.in_(ids))
+    stmt = insert(tabela).from_select(_COLUNAS, origem)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['auditoria_ano_id', 'principio_id', 'status_conformidade'],
+        set_={'quantidade': tabela.c.quantidade + stmt.excluded.quantidade},
+    )
+    db.execute(stmt)
+
+
+def reconstruir_contadores(
+    db: Session,
+    auditoria_id: int | None = None,
+    programa_id: int | None = None,
+) -> int:
+    auditorias = select(AuditoriaAno.id)
+    if auditoria_id is not None:
+        auditorias = auditorias.where(AuditoriaAno.id == auditoria_id)
+    if programa_id is not None:
+        auditorias = auditorias.where(AuditoriaAno.programa_id == programa_id)
+
+    db.execute(delete(ContadorConformidade).where(ContadorConformidade.auditoria_ano_id.in_(auditorias)))
+    origem = _contagem_avaliacoes(func.count()).where(AvaliacaoIndicador.auditoria_ano_id.in_(auditorias))
+    tabela = ContadorConformidade.__table__
+    stmt = insert(tabela).from_select(_COLUNAS, origem).returning(tabela.c.auditoria_ano_id)
+    return len(db.execute(stmt).all())
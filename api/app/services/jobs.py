@@ -0,0 +1,234 @@
+import signal
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.job import Job, StatusJobEnum
+from app.services.serializacao import para_json
+
+settings = get_settings()
+
+Progresso = Callable[..., None]
+Tarefa = Callable[[Session, dict[str, Any], Progresso], dict[str, Any] | None]
+
+_TAREFAS: dict[str, Tarefa] = {}
+_TENTATIVAS_ATUALIZACAO = 3
+
+
+class ErroDefinitivoJob(Exception):
+    # Falha que não melhora com nova tentativa (ex.: registro removido); o job falha na hora.
+    pass
+
+
+def tarefa(tipo: str) -> Callable[[Tarefa], Tarefa]:
+    def registrar(funcao: Tarefa) -> Tarefa:
+        _TAREFAS[tipo] = funcao
+        return funcao
+
+    return registrar
+
+
+def enfileirar_job(db: Session, tipo: str, parametros: dict[str, Any], created_by: int | None) -> Job:
+    # O job só fica visível para o worker no commit de quem enfileirou.
+    if tipo not in _TAREFAS:
+        raise ValueError(f'Tipo de job não registrado: {tipo}')
+    job = Job(
+        tipo=tipo,
+        parametros=parametros,
+        created_by=created_by,
+        max_tentativas=max(settings.JOBS_MAX_TENTATIVAS, 1),
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _atualizar_job(job_id: int, **valores: Any) -> None:
+    # Sessão própria com commit imediato: o polling enxerga o estado antes do fim da transação do job.
+    # Poucas tentativas curtas: uma queda de conexão não pode deixar um job já executado sem status final.
+    for tentativa in range(1, _TENTATIVAS_ATUALIZACAO + 1):
+        try:
+            with SessionLocal() as db:
+                db.execute(update(Job).where(Job.id == job_id).values(**valores))
+                db.commit()
+            return
+        except Exception:
+            if tentativa == _TENTATIVAS_ATUALIZACAO:
+                raise
+            time.sleep(tentativa)
+
+
+def _progresso_do_job(job_id: int) -> Progresso:
+    def reportar(percentual: int, mensagem: str | None = None) -> None:
+        _atualizar_job(
+            job_id,
+            progresso=min(max(int(percentual), 0), 100),
+            mensagem=mensagem[:255] if mensagem else None,
+            heartbeat_em=func.now(),
+        )
+
+    return reportar
+
+
+def reivindicar_job(db: Session) -> Job | None:
+    # SKIP LOCKED: vários workers disputam a fila sem bloquear uns aos outros nem pegar o mesmo job.
+    proximo = (
+        select(Job.id)
+        .where(Job.status == StatusJobEnum.pendente, Job.executar_apos <= func.now())
+        .order_by(Job.executar_apos, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job = db.scalar(
+        update(Job)
+        .where(Job.id == proximo)
+        .values(
+            status=StatusJobEnum.executando,
+            tentativas=Job.tentativas + 1,
+            iniciado_em=func.now(),
+            heartbeat_em=func.now(),
+        )
+        .returning(Job)
+    )
+    db.commit()
+    return job
+
+
+def recuperar_jobs_travados(db: Session) -> int:
+    # Worker que morreu no meio: o heartbeat para e o job volta para a fila (ou falha sem tentativas restantes).
+    limite = func.now() - timedelta(seconds=settings.JOBS_TIMEOUT_SECONDS)
+    travado = (Job.status == StatusJobEnum.executando, Job.heartbeat_em < limite)
+    esgotados = db.execute(
+        update(Job)
+        .where(*travado, Job.tentativas >= Job.max_tentativas)
+        .values(
+            status=StatusJobEnum.falhou,
+            erro='Execução interrompida sem heartbeat e sem tentativas restantes.',
+            concluido_em=func.now(),
+        )
+    ).rowcount
+    reenfileirados = db.execute(
+        update(Job).where(*travado).values(status=StatusJobEnum.pendente, executar_apos=func.now())
+    ).rowcount
+    db.commit()
+    return int(esgotados or 0) + int(reenfileirados or 0)
+
+
+def _espera_nova_tentativa(tentativa: int) -> float:
+    return min(30 * 2 ** (tentativa - 1), settings.JOBS_BACKOFF_MAX_SECONDS)
+
+
+def _registrar_falha(job: Job, exc: Exception) -> None:
+    erro = ''.join(traceback.format_exception_only(exc)).strip()
+    if isinstance(exc, ErroDefinitivoJob) or job.tentativas >= job.max_tentativas:
+        _atualizar_job(job.id, status=StatusJobEnum.falhou, erro=erro, concluido_em=func.now())
+        return
+    _atualizar_job(
+        job.id,
+        status=StatusJobEnum.pendente,
+        erro=erro,
+        executar_apos=func.now() + timedelta(seconds=_espera_nova_tentativa(job.tentativas)),
+    )
+
+
+def _manter_heartbeat(job_id: int, parar: threading.Event) -> None:
+    # Etapas longas sem progresso (um único INSERT ... SELECT, cascatas do ORM) não podem parecer travadas.
+    intervalo = max(settings.JOBS_TIMEOUT_SECONDS / 3, 1)
+    while not parar.wait(intervalo):
+        try:
+            _atualizar_job(job_id, heartbeat_em=func.now())
+        except Exception as exc:
+            print(f'Aviso: falha ao atualizar heartbeat do job {job_id}. Erro: {exc}')
+
+
+def executar_job(job: Job) -> bool:
+    funcao = _TAREFAS.get(job.tipo)
+    parar_heartbeat = threading.Event()
+    heartbeat = threading.Thread(target=_manter_heartbeat, args=(job.id, parar_heartbeat), daemon=True)
+    heartbeat.start()
+    try:
+        with SessionLocal() as db:
+            try:
+                if funcao is None:
+                    raise ErroDefinitivoJob(f'Tipo de job não registrado: {job.tipo}')
+                resultado = funcao(db, dict(job.parametros or {}), _progresso_do_job(job.id))
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                _registrar_falha(job, exc)
+                return False
+    finally:
+        parar_heartbeat.set()
+        heartbeat.join()
+
+    _atualizar_job(
+        job.id,
+        status=StatusJobEnum.concluido,
+        progresso=100,
+        resultado=para_json(resultado),
+        erro=None,
+        concluido_em=func.now(),
+    )
+    return True
+
+
+def _espera_erro_worker(falhas_seguidas: int) -> float:
+    return min(2 ** (falhas_seguidas - 1), settings.JOBS_BACKOFF_MAX_SECONDS)
+
+
+def executar_worker(intervalo: float, uma_vez: bool = False) -> int:
+    # uma_vez: processa o que está disponível e encerra (útil em cron e testes).
+    parar = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sinal in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sinal, lambda *_: parar.set())
+
+    processados = 0
+    falhas_seguidas = 0
+    proxima_recuperacao = 0.0
+    while not parar.is_set():
+        job = None
+        try:
+            if time.monotonic() >= proxima_recuperacao:
+                with SessionLocal() as db:
+                    recuperados = recuperar_jobs_travados(db)
+                if recuperados:
+                    print(f'{recuperados} job(s) sem heartbeat recuperado(s).')
+                proxima_recuperacao = time.monotonic() + 60
+
+            with SessionLocal() as db:
+                job = reivindicar_job(db)
+            if job is not None:
+                inicio = time.perf_counter()
+                sucesso = executar_job(job)
+                processados += 1
+                print(
+                    f'Job {job.id} ({job.tipo}) tentativa {job.tentativas}: '
+                    f'{"concluído" if sucesso else "falhou"} em {(time.perf_counter() - inicio) * 1000:.0f} ms.'
+                )
+        except Exception as exc:
+            # Banco fora do ar ou conexão derrubada: o worker espera e tenta de novo em vez de morrer.
+            # Um job que ficou em execução volta para a fila por recuperar_jobs_travados.
+            if uma_vez:
+                raise
+            falhas_seguidas += 1
+            espera = _espera_erro_worker(falhas_seguidas)
+            print(f'Aviso: falha no worker de jobs ({falhas_seguidas} seguida(s)). Nova tentativa em {espera:.0f} s. Erro: {exc}')
+            parar.wait(espera)
+            continue
+
+        falhas_seguidas = 0
+        if job is None:
+            if uma_vez:
+                break
+            parar.wait(intervalo)
+    return processados
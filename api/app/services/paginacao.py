@@ -0,0 +1,128 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import ColumnElement, Select, and_, false, func, or_, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 500
+
+
+@dataclass(frozen=True)
+class ChaveOrdenacao:
+    coluna: InstrumentedAttribute | ColumnElement
+    decrescente: bool = False
+    nulos_no_fim: bool = False
+
+    def ordem(self):
+        expressao = self.coluna.desc() if self.decrescente else self.coluna.asc()
+        return expressao.nulls_last() if self.nulos_no_fim else expressao
+
+    def depois_de(self, valor: Any):
+        if valor is None:
+            # NULLS LAST: nada vem depois de um valor nulo nesta coluna.
+            return false()
+        comparacao = self.coluna < valor if self.decrescente else self.coluna > valor
+        return or_(comparacao, self.coluna.is_(None)) if self.nulos_no_fim else comparacao
+
+    def igual_a(self, valor: Any):
+        return self.coluna.is_(None) if valor is None else self.coluna == valor
+
+
+@dataclass(frozen=True)
+class Paginacao:
+    limit: int | None
+    cursor: str | None
+    incluir_total: bool
+
+    @property
+    def ativa(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+
+def parametros_paginacao(
+    limit: int | None = Query(default=None, ge=1, le=LIMITE_MAXIMO),
+    cursor: str | None = Query(default=None),
+    incluir_total: bool = Query(default=False),
+) -> Paginacao:
+    return Paginacao(limit=limit, cursor=cursor, incluir_total=incluir_total)
+
+
+def _codificar_cursor(valores: list[Any]) -> str:
+    bruto = json.dumps(jsonable_encoder(valores), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(bruto).decode('ascii').rstrip('=')
+
+
+def _converter_valor(chave: ChaveOrdenacao, valor: Any) -> Any:
+    if valor is None:
+        return None
+    tipo = chave.coluna.type.python_type
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    if tipo is int:
+        if isinstance(valor, bool) or not isinstance(valor, int):
+            raise ValueError(valor)
+        return valor
+    return tipo(valor)
+
+
+def _decodificar_cursor(cursor: str, chaves: list[ChaveOrdenacao]) -> list[Any]:
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valores = json.loads(bruto)
+        if not isinstance(valores, list) or len(valores) != len(chaves):
+            raise ValueError(cursor)
+        return [_converter_valor(chave, valor) for chave, valor in zip(chaves, valores)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Cursor de paginação inválido.')
+
+
+def _filtro_apos(chaves: list[ChaveOrdenacao], valores: list[Any]):
+    condicoes = []
+    for indice, chave in enumerate(chaves):
+        anteriores = [chaves[i].igual_a(valores[i]) for i in range(indice)]
+        condicoes.append(and_(*anteriores, chave.depois_de(valores[indice])))
+    return or_(*condicoes)
+
+
+def ordenar(query: Select, chaves: list[ChaveOrdenacao]) -> Select:
+    return query.order_by(*(chave.ordem() for chave in chaves))
+
+
+def paginar(
+    db: Session,
+    query: Select,
+    chaves: list[ChaveOrdenacao],
+    paginacao: Paginacao,
+    response: Response,
+    escalares: bool = True,
+) -> list[Any]:
+    # A última chave precisa ser única (normalmente o id) para o cursor não pular nem repetir linhas.
+    # escalares=False devolve Rows; as chaves então devem ser colunas do select (ex.: de um subquery).
+    def buscar(consulta: Select) -> list[Any]:
+        return list(db.scalars(consulta).all()) if escalares else list(db.execute(consulta).all())
+
+    if paginacao.incluir_total:
+        total = db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        response.headers['X-Total-Count'] = str(int(total or 0))
+
+    query = ordenar(query, chaves)
+    if not paginacao.ativa:
+        return buscar(query)
+
+    if paginacao.cursor:
+        query = query.where(_filtro_apos(chaves, _decodificar_cursor(paginacao.cursor, chaves)))
+    limite = paginacao.limit or LIMITE_PADRAO
+    itens = buscar(query.limit(limite + 1))
+    if len(itens) > limite:
+        itens = itens[:limite]
+        ultimo = itens[-1]
+        response.headers['X-Next-Cursor'] = _codificar_cursor([getattr(ultimo, chave.coluna.key) for chave in chaves])
+    return itens
@@ -0,0 +1,141 @@
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+
+settings = get_settings()
+
+# Chave do pg_try_advisory_xact_lock: só um worker por vez mexe nas partições.
+CHAVE_LOCK_PARTICOES = 7240312
+PARTICAO = re.compile(r'^audit_logs_p(\d{4})(\d{2})$')
+# Recebe o que não tem partição mensal (manutenção parada); criar_particoes_futuras esvazia (migração 0023).
+PARTICAO_PADRAO = 'audit_logs_default'
+
+
+def _somar_meses(mes: date, meses: int) -> date:
+    indice = mes.year * 12 + mes.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _nome_particao(mes: date) -> str:
+    return f'audit_logs_p{mes:%Y%m}'
+
+
+def _mes_atual() -> date:
+    hoje = datetime.now(UTC).date()
+    return date(hoje.year, hoje.month, 1)
+
+
+def _particoes_existentes(db: Session) -> dict[str, date]:
+    nomes = db.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'audit_logs'::regclass"
+        )
+    ).all()
+    particoes = {}
+    for nome in nomes:
+        encontrado = PARTICAO.match(nome)
+        if encontrado:
+            particoes[nome] = date(int(encontrado.group(1)), int(encontrado.group(2)), 1)
+    return particoes
+
+
+def _limites_particao(mes: date) -> str:
+    # Limites em UTC, iguais aos criados pela migração 0016.
+    return f"FROM ('{mes.isoformat()} 00:00:00+00') TO ('{_somar_meses(mes, 1).isoformat()} 00:00:00+00')"
+
+
+def _meses_na_particao_padrao(db: Session) -> list[date]:
+    meses = db.scalars(
+        text(
+            f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date FROM {PARTICAO_PADRAO} ORDER BY 1"
+        )
+    ).all()
+    return list(meses)
+
+
+def _mover_da_particao_padrao(db: Session, mes: date) -> None:
+    # Com linhas do mês na DEFAULT, CREATE ... PARTITION OF falharia: a partição nasce avulsa,
+    # recebe as linhas e só então é anexada (o ATTACH valida a DEFAULT já sem elas).
+    nome = _nome_particao(mes)
+    fim = _somar_meses(mes, 1)
+    inicio, fim = datetime(mes.year, mes.month, 1, tzinfo=UTC), datetime(fim.year, fim.month, 1, tzinfo=UTC)
+    db.execute(text(f'CREATE TABLE {nome} (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.execute(
+        text(
+            f'WITH movidas AS (DELETE FROM {PARTICAO_PADRAO} WHERE created_at >= :inicio AND created_at < :fim RETURNING *) '
+            f'INSERT INTO {nome} SELECT * FROM movidas'
+        ),
+        {'inicio': inicio, 'fim': fim},
+    )
+    db.execute(text(f'ALTER TABLE audit_logs ATTACH PARTITION {nome} FOR VALUES {_limites_particao(mes)}'))
+
+
+def criar_particoes_futuras(db: Session, meses_futuros: int) -> list[str]:
+    existentes = _particoes_existentes(db)
+    criadas = []
+    # Primeiro os meses que caíram na DEFAULT por falta de manutenção (inclusive o atual).
+    for mes in _meses_na_particao_padrao(db):
+        nome = _nome_particao(mes)
+        if nome in existentes:
+            continue
+        _mover_da_particao_padrao(db, mes)
+        existentes[nome] = mes
+        criadas.append(nome)
+
+    for deslocamento in range(meses_futuros + 1):
+        mes = _somar_meses(_mes_atual(), deslocamento)
+        nome = _nome_particao(mes)
+        if nome in existentes:
+            continue
+        db.execute(text(f'CREATE TABLE {nome} PARTITION OF audit_logs FOR VALUES {_limites_particao(mes)}'))
+        criadas.append(nome)
+    return criadas
+
+
+def desanexar_particoes_antigas(db: Session, meses_retencao: int, descartar: bool) -> list[str]:
+    if meses_retencao <= 0:
+        return []
+    # Mantém o mês atual e os meses_retencao - 1 anteriores.
+    limite = _somar_meses(_mes_atual(), -(meses_retencao - 1))
+    removidas = []
+    for nome, mes in sorted(_particoes_existentes(db).items(), key=lambda item: item[1]):
+        if mes >= limite:
+            continue
+        db.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION {nome}'))
+        if descartar:
+            db.execute(text(f'DROP TABLE {nome}'))
+        removidas.append(nome)
+    return removidas
+
+
+def manter_particoes_audit_logs() -> dict[str, list[str]]:
+    # Fica fora da transação das requisições; roda no startup, no laço do lifespan e via CLI.
+    with SessionLocal() as db:
+        if not db.scalar(select(func.pg_try_advisory_xact_lock(CHAVE_LOCK_PARTICOES))):
+            db.rollback()
+            return {'criadas': [], 'desanexadas': []}
+        # O DDL pede lock exclusivo em audit_logs: com escritas abertas, desiste em vez de enfileirar todas atrás dele.
+        db.execute(select(func.set_config('lock_timeout', f'{settings.AUDIT_LOGS_LOCK_TIMEOUT_MS}ms', True)))
+        resultado = {
+            'criadas': criar_particoes_futuras(db, settings.AUDIT_LOGS_MESES_FUTUROS),
+            'desanexadas': desanexar_particoes_antigas(
+                db,
+                settings.AUDIT_LOGS_RETENCAO_MESES,
+                settings.AUDIT_LOGS_RETENCAO_DESCARTAR,
+            ),
+        }
+        db.commit()
+
+    if resultado['criadas'] or resultado['desanexadas']:
+        print(
+            'Partições de audit_logs: '
+            f'criadas={", ".join(resultado["criadas"]) or "-"}; '
+            f'desanexadas={", ".join(resultado["desanexadas"]) or "-"}.'
+        )
+    return resultado
@@ -0,0 +1,57 @@
+import threading
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+# Resultados das verificações feitas no startup/em segundo plano; /api/ready só lê este estado.
+_lock = threading.Lock()
+_estado: dict[str, dict[str, Any]] = {
+    'storage': {'status': 'pendente', 'tentativas': 0, 'erro': None, 'verificado_em': None},
+    'seed': {'status': 'pendente', 'tempos_ms': None, 'verificado_em': None},
+}
+
+
+def _agora() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def registrar_storage(ok: bool, tentativas: int, erro: str | None = None) -> None:
+    with _lock:
+        _estado['storage'] = {
+            'status': 'ok' if ok else 'erro',
+            'tentativas': tentativas,
+            'erro': erro,
+            'verificado_em': _agora(),
+        }
+
+
+def registrar_seed(tempos_ms: dict[str, float]) -> None:
+    with _lock:
+        _estado['seed'] = {'status': 'ok', 'tempos_ms': tempos_ms, 'verificado_em': _agora()}
+
+
+def _estado_banco() -> dict[str, Any]:
+    # Única verificação feita a cada chamada: um SELECT 1 numa conexão do pool.
+    estado: dict[str, Any] = {'status': 'ok', 'erro': None}
+    try:
+        with engine.connect() as conexao:
+            conexao.execute(text('SELECT 1'))
+    except Exception as exc:
+        estado = {'status': 'erro', 'erro': str(exc)[:500]}
+    pool = engine.pool
+    for campo in ('size', 'checkedin', 'checkedout', 'overflow'):
+        metodo = getattr(pool, campo, None)
+        if callable(metodo):
+            estado[campo] = metodo()
+    return estado
+
+
+def estado_prontidao() -> tuple[bool, dict[str, Any]]:
+    with _lock:
+        componentes = {nome: dict(valor) for nome, valor in _estado.items()}
+    componentes['banco'] = _estado_banco()
+    pronto = all(componente['status'] == 'ok' for componente in componentes.values())
+    return pronto, {'status': 'pronto' if pronto else 'indisponivel', **componentes}
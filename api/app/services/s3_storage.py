@@ -1,24 +1,74 @@
-﻿from botocore.client import Config
-import boto3
-from botocore.exceptions import ClientError
+﻿import os
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+# boto3/botocore são importados no primeiro uso: importar este módulo (routers, Alembic, CLI) não carrega o SDK.
 
-def get_s3_client():
-    return boto3.client(
+# Clientes únicos por processo: boto3 clients são thread-safe, mas o pool de conexões não sobrevive a um fork.
+_clientes: dict[str, Any] = {}
+_clientes_pid: int | None = None
+_clientes_lock = threading.Lock()
+
+
+def _criar_cliente(endpoint_url: str):
+    import boto3
+    from botocore.client import Config
+
+    return boto3.session.Session().client(
         's3',
-        endpoint_url=settings.S3_ENDPOINT,
+        endpoint_url=endpoint_url,
         aws_access_key_id=settings.S3_ACCESS_KEY,
         aws_secret_access_key=settings.S3_SECRET_KEY,
         region_name=settings.S3_REGION,
-        config=Config(s3={'addressing_style': 'path'}),
+        config=Config(
+            s3={'addressing_style': 'path'},
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.S3_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.S3_READ_TIMEOUT_SECONDS,
+            retries={'total_max_attempts': settings.S3_MAX_ATTEMPTS, 'mode': settings.S3_RETRY_MODE},
+            tcp_keepalive=True,
+        ),
     )
 
 
+def get_s3_client(publico: bool = False):
+    # O cliente público assina URLs com o endereço visível pelo navegador (S3_PUBLIC_ENDPOINT).
+    global _clientes_pid
+    endpoint_url = (settings.S3_PUBLIC_ENDPOINT or settings.S3_ENDPOINT) if publico else settings.S3_ENDPOINT
+    pid = os.getpid()
+    cliente = _clientes.get(endpoint_url)
+    if cliente is not None and _clientes_pid == pid:
+        return cliente
+    with _clientes_lock:
+        if _clientes_pid != pid:
+            _clientes.clear()
+            _clientes_pid = pid
+        if endpoint_url not in _clientes:
+            _clientes[endpoint_url] = _criar_cliente(endpoint_url)
+        return _clientes[endpoint_url]
+
+
+def _descartar_clientes_apos_fork() -> None:
+    global _clientes_pid, _clientes_lock
+    _clientes.clear()
+    _clientes_pid = None
+    _clientes_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_descartar_clientes_apos_fork)
+
+
 def ensure_bucket_exists() -> None:
+    from botocore.exceptions import ClientError
+
     client = get_s3_client()
     try:
         client.head_bucket(Bucket=settings.S3_BUCKET)
@@ -38,9 +88,44 @@ def upload_fileobj(file_obj, key: str, content_type: str | None = None) -> str:
     if content_type:
         extra_args['ContentType'] = content_type
     client.upload_fileobj(file_obj, settings.S3_BUCKET, key, ExtraArgs=extra_args)
+    return montar_uri_s3(key)
+
+
+def montar_uri_s3(key: str) -> str:
     return f's3://{settings.S3_BUCKET}/{key}'
 
 
+def gerar_upload_pre_assinado(key: str, content_type: str, tamanho: int, expires_in: int) -> dict:
+    # A política do POST obriga o navegador a enviar exatamente o tamanho e o Content-Type declarados.
+    return get_s3_client(publico=True).generate_presigned_post(
+        Bucket=settings.S3_BUCKET,
+        Key=key,
+        Fields={'Content-Type': content_type},
+        Conditions=[
+            {'Content-Type': content_type},
+            ['content-length-range', tamanho, tamanho],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def consultar_objeto_s3(key: str) -> dict | None:
+    from botocore.exceptions import ClientError
+
+    try:
+        resposta = get_s3_client().head_object(Bucket=settings.S3_BUCKET, Key=key)
+    except ClientError as exc:
+        codigo = str(exc.response.get('Error', {}).get('Code', ''))
+        if codigo in {'404', 'NoSuchKey', 'NotFound'}:
+            return None
+        raise
+    return {
+        'tamanho': int(resposta.get('ContentLength') or 0),
+        'content_type': resposta.get('ContentType'),
+        'etag': resposta.get('ETag'),
+    }
+
+
 def _parse_s3_uri(s3_uri: str) -> tuple[str, str] | None:
     if not s3_uri.startswith('s3://'):
         return None
@@ -61,7 +146,7 @@ def gerar_url_pre_assinada(s3_uri: str | None, expires_in: int = 3600) -> str |
         return s3_uri
 
     bucket, key = parseado
-    client = get_s3_client()
+    client = get_s3_client(publico=True)
     try:
         return client.generate_presigned_url(
             'get_object',
@@ -72,14 +157,66 @@ def gerar_url_pre_assinada(s3_uri: str | None, expires_in: int = 3600) -> str |
         return s3_uri
 
 
-def baixar_arquivo_s3(s3_uri: str) -> tuple[bytes, str | None]:
+class ObjetoS3NaoModificado(Exception):
+    def __init__(self, etag: str | None) -> None:
+        super().__init__('Objeto não modificado.')
+        self.etag = etag
+
+
+class IntervaloS3Invalido(Exception):
+    def __init__(self, tamanho_total: int | None) -> None:
+        super().__init__('Intervalo solicitado inválido.')
+        self.tamanho_total = tamanho_total
+
+
+@dataclass
+class ObjetoS3:
+    corpo: Any
+    tamanho: int
+    content_type: str | None
+    etag: str | None
+    last_modified: datetime | None
+    content_range: str | None
+
+    def iterar(self, tamanho_bloco: int = 64 * 1024) -> Iterator[bytes]:
+        try:
+            yield from self.corpo.iter_chunks(chunk_size=tamanho_bloco)
+        finally:
+            self.corpo.close()
+
+
+def abrir_objeto_s3(s3_uri: str, intervalo: str | None = None, if_none_match: str | None = None) -> ObjetoS3:
     parseado = _parse_s3_uri(s3_uri)
     if not parseado:
         raise ValueError('URI S3 inválida.')
 
     bucket, key = parseado
-    client = get_s3_client()
-    resposta = client.get_object(Bucket=bucket, Key=key)
-    conteudo = resposta['Body'].read()
-    content_type = resposta.get('ContentType')
-    return conteudo, content_type
+    parametros: dict[str, str] = {'Bucket': bucket, 'Key': key}
+    if intervalo:
+        parametros['Range'] = intervalo
+    if if_none_match:
+        parametros['IfNoneMatch'] = if_none_match
+
+    from botocore.exceptions import ClientError
+
+    try:
+        resposta = get_s3_client().get_object(**parametros)
+    except ClientError as exc:
+        erro = exc.response.get('Error', {})
+        codigo = str(erro.get('Code', ''))
+        if codigo in {'304', 'NotModified'}:
+            cabecalhos = exc.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+            raise ObjetoS3NaoModificado(cabecalhos.get('etag') or if_none_match) from exc
+        if codigo in {'416', 'InvalidRange'}:
+            tamanho_total = erro.get('ActualObjectSize')
+            raise IntervaloS3Invalido(int(tamanho_total) if tamanho_total else None) from exc
+        raise
+
+    return ObjetoS3(
+        corpo=resposta['Body'],
+        tamanho=int(resposta.get('ContentLength') or 0),
+        content_type=resposta.get('ContentType'),
+        etag=resposta.get('ETag'),
+        last_modified=resposta.get('LastModified'),
+        content_range=resposta.get('ContentRange'),
+    )
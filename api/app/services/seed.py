@@ -0,0 +1,216 @@
+import time
+from datetime import date
+
+from sqlalchemy import String, Text, column, exists, func, literal, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from app.core.security import contexto_senhas
+from app.db.session import SessionLocal
+from app.models.fsc import (
+    AuditoriaAno,
+    ConfiguracaoSistema,
+    Criterio,
+    EvidenceType,
+    Indicador,
+    ProgramaCertificacao,
+    SeedVersao,
+    StatusConformidadeEnum,
+)
+from app.models.user import RoleEnum, User
+from app.services.catalogo import incrementar_versao_catalogo
+
+# Incrementar quando as etapas fixas abaixo mudarem, para que rodem de novo no próximo deploy.
+SEED_VERSAO = 1
+# Chave do pg_advisory_xact_lock que serializa o seed entre workers.
+CHAVE_LOCK_SEED = 7240311
+
+PROGRAMAS_PADRAO = [
+    ('FSC', 'FSC', 'Forest Stewardship Council'),
+    ('PEFC', 'PEFC', 'Programme for the Endorsement of Forest Certification'),
+    ('ONCA_PINTADA', 'Onça Pintada', 'Certificação e monitoramento para onça pintada'),
+    ('CARBONO', 'Carbono', 'Programas e auditorias para carbono florestal'),
+]
+
+TIPOS_EVIDENCIA_PADRAO = [
+    ('Foto', 'Registro fotográfico de campo.'),
+    ('Mapa', 'Mapas temáticos e georreferenciados.'),
+    ('Licença/Autorização', 'Licenças, autorizações e documentos legais.'),
+    ('Procedimento', 'Procedimentos operacionais e instruções de trabalho.'),
+    ('Relatório', 'Relatórios técnicos e de auditoria.'),
+    ('Registro', 'Registros operacionais e evidências documentais.'),
+    ('Ata/Consulta', 'Atas de reunião e consultas a partes interessadas.'),
+    ('Monitoramento', 'Dados e relatórios de monitoramento.'),
+]
+
+
+def _seed_programas_certificacao(db: Session) -> None:
+    # Legado: PFC vira PEFC quando ainda não existe um PEFC.
+    pefc = aliased(ProgramaCertificacao)
+    db.execute(
+        update(ProgramaCertificacao)
+        .where(ProgramaCertificacao.codigo == 'PFC', ~exists().where(pefc.codigo == 'PEFC'))
+        .values(codigo='PEFC')
+    )
+    db.execute(
+        insert(ProgramaCertificacao)
+        .values([{'codigo': codigo, 'nome': nome, 'descricao': descricao} for codigo, nome, descricao in PROGRAMAS_PADRAO])
+        .on_conflict_do_nothing()
+    )
+
+    padrao = values(
+        column('codigo', String),
+        column('nome', String),
+        column('descricao', Text),
+        name='padrao',
+    ).data(PROGRAMAS_PADRAO)
+    db.execute(
+        update(ProgramaCertificacao)
+        .where(
+            ProgramaCertificacao.codigo == padrao.c.codigo,
+            (ProgramaCertificacao.nome != padrao.c.nome)
+            | ProgramaCertificacao.descricao.is_distinct_from(padrao.c.descricao),
+        )
+        .values(nome=padrao.c.nome, descricao=padrao.c.descricao)
+    )
+
+
+def _seed_auditorias_iniciais(db: Session, programa_desde: int) -> None:
+    sem_auditoria = select(
+        ProgramaCertificacao.id,
+        literal(date.today().year),
+        literal('Certificação'),
+    ).where(
+        ProgramaCertificacao.id > programa_desde,
+        ~exists().where(AuditoriaAno.programa_id == ProgramaCertificacao.id),
+    )
+    db.execute(insert(AuditoriaAno).from_select(['programa_id', 'year', 'tipo'], sem_auditoria))
+
+
+def _seed_evidence_types(db: Session, indicador_desde: int) -> None:
+    tipos = values(column('nome', String), column('descricao', Text), name='tipos').data(TIPOS_EVIDENCIA_PADRAO)
+    ja_existe = exists().where(
+        EvidenceType.programa_id == Indicador.programa_id,
+        EvidenceType.criterio_id == Criterio.id,
+        EvidenceType.indicador_id == Indicador.id,
+        func.lower(EvidenceType.nome) == func.lower(tipos.c.nome),
+    )
+    faltantes = (
+        select(
+            Indicador.programa_id,
+            Criterio.id,
+            Indicador.id,
+            tipos.c.nome,
+            tipos.c.descricao,
+            literal(StatusConformidadeEnum.conforme.value),
+        )
+        .join(Criterio, Criterio.id == Indicador.criterio_id)
+        .join(tipos, literal(True))
+        .where(Indicador.id > indicador_desde, ~ja_existe)
+    )
+    programas = db.scalars(
+        insert(EvidenceType)
+        .from_select(
+            ['programa_id', 'criterio_id', 'indicador_id', 'nome', 'descricao', 'status_conformidade'],
+            faltantes,
+        )
+        .on_conflict_do_nothing()
+        .returning(EvidenceType.programa_id)
+    ).all()
+    incrementar_versao_catalogo(db, set(programas))
+
+
+def _seed_admin_user(db: Session) -> None:
+    if db.scalar(select(exists().where(User.email == 'admin@local'))):
+        return
+    db.execute(
+        insert(User)
+        .values(
+            nome='Administrador',
+            email='admin@local',
+            role=RoleEnum.ADMIN,
+            password_hash=contexto_senhas().hash('admin123'),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def _seed_configuracao_sistema(db: Session) -> None:
+    sem_configuracao = select(literal('Empresa')).where(~exists(select(ConfiguracaoSistema.id)))
+    db.execute(insert(ConfiguracaoSistema).from_select(['nome_empresa'], sem_configuracao))
+
+
+def _marcas_atuais(db: Session) -> tuple[int, int]:
+    programa_max_id, indicador_max_id = db.execute(
+        select(
+            select(func.coalesce(func.max(ProgramaCertificacao.id), 0)).scalar_subquery(),
+            select(func.coalesce(func.max(Indicador.id), 0)).scalar_subquery(),
+        )
+    ).one()
+    return int(programa_max_id), int(indicador_max_id)
+
+
+def _seed_em_dia(marcador: SeedVersao | None, marcas: tuple[int, int]) -> bool:
+    return marcador is not None and (marcador.programa_max_id, marcador.indicador_max_id) == marcas
+
+
+def executar_seed() -> dict[str, float]:
+    # Roda uma vez por versão; depois disso só completa auditorias/tipos de evidência de programas e
+    # indicadores criados desde o último boot. Devolve o tempo de cada etapa em ms.
+    inicio = time.perf_counter()
+    tempos: dict[str, float] = {}
+
+    def etapa(nome: str, funcao, *args) -> None:
+        inicio_etapa = time.perf_counter()
+        funcao(*args)
+        tempos[nome] = round((time.perf_counter() - inicio_etapa) * 1000, 1)
+
+    with SessionLocal() as db:
+        if _seed_em_dia(db.get(SeedVersao, SEED_VERSAO), _marcas_atuais(db)):
+            db.rollback()
+            tempos['total'] = round((time.perf_counter() - inicio) * 1000, 1)
+            print(f'Seed v{SEED_VERSAO} já aplicado ({tempos["total"]} ms).')
+            return tempos
+
+        db.execute(select(func.pg_advisory_xact_lock(CHAVE_LOCK_SEED)))
+        # Outro worker pode ter concluído o seed enquanto este esperava a trava.
+        db.expire_all()
+        marcador = db.get(SeedVersao, SEED_VERSAO)
+        if _seed_em_dia(marcador, _marcas_atuais(db)):
+            db.rollback()
+            tempos['total'] = round((time.perf_counter() - inicio) * 1000, 1)
+            print(f'Seed v{SEED_VERSAO} aplicado por outro worker ({tempos["total"]} ms).')
+            return tempos
+
+        programa_desde = marcador.programa_max_id if marcador else 0
+        indicador_desde = marcador.indicador_max_id if marcador else 0
+        if marcador is None:
+            etapa('programas', _seed_programas_certificacao, db)
+        etapa('auditorias', _seed_auditorias_iniciais, db, programa_desde)
+        etapa('tipos_evidencia', _seed_evidence_types, db, indicador_desde)
+        if marcador is None:
+            etapa('admin', _seed_admin_user, db)
+            etapa('configuracao', _seed_configuracao_sistema, db)
+
+        programa_max_id, indicador_max_id = _marcas_atuais(db)
+        stmt = insert(SeedVersao).values(
+            versao=SEED_VERSAO,
+            programa_max_id=programa_max_id,
+            indicador_max_id=indicador_max_id,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=['versao'],
+                set_={
+                    'programa_max_id': stmt.excluded.programa_max_id,
+                    'indicador_max_id': stmt.excluded.indicador_max_id,
+                    'aplicado_em': func.now(),
+                },
+            )
+        )
+        db.commit()
+
+    tempos['total'] = round((time.perf_counter() - inicio) * 1000, 1)
+    detalhes = ', '.join(f'{nome}={ms} ms' for nome, ms in tempos.items())
+    print(f'Seed v{SEED_VERSAO} aplicado: {detalhes}.')
+    return tempos
@@ -0,0 +1,107 @@
+from collections.abc import Callable
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import cache
+from operator import attrgetter
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import JSON, Date, DateTime, Numeric, Time, inspect
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy.sql.type_api import TypeEngine
+
+Conversor = Callable[[Any], Any]
+
+# Tipos que o json já grava como estão; o restante passa pela conversão.
+_PRIMITIVOS = (str, int, float, bool)
+
+
+def _valor_enum(valor: Enum) -> Any:
+    return valor.value
+
+
+def _iso(valor: date | datetime | time) -> str:
+    return valor.isoformat()
+
+
+def _decimal(valor: Decimal) -> int | float:
+    # Mesmo resultado do jsonable_encoder: inteiro quando não há casas decimais.
+    return int(valor) if valor.as_tuple().exponent >= 0 else float(valor)
+
+
+def para_json(valor: Any) -> Any:
+    if isinstance(valor, Enum):
+        return para_json(valor.value)
+    if valor is None or isinstance(valor, _PRIMITIVOS):
+        return valor
+    if isinstance(valor, dict):
+        return {chave: para_json(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return [para_json(item) for item in valor]
+    if isinstance(valor, (date, datetime, time)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return _decimal(valor)
+    if hasattr(type(valor), '__mapper__'):
+        return serializar_modelo(valor)
+    return jsonable_encoder(valor)
+
+
+def _conversor_coluna(tipo: TypeEngine) -> Conversor | None:
+    # None: o valor lido do atributo já é JSON (str, int, bool).
+    if isinstance(tipo, SqlEnum):
+        return _valor_enum if tipo.enum_class is not None else None
+    if isinstance(tipo, (Date, DateTime, Time)):
+        return _iso
+    if isinstance(tipo, Numeric):
+        return _decimal if tipo.asdecimal else None
+    if isinstance(tipo, JSON):
+        return para_json
+    try:
+        python_type = tipo.python_type
+    except NotImplementedError:
+        return para_json
+    return None if python_type in _PRIMITIVOS else para_json
+
+
+@cache
+def serializador_para(classe: type) -> Callable[[Any], dict[str, Any]]:
+    # Montado uma vez por modelo: lê todas as colunas com um único attrgetter e só converte as que precisam.
+    mapper = inspect(classe)
+    nomes: list[str] = []
+    atributos: list[str] = []
+    convertidas: list[tuple[str, Conversor]] = []
+    for coluna in mapper.local_table.columns:
+        if coluna.computed is not None:
+            # Colunas geradas (ex.: tsvector de busca) são derivadas das demais e ficam fora do snapshot.
+            continue
+        nomes.append(coluna.name)
+        atributos.append(mapper.get_property_by_column(coluna).key)
+        conversor = _conversor_coluna(coluna.type)
+        if conversor is not None:
+            convertidas.append((coluna.name, conversor))
+
+    ler = attrgetter(*atributos)
+    if len(atributos) == 1:
+        ler_um = ler
+
+        def ler(instancia: Any) -> tuple:
+            return (ler_um(instancia),)
+
+    chaves = tuple(nomes)
+    conversoes = tuple(convertidas)
+
+    def serializar(instancia: Any) -> dict[str, Any]:
+        dados = dict(zip(chaves, ler(instancia)))
+        for nome, conversor in conversoes:
+            valor = dados[nome]
+            if valor is not None:
+                dados[nome] = conversor(valor)
+        return dados
+
+    return serializar
+
+
+def serializar_modelo(instancia: Any) -> dict[str, Any]:
+    return serializador_para(type(instancia))(instancia)
@@ -0,0 +1,62 @@
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.models.auditlog import AcaoAuditEnum
+from app.models.fsc import AuditoriaAno
+from app.schemas.fsc import GeracaoAvaliacoesOut, MensagemOut
+from app.services.audit_logger import registrar_log
+from app.services.avaliacoes_lote import gerar_avaliacoes_em_lote
+from app.services.jobs import ErroDefinitivoJob, Progresso, tarefa
+from app.services.serializacao import serializar_modelo
+
+TAREFA_GERAR_AVALIACOES = 'gerar_avaliacoes'
+TAREFA_REMOVER_AUDITORIA = 'remover_auditoria'
+
+
+# Mesma regra na rota síncrona e no worker; quem chama faz o commit.
+def gerar_avaliacoes(db: Session, auditoria: AuditoriaAno, created_by: int | None) -> GeracaoAvaliacoesOut:
+    criadas, ignoradas = gerar_avaliacoes_em_lote(db, auditoria, created_by)
+    return GeracaoAvaliacoesOut(
+        mensagem=f'Avaliações geradas para Auditoria {auditoria.year}. Total de novas avaliações: {criadas}.',
+        criadas=criadas,
+        ignoradas=ignoradas,
+    )
+
+
+def excluir_auditoria(db: Session, auditoria: AuditoriaAno, created_by: int | None) -> MensagemOut:
+    auditoria_id = auditoria.id
+    old_value = serializar_modelo(auditoria)
+    db.delete(auditoria)
+    registrar_log(
+        db,
+        entidade='auditoria',
+        entidade_id=auditoria_id,
+        acao=AcaoAuditEnum.DELETE,
+        created_by=created_by,
+        old_value=old_value,
+        programa_id=auditoria.programa_id,
+        auditoria_ano_id=auditoria_id,
+    )
+    return MensagemOut(mensagem='Auditoria removida com sucesso.')
+
+
+def _auditoria_do_job(db: Session, parametros: dict[str, Any]) -> AuditoriaAno:
+    auditoria = db.get(AuditoriaAno, parametros.get('auditoria_id'))
+    if not auditoria:
+        raise ErroDefinitivoJob('Auditoria não encontrada.')
+    return auditoria
+
+
+@tarefa(TAREFA_GERAR_AVALIACOES)
+def _job_gerar_avaliacoes(db: Session, parametros: dict[str, Any], progresso: Progresso) -> dict[str, Any]:
+    auditoria = _auditoria_do_job(db, parametros)
+    progresso(10, f'Gerando avaliações da Auditoria {auditoria.year}.')
+    return gerar_avaliacoes(db, auditoria, parametros.get('created_by')).model_dump(mode='json')
+
+
+@tarefa(TAREFA_REMOVER_AUDITORIA)
+def _job_remover_auditoria(db: Session, parametros: dict[str, Any], progresso: Progresso) -> dict[str, Any]:
+    auditoria = _auditoria_do_job(db, parametros)
+    progresso(10, f'Removendo Auditoria {auditoria.year} e registros vinculados.')
+    return excluir_auditoria(db, auditoria, parametros.get('created_by')).model_dump(mode='json')
@@ -163,6 +163,25 @@ export interface Avaliacao {
   updated_at: string;
 }
 
+export interface GradeAvaliacaoItem {
+  id: number;
+  indicator_id: number;
+  status_conformidade: StatusConformidade;
+  observacoes?: string | null;
+  updated_at: string;
+  indicador_codigo?: string | null;
+  indicador_titulo: string;
+  criterio_id: number;
+  criterio_codigo?: string | null;
+  criterio_titulo: string;
+  principio_id: number;
+  principio_codigo?: string | null;
+  principio_titulo: string;
+  evidencias: number;
+  evidencias_nao_conformes: number;
+  demandas_ativas: number;
+}
+
 export type KindEvidencia = 'arquivo' | 'link' | 'texto';
 
 export interface TipoEvidencia {
@@ -175,6 +194,124 @@ export interface TipoEvidencia {
   status_conformidade: StatusConformidade;
 }
 
+export interface IndicadorCatalogo extends Indicador {
+  tipos_evidencia: TipoEvidencia[];
+}
+
+export interface CriterioCatalogo extends Criterio {
+  indicadores: IndicadorCatalogo[];
+  tipos_evidencia: TipoEvidencia[];
+}
+
+export interface PrincipioCatalogo extends Principio {
+  criterios: CriterioCatalogo[];
+}
+
+export interface CatalogoPrograma {
+  programa_id: number;
+  versao: number;
+  principios: PrincipioCatalogo[];
+  tipos_evidencia: TipoEvidencia[];
+}
+
+export interface CatalogoPlano {
+  principios: Principio[];
+  criterios: Criterio[];
+  indicadores: Indicador[];
+  tipos: TipoEvidencia[];
+}
+
+// Uma requisição (com ETag, revalidada pelo navegador) no lugar de /principios, /criterios, /indicadores e /tipos-evidencia.
+export async function carregarCatalogo(programaId: number): Promise<CatalogoPlano> {
+  const { data } = await api.get<CatalogoPrograma>(`/programas-certificacao/${programaId}/catalogo`);
+  const plano: CatalogoPlano = { principios: [], criterios: [], indicadores: [], tipos: [...data.tipos_evidencia] };
+  for (const { criterios, ...principio } of data.principios) {
+    plano.principios.push(principio);
+    for (const { indicadores, tipos_evidencia, ...criterio } of criterios) {
+      plano.criterios.push(criterio);
+      plano.tipos.push(...tipos_evidencia);
+      for (const { tipos_evidencia: tiposIndicador, ...indicador } of indicadores) {
+        plano.indicadores.push(indicador);
+        plano.tipos.push(...tiposIndicador);
+      }
+    }
+  }
+  // Mesma ordem das listas que o catálogo substituiu: criterios/indicadores por id e tipos de evidência por nome.
+  plano.criterios.sort((a, b) => a.id - b.id);
+  plano.indicadores.sort((a, b) => a.id - b.id);
+  plano.tipos.sort((a, b) => a.nome.localeCompare(b.nome) || a.id - b.id);
+  return plano;
+}
+
+export type StatusJob = 'pendente' | 'executando' | 'concluido' | 'falhou';
+
+export interface Job<T = Record<string, any>> {
+  id: number;
+  tipo: string;
+  status: StatusJob;
+  progresso: number;
+  mensagem?: string | null;
+  resultado?: T | null;
+  erro?: string | null;
+  tentativas: number;
+  max_tentativas: number;
+  created_at: string;
+  iniciado_em?: string | null;
+  concluido_em?: string | null;
+}
+
+// Operações longas respondem 202 com o job; consulta /jobs/{id} até o worker concluir ou falhar.
+// Desiste se nenhum worker pegar o job a tempo ou se a execução passar do limite; o job segue na fila do servidor.
+export async function aguardarJob<T = Record<string, any>>(
+  jobId: number,
+  aoProgredir?: (job: Job<T>) => void,
+  { intervaloMs = 1000, limitePendenteMs = 2 * 60 * 1000, limiteTotalMs = 15 * 60 * 1000 } = {},
+): Promise<T | null> {
+  const inicio = Date.now();
+  for (;;) {
+    const { data } = await api.get<Job<T>>(`/jobs/${jobId}`);
+    aoProgredir?.(data);
+    if (data.status === 'concluido') return data.resultado ?? null;
+    if (data.status === 'falhou') throw new Error(data.erro || 'Falha ao processar a operação.');
+    const decorrido = Date.now() - inicio;
+    if (data.status === 'pendente' && data.tentativas === 0 && decorrido > limitePendenteMs) {
+      throw new Error('A operação ainda não começou a ser processada. Tente consultar novamente em alguns minutos.');
+    }
+    if (decorrido > limiteTotalMs) {
+      throw new Error('A operação está demorando mais que o esperado e continua em processamento no servidor.');
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervaloMs));
+  }
+}
+
+export interface UploadPreAssinado {
+  url: string;
+  campos: Record<string, string>;
+  key: string;
+  expira_em_segundos: number;
+}
+
+// O arquivo vai direto do navegador para o armazenamento (POST pré-assinado); a API só recebe a key no finalizar.
+export async function enviarArquivoDireto(
+  urlSolicitacao: string,
+  arquivo: File,
+  extras: Record<string, unknown> = {},
+): Promise<string> {
+  const { data } = await api.post<UploadPreAssinado>(urlSolicitacao, {
+    ...extras,
+    nome_arquivo: arquivo.name,
+    content_type: arquivo.type || 'application/octet-stream',
+    tamanho: arquivo.size,
+  });
+  const formData = new FormData();
+  Object.entries(data.campos).forEach(([campo, valor]) => formData.append(campo, valor));
+  // O S3 exige o arquivo como último campo do formulário.
+  formData.append('file', arquivo);
+  // axios sem o interceptor da API: o S3 rejeita o header Authorization junto da política assinada.
+  await axios.post(data.url, formData);
+  return data.key;
+}
+
 export interface Evidencia {
   id: number;
   programa_id: number;
@@ -371,6 +508,13 @@ export interface AvaliacaoDetalhe {
   logs: AuditLog[];
 }
 
+export interface AvaliacaoDetalheCompleto extends AvaliacaoDetalhe {
+  tipos_evidencia: TipoEvidencia[];
+  responsaveis: Usuario[];
+  documentos: DocumentoEvidencia[];
+  analises_nc: AnaliseNc[];
+}
+
 export interface ResumoStatusItem {
   status_conformidade: StatusConformidade;
   label: string;
@@ -418,6 +562,52 @@ export interface CronogramaGanttItem {
   data_fim: string;
 }
 
+export interface DashboardResumo {
+  programas: ProgramaCertificacao[];
+  anos_disponiveis: number[];
+  year: number;
+  resumo_status?: ResumoStatusItem[] | null;
+  demandas_atrasadas?: Demanda[] | null;
+  monitoramento_mensal?: MonitoramentoMensalItem[] | null;
+  resumo_conformidade_por_certificacao: ResumoConformidadeCertificacaoItem[] | null;
+  tempos_ms: Record<string, number>;
+}
+
+export interface IdeiaDirecionador {
+  id: number;
+  avaliacao_id: number;
+  titulo: string;
+  descricao?: string | null;
+  prioridade: Prioridade;
+  status_andamento: StatusAndamento;
+  status_conformidade: StatusConformidade;
+}
+
+export interface CriterioDirecionador {
+  id: number;
+  codigo: string;
+  titulo: string;
+  avaliacao_ids: number[];
+  total_avaliacoes: number;
+  ideias: IdeiaDirecionador[];
+}
+
+export interface PrincipioDirecionador {
+  id: number;
+  codigo: string;
+  titulo: string;
+  total_avaliacoes: number;
+  total_ideias: number;
+  criterios: CriterioDirecionador[];
+}
+
+export interface DiagramaDirecionadores {
+  auditoria_id: number;
+  apenas_ativas: boolean;
+  total_avaliacoes_nc: number;
+  principios: PrincipioDirecionador[];
+}
+
 export interface MonitoramentoMensalItem {
   mes: number;
   mes_nome: string;
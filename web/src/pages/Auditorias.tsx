@@ -3,8 +3,10 @@
   useState } from 'react';
 
 import { api,
+  aguardarJob,
   Auditoria,
   formatApiError,
+  Job,
 } from '../api';
 import Modal from '../components/Modal';
 import Table from '../components/Table';
@@ -67,13 +69,20 @@ export default function Auditorias({
     }
   };
 
+  const mostrarProgresso = (job: Job) => {
+    setMensagem(`${job.mensagem || 'Processando...'} (${job.progresso}%)`);
+  };
+
   const gerarAvaliacoes = async () => {
     if (!auditoriaId) return;
     setErro('');
     setMensagem('');
     try {
-      const { data } = await api.post<{ mensagem: string }>(`/auditorias/${auditoriaId}/gerar-avaliacoes`);
-      setMensagem(data.mensagem);
+      const { data } = await api.post<Job>(`/auditorias/${auditoriaId}/gerar-avaliacoes`, null, {
+        params: { assincrono: true },
+      });
+      const resultado = await aguardarJob<{ mensagem: string }>(data.id, mostrarProgresso);
+      setMensagem(resultado?.mensagem || 'Avaliações geradas com sucesso.');
     } catch (err: any) {
       setErro(formatApiError(err, 'Falha ao gerar avaliações.'));
     }
@@ -143,11 +152,13 @@ export default function Auditorias({
     setErro('');
     setMensagem('');
     try {
-      await api.delete(`/auditorias/${auditoriaExclusao.id}`, {
+      const { data } = await api.delete<Job>(`/auditorias/${auditoriaExclusao.id}`, {
         data: {
           senha_sistema: senhaExclusao.trim(),
         },
+        params: { assincrono: true },
       });
+      await aguardarJob(data.id, mostrarProgresso);
       if (auditoriaId === auditoriaExclusao.id) {
         setAuditoriaId(null);
       }
@@ -7,12 +7,12 @@ import { useNavigate } from 'react-router-dom';
 
 import {
   api,
-  Avaliacao,
   Criterio,
-  Evidencia,
+  GradeAvaliacaoItem,
   Indicador,
   STATUS_CONFORMIDADE_LABELS,
   StatusConformidade,
+  carregarCatalogo,
   formatApiError,
 } from '../api';
 import Modal from '../components/Modal';
@@ -34,10 +34,9 @@ const STATUS_EXIGE_JUSTIFICATIVA: StatusConformidade[] = ['nc_menor', 'nc_maior'
 
 export default function Avaliacoes({ programaId, auditoriaId }: Props) {
   const navigate = useNavigate();
-  const [avaliacoes, setAvaliacoes] = useState<Avaliacao[]>([]);
+  const [avaliacoes, setAvaliacoes] = useState<GradeAvaliacaoItem[]>([]);
   const [criterios, setCriterios] = useState<Criterio[]>([]);
   const [indicadores, setIndicadores] = useState<Indicador[]>([]);
-  const [evidencias, setEvidencias] = useState<Evidencia[]>([]);
   const [statusFiltro, setStatusFiltro] = useState<string>('');
   const [busca, setBusca] = useState('');
   const [erro, setErro] = useState('');
@@ -47,7 +46,7 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
   const [novoIndicadorId, setNovoIndicadorId] = useState<number>(0);
   const [novoStatus, setNovoStatus] = useState<StatusConformidade>('conforme');
   const [novaObs, setNovaObs] = useState('');
-  const [avaliacaoEdicao, setAvaliacaoEdicao] = useState<Avaliacao | null>(null);
+  const [avaliacaoEdicao, setAvaliacaoEdicao] = useState<GradeAvaliacaoItem | null>(null);
   const [edicaoStatus, setEdicaoStatus] = useState<StatusConformidade>('conforme');
   const [edicaoObs, setEdicaoObs] = useState('');
   const [avaliacaoStatusAtualizandoId, setAvaliacaoStatusAtualizandoId] = useState<number | null>(null);
@@ -56,29 +55,22 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
     if (!auditoriaId || !programaId) return;
     setErro('');
     try {
-      const [aResp, cResp, iResp, eResp] = await Promise.all([
-        api.get<Avaliacao[]>('/avaliacoes', {
-          params: {
-            programa_id: programaId,
-            auditoria_id: auditoriaId,
-            status_conformidade: statusFiltro || undefined,
-          },
+      const [aResp, catalogo] = await Promise.all([
+        api.get<GradeAvaliacaoItem[]>(`/auditorias/${auditoriaId}/grade-avaliacoes`, {
+          params: { status_conformidade: statusFiltro || undefined },
         }),
-        api.get<Criterio[]>('/criterios', { params: { programa_id: programaId } }),
-        api.get<Indicador[]>('/indicadores', { params: { programa_id: programaId } }),
-        api.get<Evidencia[]>('/evidencias', { params: { programa_id: programaId, auditoria_id: auditoriaId } }),
+        carregarCatalogo(programaId),
       ]);
       const indicadoresAvaliados = new Set(aResp.data.map((item) => item.indicator_id));
-      const indicadoresDisponiveis = iResp.data.filter((item) => !indicadoresAvaliados.has(item.id));
+      const indicadoresDisponiveis = catalogo.indicadores.filter((item) => !indicadoresAvaliados.has(item.id));
       setAvaliacoes(aResp.data);
-      setCriterios(cResp.data);
-      setIndicadores(iResp.data);
-      setEvidencias(eResp.data);
+      setCriterios(catalogo.criterios);
+      setIndicadores(catalogo.indicadores);
       if (!indicadoresDisponiveis.some((item) => item.id === novoIndicadorId)) {
         setNovoIndicadorId(indicadoresDisponiveis[0]?.id || 0);
       }
       if (!indicadoresDisponiveis.some((item) => item.criterio_id === novoCriterioId)) {
-        setNovoCriterioId(indicadoresDisponiveis[0]?.criterio_id || cResp.data[0]?.id || 0);
+        setNovoCriterioId(indicadoresDisponiveis[0]?.criterio_id || catalogo.criterios[0]?.id || 0);
       }
     } catch (err: any) {
       setErro(formatApiError(err, 'Falha ao carregar avaliações.'));
@@ -90,18 +82,6 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [programaId, auditoriaId, statusFiltro]);
 
-  const criterioMap = useMemo(() => new Map(criterios.map((c) => [c.id, c])), [criterios]);
-  const indicadorMap = useMemo(() => new Map(indicadores.map((i) => [i.id, i])), [indicadores]);
-  const pendenciasPorAvaliacao = useMemo(() => {
-    const mapa = new Map<number, { total: number; pendentes: number }>();
-    for (const evidencia of evidencias) {
-      const atual = mapa.get(evidencia.avaliacao_id) || { total: 0, pendentes: 0 };
-      atual.total += 1;
-      if (evidencia.nao_conforme) atual.pendentes += 1;
-      mapa.set(evidencia.avaliacao_id, atual);
-    }
-    return mapa;
-  }, [evidencias]);
   const indicadoresDisponiveis = useMemo(() => {
     const avaliados = new Set(avaliacoes.map((item) => item.indicator_id));
     return indicadores.filter((item) => !avaliados.has(item.id));
@@ -121,12 +101,10 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
     const termo = busca.trim().toLowerCase();
     if (!termo) return avaliacoes;
     return avaliacoes.filter((a) => {
-      const indicador = indicadorMap.get(a.indicator_id);
-      const criterio = criterioMap.get(indicador?.criterio_id || 0);
-      const texto = `${criterio?.codigo || ''} ${criterio?.titulo || ''} ${indicador?.codigo || ''} ${indicador?.titulo || ''}`.toLowerCase();
+      const texto = `${a.criterio_codigo || ''} ${a.criterio_titulo} ${a.indicador_codigo || ''} ${a.indicador_titulo}`.toLowerCase();
       return texto.includes(termo);
     });
-  }, [avaliacoes, busca, indicadorMap, criterioMap]);
+  }, [avaliacoes, busca]);
 
   useEffect(() => {
     if (!indicadoresDoCriterioSelecionado.some((item) => item.id === novoIndicadorId)) {
@@ -166,7 +144,7 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
     }
   };
 
-  const abrirEdicao = (avaliacao: Avaliacao) => {
+  const abrirEdicao = (avaliacao: GradeAvaliacaoItem) => {
     setAvaliacaoEdicao(avaliacao);
     setEdicaoStatus(avaliacao.status_conformidade);
     setEdicaoObs(avaliacao.observacoes || '');
@@ -196,7 +174,7 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
     }
   };
 
-  const atualizarStatusDireto = async (avaliacao: Avaliacao, statusConformidade: StatusConformidade) => {
+  const atualizarStatusDireto = async (avaliacao: GradeAvaliacaoItem, statusConformidade: StatusConformidade) => {
     if (avaliacao.status_conformidade === statusConformidade) return;
     setErro('');
     setMensagem('');
@@ -328,19 +306,11 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
           columns={[
             {
               title: 'Critério',
-              render: (a) => {
-                const indicador = indicadorMap.get(a.indicator_id);
-                const criterio = criterioMap.get(indicador?.criterio_id || 0);
-                if (!criterio) return '-';
-                return `${criterio.codigo ? `${criterio.codigo} - ` : ''}${criterio.titulo}`;
-              },
+              render: (a) => `${a.criterio_codigo ? `${a.criterio_codigo} - ` : ''}${a.criterio_titulo}`,
             },
             {
               title: 'Indicador',
-              render: (a) => {
-                const indicador = indicadorMap.get(a.indicator_id);
-                return indicador ? `${indicador.codigo ? `${indicador.codigo} - ` : ''}${indicador.titulo}` : a.indicator_id;
-              },
+              render: (a) => `${a.indicador_codigo ? `${a.indicador_codigo} - ` : ''}${a.indicador_titulo}`,
             },
             {
               title: 'Status de Conformidade',
@@ -362,20 +332,20 @@ export default function Avaliacoes({ programaId, auditoriaId }: Props) {
             {
               title: 'Pendência de Evidência',
               render: (a) => {
-                const info = pendenciasPorAvaliacao.get(a.id) || { total: 0, pendentes: 0 };
-                if (info.total === 0) {
+                if (a.evidencias === 0) {
                   return <span className="badge-pendencia-avaliacao sem-evidencia">Sem evidência</span>;
                 }
-                if (info.pendentes > 0) {
+                if (a.evidencias_nao_conformes > 0) {
                   return (
                     <span className="badge-pendencia-avaliacao com-pendencia">
-                      {info.pendentes} pendente(s) de {info.total}
+                      {a.evidencias_nao_conformes} pendente(s) de {a.evidencias}
                     </span>
                   );
                 }
                 return <span className="badge-pendencia-avaliacao sem-pendencia">Sem pendência</span>;
               },
             },
+            { title: 'Demandas Ativas', render: (a) => a.demandas_ativas },
             { title: 'Justificativa', render: (a) => a.observacoes || '-' },
             {
               title: 'Ações',
@@ -13,6 +13,7 @@ import {
   Principio,
   ProgramaCertificacao,
   TipoEvidencia,
+  carregarCatalogo,
   formatApiError,
 } from '../api';
 import FormRow from '../components/FormRow';
@@ -183,31 +184,26 @@ export default function Cadastros({ programaId, auditoriaId, selecionarContextoR
     }
 
     try {
-      const [p, c, i, t] = await Promise.all([
-        api.get<Principio[]>('/principios', { params: { programa_id: programaId } }),
-        api.get<Criterio[]>('/criterios', { params: { programa_id: programaId } }),
-        api.get<Indicador[]>('/indicadores', { params: { programa_id: programaId } }),
-        api.get<TipoEvidencia[]>('/tipos-evidencia', { params: { programa_id: programaId } }),
-      ]);
-      setPrincipios(p.data);
-      setCriterios(c.data);
-      setIndicadores(i.data);
-      setTipos(t.data);
-
-      if (!p.data.some((item) => item.id === novoCriterio.principio_id)) {
-        setNovoCriterio((prev) => ({ ...prev, principio_id: p.data[0]?.id || 0 }));
+      const catalogo = await carregarCatalogo(programaId);
+      setPrincipios(catalogo.principios);
+      setCriterios(catalogo.criterios);
+      setIndicadores(catalogo.indicadores);
+      setTipos(catalogo.tipos);
+
+      if (!catalogo.principios.some((item) => item.id === novoCriterio.principio_id)) {
+        setNovoCriterio((prev) => ({ ...prev, principio_id: catalogo.principios[0]?.id || 0 }));
       }
-      if (!c.data.some((item) => item.id === novoIndicador.criterio_id)) {
-        setNovoIndicador((prev) => ({ ...prev, criterio_id: c.data[0]?.id || 0 }));
+      if (!catalogo.criterios.some((item) => item.id === novoIndicador.criterio_id)) {
+        setNovoIndicador((prev) => ({ ...prev, criterio_id: catalogo.criterios[0]?.id || 0 }));
       }
 
-      const criterioTipoBase = c.data.some((item) => item.id === novoTipo.criterio_id)
+      const criterioTipoBase = catalogo.criterios.some((item) => item.id === novoTipo.criterio_id)
         ? novoTipo.criterio_id
-        : c.data[0]?.id || 0;
-      const indicadoresDoCriterio = i.data.filter((item) => item.criterio_id === criterioTipoBase);
+        : catalogo.criterios[0]?.id || 0;
+      const indicadoresDoCriterio = catalogo.indicadores.filter((item) => item.criterio_id === criterioTipoBase);
       const indicadorTipoBase = indicadoresDoCriterio.some((item) => item.id === novoTipo.indicador_id)
         ? novoTipo.indicador_id
-        : indicadoresDoCriterio[0]?.id || i.data[0]?.id || 0;
+        : indicadoresDoCriterio[0]?.id || catalogo.indicadores[0]?.id || 0;
 
       setNovoTipo((prev) => ({ ...prev, criterio_id: criterioTipoBase, indicador_id: indicadorTipoBase }));
     } catch (err: any) {
@@ -6,6 +6,7 @@ import {
 import { api,
   ConfiguracaoSistema,
   Usuario,
+  enviarArquivoDireto,
   formatApiError,
 } from '../api';
 
@@ -66,11 +67,8 @@ export default function Configuracoes({ refreshConfiguracaoNoHeader }: Props) {
     try {
       setErro('');
       setMensagem('');
-      const formData = new FormData();
-      formData.append('file', arquivoLogo);
-      await api.post('/configuracoes/logo-upload', formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
-      });
+      const key = await enviarArquivoDireto('/configuracoes/logo-upload-url', arquivoLogo);
+      await api.post('/configuracoes/logo-upload-finalizar', { key });
       setArquivoLogo(null);
       await carregar();
       await refreshConfiguracaoNoHeader();
@@ -6,7 +6,7 @@ import { useNavigate } from 'react-router-dom';
 
 import {
   api,
-  Auditoria,
+  DashboardResumo,
   Demanda,
   MonitoramentoMensalItem,
   ProgramaCertificacao,
@@ -60,84 +60,36 @@ export default function Dashboard({
   const [programas, setProgramas] = useState<ProgramaCertificacao[]>([]);
   const [anosDisponiveis, setAnosDisponiveis] = useState<number[]>([]);
   const [anoRelatorio, setAnoRelatorio] = useState<number>(new Date().getFullYear());
+  const [anoSelecionado, setAnoSelecionado] = useState<number | null>(null);
   const [programaRelatorio, setProgramaRelatorio] = useState<string>('');
   const [erro, setErro] = useState('');
 
   useEffect(() => {
-    const carregarFiltros = async () => {
-      try {
-        const [programasResp, auditoriasResp] = await Promise.all([
-          api.get<ProgramaCertificacao[]>('/programas-certificacao'),
-          api.get<Auditoria[]>('/auditorias'),
-        ]);
-        setProgramas(programasResp.data);
-        const anos = Array.from(new Set(auditoriasResp.data.map((a) => a.year))).sort((a, b) => b - a);
-        setAnosDisponiveis(anos);
-        if (anos.length > 0 && !anos.includes(anoRelatorio)) {
-          setAnoRelatorio(anos[0]);
-        }
-      } catch {
-        // Erros detalhados serao exibidos nos carregamentos principais.
-      }
-    };
-    void carregarFiltros();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
-
-  useEffect(() => {
-    if (!auditoriaId || !programaId) {
-      setMonitoramentoMensal([]);
-      return;
-    }
-    const carregarResumoAuditoria = async () => {
+    const carregarDashboard = async () => {
       try {
         setErro('');
-        const [resumoResp, demandasResp] = await Promise.all([
-          api.get<ResumoStatusItem[]>('/reports/resumo-status', { params: { auditoria_id: auditoriaId } }),
-          api.get<Demanda[]>('/reports/demandas-atrasadas', { params: { auditoria_id: auditoriaId } }),
-        ]);
-        setResumo(resumoResp.data);
-        setDemandasAtrasadas(demandasResp.data);
-        try {
-          const monitoramentoResp = await api.get<MonitoramentoMensalItem[]>('/reports/monitoramento-mensal', {
-            params: { programa_id: programaId, auditoria_id: auditoriaId },
-          });
-          setMonitoramentoMensal(monitoramentoResp.data);
-        } catch (err: any) {
-          if (err?.response?.status === 404) {
-            // Ambientes com API antiga podem não ter este relatório.
-            setMonitoramentoMensal([]);
-          } else {
-            setErro(formatApiError(err, 'Falha ao carregar monitoramento mensal.'));
-          }
-        }
+        // Uma requisição: a API executa as seções em paralelo e devolve tudo junto.
+        const { data } = await api.get<DashboardResumo>('/reports/dashboard', {
+          params: {
+            programa_id: programaId || undefined,
+            auditoria_id: auditoriaId || undefined,
+            year: anoSelecionado || undefined,
+            programa_relatorio_id: programaRelatorio ? Number(programaRelatorio) : undefined,
+          },
+        });
+        setProgramas(data.programas);
+        setAnosDisponiveis(data.anos_disponiveis);
+        setAnoRelatorio(data.year);
+        setResumo(data.resumo_status || []);
+        setDemandasAtrasadas(data.demandas_atrasadas || []);
+        setMonitoramentoMensal(data.monitoramento_mensal || []);
+        setResumoCertificacaoAno(data.resumo_conformidade_por_certificacao || []);
       } catch (err: any) {
         setErro(formatApiError(err, 'Falha ao carregar dashboard.'));
       }
     };
-    void carregarResumoAuditoria();
-  }, [auditoriaId, programaId]);
-
-  useEffect(() => {
-    if (!anoRelatorio) return;
-    const carregarResumoCertificacaoAno = async () => {
-      try {
-        setErro('');
-        const params: Record<string, string | number> = { year: anoRelatorio };
-        if (programaRelatorio) {
-          params.programa_id = Number(programaRelatorio);
-        }
-        const { data } = await api.get<ResumoConformidadeCertificacaoItem[]>(
-          '/reports/resumo-conformidade-por-certificacao',
-          { params }
-        );
-        setResumoCertificacaoAno(data);
-      } catch (err: any) {
-        setErro(formatApiError(err, 'Falha ao carregar relatorio por certificacao.'));
-      }
-    };
-    void carregarResumoCertificacaoAno();
-  }, [anoRelatorio, programaRelatorio]);
+    void carregarDashboard();
+  }, [auditoriaId, programaId, anoSelecionado, programaRelatorio]);
 
   const resumoMap = useMemo(
     () => new Map(resumo.map((item) => [item.status_conformidade, item.quantidade])),
@@ -221,7 +173,7 @@ export default function Dashboard({
         <div className="filters-row">
           <label className="form-row compact">
             <span>Ano</span>
-            <select value={anoRelatorio} onChange={(e) => setAnoRelatorio(Number(e.target.value))}>
+            <select value={anoRelatorio} onChange={(e) => setAnoSelecionado(Number(e.target.value))}>
               {anosDisponiveis.length === 0 ? (
                 <option value={anoRelatorio}>{anoRelatorio}</option>
               ) : (
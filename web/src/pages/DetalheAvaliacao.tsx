@@ -7,15 +7,18 @@ import { useNavigate,
 
 import {
   api,
-  AvaliacaoDetalhe,
+  AvaliacaoDetalheCompleto,
   PRIORIDADE_LABELS,
   Prioridade,
+  STATUS_ANALISE_NC_LABELS,
   STATUS_ANDAMENTO_LABELS,
   STATUS_CONFORMIDADE_LABELS,
+  STATUS_DOCUMENTO_LABELS,
   StatusAndamento,
   StatusConformidade,
   TipoEvidencia,
   Usuario,
+  enviarArquivoDireto,
   formatApiError,
 } from '../api';
 import Modal from '../components/Modal';
@@ -37,7 +40,7 @@ export default function DetalheAvaliacao() {
   const navigate = useNavigate();
   const avaliacaoId = Number(id);
 
-  const [detalhe, setDetalhe] = useState<AvaliacaoDetalhe | null>(null);
+  const [detalhe, setDetalhe] = useState<AvaliacaoDetalheCompleto | null>(null);
   const [tipos, setTipos] = useState<TipoEvidencia[]>([]);
   const [usuarios, setUsuarios] = useState<Usuario[]>([]);
 
@@ -74,30 +77,16 @@ export default function DetalheAvaliacao() {
     if (!avaliacaoId) return;
     setErro('');
     try {
-      const detalheResp = await api.get<AvaliacaoDetalhe>(`/avaliacoes/${avaliacaoId}/detalhe`);
-      setDetalhe(detalheResp.data);
-      setStatusConformidade(detalheResp.data.avaliacao.status_conformidade);
-      setObservacoes(detalheResp.data.avaliacao.observacoes || '');
-
-      const tiposResp = await api.get<TipoEvidencia[]>('/tipos-evidencia', {
-        params: {
-          programa_id: detalheResp.data.avaliacao.programa_id,
-          criterio_id: detalheResp.data.criterio.id,
-          indicator_id: detalheResp.data.indicador.id,
-        },
-      });
-      setTipos(tiposResp.data);
-      setTipoEvidenciaId(tiposResp.data[0]?.id || '');
-
-      try {
-        const usuariosResp = await api.get<Usuario[]>('/usuarios');
-        const responsaveis = usuariosResp.data.filter((u) => u.role === 'RESPONSAVEL');
-        setUsuarios(responsaveis);
-        if (responsaveis[0]) {
-          setDemanda((prev) => ({ ...prev, responsavel_id: prev.responsavel_id || responsaveis[0].id }));
-        }
-      } catch {
-        setUsuarios([]);
+      // Uma requisição traz a avaliação, as coleções, os tipos compatíveis e os responsáveis atribuíveis.
+      const { data } = await api.get<AvaliacaoDetalheCompleto>(`/avaliacoes/${avaliacaoId}/detalhe-completo`);
+      setDetalhe(data);
+      setStatusConformidade(data.avaliacao.status_conformidade);
+      setObservacoes(data.avaliacao.observacoes || '');
+      setTipos(data.tipos_evidencia);
+      setTipoEvidenciaId(data.tipos_evidencia[0]?.id || '');
+      setUsuarios(data.responsaveis);
+      if (data.responsaveis[0]) {
+        setDemanda((prev) => ({ ...prev, responsavel_id: prev.responsavel_id || data.responsaveis[0].id }));
       }
     } catch (err: any) {
       setErro(formatApiError(err, 'Falha ao carregar detalhe da avaliação.'));
@@ -161,20 +150,20 @@ export default function DetalheAvaliacao() {
       setErro('Selecione um arquivo para upload.');
       return;
     }
+    // Validado antes do envio para não deixar no armazenamento um arquivo que o finalizar recusaria.
+    if (evidenciaNaoConforme && !obsEvidencia.trim()) {
+      setErro('Informe observações para evidência marcada como não conforme.');
+      return;
+    }
     setErro('');
     try {
-      const formData = new FormData();
-      formData.append('avaliacao_id', String(avaliacaoId));
-      if (tipoEvidenciaId) {
-        formData.append('tipo_evidencia_id', String(tipoEvidenciaId));
-      }
-      formData.append('nao_conforme', evidenciaNaoConforme ? 'true' : 'false');
-      if (obsEvidencia) {
-        formData.append('observacoes', obsEvidencia);
-      }
-      formData.append('file', arquivo);
-      await api.post('/evidencias/upload', formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
+      const key = await enviarArquivoDireto('/evidencias/upload-url', arquivo, { avaliacao_id: avaliacaoId });
+      await api.post('/evidencias/upload-finalizar', {
+        avaliacao_id: avaliacaoId,
+        key,
+        tipo_evidencia_id: tipoEvidenciaId || null,
+        nao_conforme: evidenciaNaoConforme,
+        observacoes: obsEvidencia || null,
       });
       setArquivo(null);
       setEvidenciaNaoConforme(false);
@@ -514,6 +503,38 @@ export default function DetalheAvaliacao() {
         </form>
       </div>
 
+      <div className="card">
+        <h3>Documentos</h3>
+        <Table
+          rows={detalhe.documentos}
+          emptyText="Nenhum documento vinculado às evidências desta avaliação."
+          columns={[
+            { title: 'Título', render: (d) => d.titulo },
+            { title: 'Versão', render: (d) => d.versao },
+            { title: 'Status', render: (d) => STATUS_DOCUMENTO_LABELS[d.status_documento] },
+            { title: 'Data Limite', render: (d) => d.data_limite || '-' },
+            {
+              title: 'Responsável',
+              render: (d) => (d.responsavel_id ? usuariosMap.get(d.responsavel_id)?.nome || d.responsavel_id : '-'),
+            },
+          ]}
+        />
+      </div>
+
+      <div className="card">
+        <h3>Análises de Não Conformidade</h3>
+        <Table
+          rows={detalhe.analises_nc}
+          emptyText="Nenhuma análise de NC registrada para esta avaliação."
+          columns={[
+            { title: 'Problema', render: (a) => a.titulo_problema },
+            { title: 'Status', render: (a) => STATUS_ANALISE_NC_LABELS[a.status_analise] },
+            { title: 'Causa Raiz', render: (a) => a.causa_raiz || '-' },
+            { title: 'Ação Corretiva', render: (a) => a.acao_corretiva || '-' },
+          ]}
+        />
+      </div>
+
       <div className="card">
         <h3>Log de Auditoria (recentes)</h3>
         <Table
@@ -16,6 +16,7 @@ import {
   StatusDocumento,
   TipoEvidencia,
   Usuario,
+  carregarCatalogo,
   formatApiError,
 } from '../api';
 import Modal from '../components/Modal';
@@ -108,7 +109,7 @@ export default function Documentos({ programaId, auditoriaId }: Props) {
     }
     setErro('');
     try {
-      const [docsResp, evidResp, avalResp, indResp, tipoResp] = await Promise.all([
+      const [docsResp, evidResp, avalResp, catalogo] = await Promise.all([
         api.get<DocumentoEvidencia[]>('/documentos-evidencia', {
           params: {
             programa_id: programaId,
@@ -129,14 +130,13 @@ export default function Documentos({ programaId, auditoriaId }: Props) {
             auditoria_id: auditoriaId,
           },
         }),
-        api.get<Indicador[]>('/indicadores', { params: { programa_id: programaId } }),
-        api.get<TipoEvidencia[]>('/tipos-evidencia', { params: { programa_id: programaId } }),
+        carregarCatalogo(programaId),
       ]);
       setDocumentos(docsResp.data);
       setEvidencias(evidResp.data);
       setAvaliacoes(avalResp.data);
-      setIndicadores(indResp.data);
-      setTiposEvidencia(tipoResp.data);
+      setIndicadores(catalogo.indicadores);
+      setTiposEvidencia(catalogo.tipos);
 
       setNovoDocumento((prev) => {
         const evidenciasIds = new Set(evidResp.data.map((e) => e.id));